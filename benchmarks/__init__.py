@@ -0,0 +1,6 @@
+"""
+Offline benchmarks for the control-loop hot path.
+
+Run from the repository root:
+    python -m benchmarks.bench_hot_path --output bench_results.json
+"""
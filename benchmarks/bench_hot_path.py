@@ -0,0 +1,293 @@
+"""
+Micro and end-to-end benchmarks for the control-loop hot path.
+
+Runs fully offline against StubDrone (a constant-telemetry implementation
+of the DroneInterface API) and reports, per component:
+- ns_per_op:        best-of-repeats mean time per call
+- peak_bytes_per_op: transient memory allocated during one call (tracemalloc)
+- net_blocks_per_op: memory blocks still alive per call (leak/retention check)
+
+plus ticks per second for complete Controller iterations. Results are
+written as JSON so runs can be compared over time:
+
+    python -m benchmarks.bench_hot_path --output bench_results.json
+    python -m benchmarks.bench_hot_path --compare bench_results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from control.pid import PID, PIDBank, PIDConfig
+from controller.controller import Controller
+from controller.kalman_estimator import KalmanStateEstimator
+from controller.state_estimator import EstimatedState, StateEstimator
+from drone.drone_state import DroneState
+from utils.clock import VirtualClock
+from utils.flight_recorder import FlightRecorder
+from utils.log_context import LogContext, PIDOutputs, RCOutputs
+from utils.logger import DataLogger, NullLogger
+from utils.transforms import body_to_world_velocity
+
+
+class StubDrone:
+    """DroneInterface-compatible stand-in returning fixed telemetry."""
+
+    def __init__(self):
+        self.seq = 0
+        self.rc = (0, 0, 0, 0)
+
+    def connect(self):
+        pass
+
+    def takeoff(self):
+        pass
+
+    def land(self):
+        pass
+
+    def get_state(self, out: DroneState = None) -> DroneState:
+        self.seq += 1
+        if out is None:
+            out = DroneState.empty()
+        out.orientation[0] = 1
+        out.orientation[1] = -1
+        out.orientation[2] = 10 + (self.seq & 3)
+        out.velocity[0] = 2
+        out.velocity[1] = -1
+        out.velocity[2] = 0
+        out.elevation[0] = 80
+        out.elevation[1] = 10050.0
+        out.elevation[2] = 80
+        out.acceleration[0] = 3.0
+        out.acceleration[1] = -2.0
+        out.acceleration[2] = -1001.0
+        out.battery = 90
+        out.seq = self.seq
+        return out
+
+    def send_rc(self, lr, fb, ud, yaw):
+        self.rc = (int(lr), int(fb), int(ud), int(yaw))
+
+
+# ---------------------------------------------------------
+# Measurement helpers
+# ---------------------------------------------------------
+
+def time_op(op, number, repeat=5):
+    """Best mean ns per call over `repeat` runs of `number` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            op()
+        best = min(best, (time.perf_counter_ns() - start) / number)
+    return best
+
+
+def measure_allocations(op, samples=200):
+    """Return (peak transient bytes per call, net live blocks per call)."""
+    op()  # warm caches outside the measurement
+    tracemalloc.start()
+    try:
+        peak = 0
+        for _ in range(samples):
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            op()
+            _, op_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, op_peak - base)
+    finally:
+        tracemalloc.stop()
+
+    blocks_before = sys.getallocatedblocks()
+    for _ in range(samples):
+        op()
+    net_blocks = (sys.getallocatedblocks() - blocks_before) / samples
+    return peak, net_blocks
+
+
+def bench(name, op, number, results):
+    ns = time_op(op, number)
+    peak, net_blocks = measure_allocations(op)
+    results[name] = {
+        "ns_per_op": ns,
+        "peak_bytes_per_op": peak,
+        "net_blocks_per_op": net_blocks,
+    }
+    print(f"{name:<32} {ns:>12.0f} ns/op {peak:>8} B peak {net_blocks:>7.2f} blocks")
+
+
+# ---------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------
+
+def run_micro(number, results):
+    drone = StubDrone()
+    state = drone.get_state()
+    clock = VirtualClock()
+
+    def tick():
+        clock.advance(0.04)
+        return clock.now()
+
+    pid = PID(PIDConfig(kp=80.0, ki=0.014, kd=20.0, output_limits=(-60, 60),
+                        integral_limits=(-5, 5), derivative_filter_alpha=0.8))
+    bench("pid.compute", lambda: pid.compute(0.0, 0.1, tick()), number, results)
+
+    bank4 = PIDBank.from_config()
+    sp4 = [0.0] * bank4.size
+    meas4 = [0.1] * bank4.size
+    bench("pid_bank.compute[4]", lambda: bank4.compute(sp4, meas4, tick()), number, results)
+
+    bank_big = PIDBank.from_config(count=1000)
+    sp_big = [0.0] * bank_big.size
+    meas_big = [0.1] * bank_big.size
+    bench("pid_bank.compute[4000]", lambda: bank_big.compute(sp_big, meas_big, tick()),
+          max(1, number // 20), results)
+
+    bench("body_to_world_velocity", lambda: body_to_world_velocity(state.velocity, 30.0),
+          number, results)
+
+    estimator = StateEstimator(clock=clock)
+    bench("state_estimator.estimate", lambda: estimator.estimate(state, tick()), number, results)
+    est_buffer = EstimatedState.zeros()
+    bench("state_estimator.estimate[out]", lambda: estimator.estimate(state, tick(), est_buffer),
+          number, results)
+
+    kalman = KalmanStateEstimator(clock=clock)
+    bench("kalman_estimator.estimate", lambda: kalman.estimate(state, tick(), est_buffer),
+          max(1, number // 10), results)
+
+    est = estimator.estimate(state, tick())
+    ctx = LogContext(
+        timestamp=clock.now(),
+        loop_dt=0.04,
+        est=est,
+        raw=state,
+        pid=PIDOutputs(1.0, 2.0, 3.0, 4.0),
+        rc=RCOutputs(1.0, 2.0, 3.0, 4.0),
+        setpoint=[0.0, 0.0, 0.5, 10.0],
+        terms=[0.5] * 12
+    )
+    recorder = FlightRecorder(capacity=1500)
+    bench("flight_recorder.record", lambda: recorder.record(ctx), number, results)
+
+    with tempfile.TemporaryDirectory() as directory:
+        logger = DataLogger(directory=directory, log_every_n=1)
+        bench("data_logger.log_frame[csv]", lambda: logger.log_frame(ctx), number, results)
+        logger.close()
+
+        logger = DataLogger(directory=directory, log_every_n=1, log_format="binary")
+        bench("data_logger.log_frame[binary]", lambda: logger.log_frame(ctx), number, results)
+        logger.close()
+
+
+def make_controller(logger):
+    """
+    Controller past start()'s takeoff setup, warmed up by one tick. Not
+    start() itself: its shutdown path closes the logger, and the timed
+    ticks would then measure the closed-file error path.
+    """
+    clock = VirtualClock()
+    controller = Controller(StubDrone(), clock=clock, logger=logger)
+    controller.state_estimator.reset()
+    controller.target_yaw = controller.drone.get_state().orientation[2]
+    with contextlib.redirect_stdout(io.StringIO()):
+        controller.control_loop(max_ticks=1)
+    log_file = getattr(logger, "file", None)
+    assert log_file is None or not log_file.closed, "logger closed before timing"
+    return controller
+
+
+def run_loop(ticks, results, repeat=5):
+    """Full Controller iterations (VirtualClock, so no sleeping)."""
+    with tempfile.TemporaryDirectory() as directory:
+        variants = {
+            "controller.tick[null_logger]": lambda: NullLogger(),
+            "controller.tick[csv_every_5]": lambda: DataLogger(directory=directory, log_every_n=5),
+        }
+        for name, make_logger in variants.items():
+            controller = make_controller(make_logger())
+
+            def one_tick():
+                controller.clock.advance(controller.loop_dt)
+                controller.control_loop(max_ticks=1)
+
+            best = float("inf")
+            with contextlib.redirect_stdout(io.StringIO()):
+                peak, net_blocks = measure_allocations(one_tick)
+                for _ in range(repeat):
+                    start = time.perf_counter_ns()
+                    controller.control_loop(max_ticks=ticks)
+                    best = min(best, (time.perf_counter_ns() - start) / ticks)
+                controller.logger.close()
+
+            results[name] = {
+                "ns_per_op": best,
+                "peak_bytes_per_op": peak,
+                "net_blocks_per_op": net_blocks,
+                "ticks_per_second": 1e9 / best,
+            }
+            print(f"{name:<32} {best:>12.0f} ns/op {peak:>8} B peak {net_blocks:>7.2f} blocks "
+                  f"({1e9 / best:.0f} ticks/s)")
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    print(f"\nChange vs {baseline_path}:")
+    for name, current in results.items():
+        if name in baseline:
+            before = baseline[name]["ns_per_op"]
+            change = (current["ns_per_op"] - before) / before * 100.0
+            print(f"{name:<32} {before:>12.0f} -> {current['ns_per_op']:>10.0f} ns/op ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control-loop hot-path benchmarks")
+    parser.add_argument("--output", default="bench_results.json",
+                        help="JSON results file (default: bench_results.json)")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    parser.add_argument("--number", type=int, default=20000,
+                        help="calls per timing run for micro benchmarks")
+    parser.add_argument("--ticks", type=int, default=2000,
+                        help="controller iterations per timing run")
+    args = parser.parse_args()
+
+    results = {}
+    run_micro(args.number, results)
+    run_loop(args.ticks, results)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.compare:
+        compare(results, args.compare)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,28 @@ Control package exposing PID controllers for modular axis-specific control.
 
 This package provides:
 - pid_x, pid_y, pid_z: preconfigured PID controllers for X, Y, and Z axes
+  (built lazily on first access)
 - PID, PIDConfig: reusable base classes for custom control logic
+- PIDBank: vectorized engine stepping many PID controllers in one call
+- create_pid, create_pids: factories building independent controllers
 """
 
-from .pid.pid_x import pid_x
-from .pid.pid_y import pid_y
-from .pid.pid_z import pid_z
-from .pid.pid_base import PID, PIDConfig
+from .pid.pid_base import PID, PIDConfig, PIDBank
+from .pid.factory import create_pid, create_pids, get_pid
 
 __all__ = [
     "pid_x",
     "pid_y",
     "pid_z",
     "PID",
-    "PIDConfig"
-]
\ No newline at end of file
+    "PIDConfig",
+    "PIDBank",
+    "create_pid",
+    "create_pids"
+]
+
+
+def __getattr__(name):
+    if name in ("pid_x", "pid_y", "pid_z"):
+        return get_pid(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,19 +6,39 @@ Exposes:
 - pid_y: Y-axis position controller
 - pid_z: Z-axis altitude controller
 - PID, PIDConfig: reusable base classes
+- PIDBank: vectorized engine stepping many PID controllers in one call
+- create_pid, create_pids: factories building independent controllers
+
+pid_x ... pid_yaw are shared instances built lazily on first access, so
+importing the package does not read config/pid_config.json.
 """
 
-from .pid_base import PID, PIDConfig
-from .pid_x import pid_x
-from .pid_y import pid_y
-from .pid_z import pid_z
-from .pid_yaw import pid_yaw
+from .pid_base import PID, PIDConfig, PIDBank
+from .factory import create_pid, create_pids, get_pid
+
+# Load the per-axis submodules now (they are cheap: no config is read) and
+# drop the package attributes the import system bound to them. Later
+# imports of control.pid.pid_x find the module in sys.modules and do not
+# rebind it, so the package name pid_x always resolves to the PID through
+# __getattr__, whatever the import order.
+from . import pid_x, pid_y, pid_z, pid_yaw
+del pid_x, pid_y, pid_z, pid_yaw
 
 __all__ = [
     "PID",
     "PIDConfig",
+    "PIDBank",
+    "create_pid",
+    "create_pids",
+    "get_pid",
     "pid_x",
     "pid_y",
     "pid_z",
     "pid_yaw"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in ("pid_x", "pid_y", "pid_z", "pid_yaw"):
+        return get_pid(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,41 @@
+"""
+PID construction from pid_config.json.
+
+create_pid()/create_pids() build new, independent controllers on every
+call. get_pid() returns the shared per-axis instance behind the
+control.pid.pid_x ... pid_yaw names, built on first use rather than at
+import time.
+"""
+
+from .pid_base import AXIS_NAMES, PID, PIDConfig
+from utils.config_loader import load_pid_config
+
+_shared = {}
+
+
+def create_pid(axis, config=None):
+    """
+    Build a new PID for one axis entry ("pid_x", "pid_y", "pid_z", "pid_yaw").
+    config: parsed pid_config.json dict (loaded from the cached default
+            config if None)
+    """
+    if config is None:
+        config = load_pid_config()
+    return PID(PIDConfig.from_dict(config[axis]))
+
+
+def create_pids(config=None):
+    """Build a new (pid_x, pid_y, pid_z, pid_yaw) tuple of independent PIDs."""
+    if config is None:
+        config = load_pid_config()
+    return tuple(create_pid(axis, config) for axis in AXIS_NAMES)
+
+
+def get_pid(axis):
+    """Return the shared PID for an axis, creating it on first use."""
+    pid = _shared.get(axis)
+    if pid is None:
+        if axis not in AXIS_NAMES:
+            raise ValueError(f"Unknown PID axis: {axis}")
+        pid = _shared[axis] = create_pid(axis)
+    return pid
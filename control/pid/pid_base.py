@@ -3,11 +3,26 @@ Base PID controller implementation with:
 - Anti-windup (integral clamping)
 - Derivative filtering (exponential smoothing)
 - Output clamping
+
+A PID keeps its state in plain Python floats, which is the fastest form
+for a single axis. A PIDBank steps N controllers in one call: small banks
+loop over PID rows (the same scalar code path), large banks (fleets)
+switch to contiguous NumPy arrays and one vectorized update, where the
+per-call NumPy overhead is amortized over many rows.
 """
 
+import math
 import time
 from dataclasses import dataclass
 
+import numpy as np
+
+from utils.config_loader import load_pid_config
+
+
+# Row order used when a bank is built from pid_config.json
+AXIS_NAMES = ("pid_x", "pid_y", "pid_z", "pid_yaw")
+
 
 @dataclass
 class PIDConfig:
@@ -19,14 +34,41 @@ class PIDConfig:
     integral_limits: tuple = (-50, 50)       # Anti-windup clamp
     derivative_filter_alpha: float = 0.7     # Derivative smoothing factor
 
+    @classmethod
+    def from_dict(cls, cfg):
+        """Build a PIDConfig from one axis entry of pid_config.json."""
+        return cls(
+            kp=cfg["kp"],
+            ki=cfg["ki"],
+            kd=cfg["kd"],
+            output_limits=tuple(cfg["output_limits"]),
+            integral_limits=tuple(cfg["integral_limits"]),
+            derivative_filter_alpha=cfg["derivative_filter_alpha"]
+        )
+
+    def validate(self):
+        """Raise ValueError if gains, limits or alpha are out of range."""
+        for name in ("kp", "ki", "kd", "derivative_filter_alpha"):
+            value = getattr(self, name)
+            if not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise ValueError(f"{name} must be a finite number, got {value!r}")
+        if min(self.kp, self.ki, self.kd) < 0:
+            raise ValueError("PID gains must be non-negative")
+        if not 0.0 <= self.derivative_filter_alpha <= 1.0:
+            raise ValueError("derivative_filter_alpha must be in [0, 1]")
+        for name in ("output_limits", "integral_limits"):
+            limits = getattr(self, name)
+            if len(limits) != 2 or not limits[0] <= limits[1]:
+                raise ValueError(f"{name} must be (min, max) with min <= max, got {limits!r}")
+        return self
+
 
 class PID:
+    """Scalar PID controller with its state held in Python floats."""
+
     def __init__(self, config: PIDConfig):
         self.config = config
-        self.integral = 0.0
-        self.prev_error = 0.0
-        self.prev_time = None
-        self.prev_derivative = 0.0
+        self.reset()
 
     def reset(self):
         """Reset internal PID state."""
@@ -34,37 +76,222 @@ class PID:
         self.prev_error = 0.0
         self.prev_time = None
         self.prev_derivative = 0.0
+        # Terms of the latest update (diagnostics, e.g. the flight recorder)
+        self.p_term = 0.0
+        self.i_term = 0.0
+        self.d_term = 0.0
+
+    @property
+    def terms(self):
+        """(p, i, d) terms of the latest compute(), before output clamping."""
+        return self.p_term, self.i_term, self.d_term
 
-    def compute(self, setpoint, measurement):
-        """Compute PID output."""
-        now = time.time()
+    def compute(self, setpoint, measurement, now=None):
+        """
+        Compute PID output.
+        now: tick timestamp supplied by the caller's clock; the PID only
+             samples the monotonic clock itself when none is given.
+        """
+        config = self.config
+        if now is None:
+            now = time.perf_counter()
         dt = 0.0 if self.prev_time is None else now - self.prev_time
         self.prev_time = now
 
         error = setpoint - measurement
-        p = self.config.kp * error
+        p = config.kp * error
 
         if dt > 0:
-            self.integral += error * dt
-            self.integral = max(self.config.integral_limits[0],
-                                min(self.integral, self.config.integral_limits[1]))
-        i = self.config.ki * self.integral
+            low, high = config.integral_limits
+            integral = self.integral + error * dt
+            self.integral = integral = low if integral < low else high if integral > high else integral
+        i = config.ki * self.integral
 
         if dt > 0:
-            raw_derivative = (error - self.prev_error) / dt
-            alpha = self.config.derivative_filter_alpha
-            self.prev_derivative = (
-                alpha * raw_derivative +
-                (1 - alpha) * self.prev_derivative
-            )
+            alpha = config.derivative_filter_alpha
+            derivative = alpha * (error - self.prev_error) / dt + (1 - alpha) * self.prev_derivative
         else:
-            self.prev_derivative = 0.0
+            derivative = 0.0
+        self.prev_derivative = derivative
 
-        d = self.config.kd * self.prev_derivative
+        d = config.kd * derivative
         self.prev_error = error
+        self.p_term = p
+        self.i_term = i
+        self.d_term = d
 
+        low, high = config.output_limits
         output = p + i + d
-        output = max(self.config.output_limits[0],
-                     min(output, self.config.output_limits[1]))
+        return low if output < low else high if output > high else output
+
+
+class PIDBank:
+    """
+    N PID controllers stepped together.
+
+    Banks smaller than VECTORIZE_MIN_ROWS keep one PID per row and loop
+    over them, so a vehicle's four axes cost four scalar updates. Larger
+    banks hold their state in contiguous arrays and run one vectorized
+    update. There, a row whose previous time is unset (NaN) behaves exactly
+    like a freshly reset PID: dt = 0, no integration, derivative forced to
+    zero. The per-row parameter arrays (kp, ki, kd, output/integral limits,
+    alpha) are kept in both modes.
+
+    The vectorized update mirrors PID.compute operation for operation, so
+    both modes return the same outputs whatever the bank size;
+    tests/test_pid_bank.py holds them to that. Change both together.
+    """
+
+    # Below this many rows the scalar loop beats the vectorized update
+    VECTORIZE_MIN_ROWS = 32
+
+    def __init__(self, configs, vectorize_min_rows=None):
+        """
+        configs: one PIDConfig per row
+        vectorize_min_rows: row count from which the vectorized update is
+                            used (VECTORIZE_MIN_ROWS if None)
+        """
+        configs = list(configs)
+        n = len(configs)
+        self.size = n
+        if vectorize_min_rows is None:
+            vectorize_min_rows = self.VECTORIZE_MIN_ROWS
+        self.vectorized = n >= vectorize_min_rows
+        self.configs = [None] * n
+
+        # Per-row parameters
+        self.kp = np.zeros(n)
+        self.ki = np.zeros(n)
+        self.kd = np.zeros(n)
+        self.output_min = np.zeros(n)
+        self.output_max = np.zeros(n)
+        self.integral_min = np.zeros(n)
+        self.integral_max = np.zeros(n)
+        self.alpha = np.zeros(n)
+
+        if self.vectorized:
+            self.pids = None
+
+            # Per-row controller state
+            self.integral = np.zeros(n)
+            self.prev_error = np.zeros(n)
+            self.prev_derivative = np.zeros(n)
+            self.prev_time = np.full(n, np.nan)
+        else:
+            self.pids = [PID(config) for config in configs]
+
+        for index, config in enumerate(configs):
+            self.set_config(index, config)
+
+    @classmethod
+    def from_config(cls, config=None, names=AXIS_NAMES, count=1, vectorize_min_rows=None):
+        """
+        Build a bank from a pid_config.json dictionary.
+        config: parsed config dict (loaded from config/pid_config.json if None)
+        names:  axis entries to use, in row order
+        count:  number of vehicles; rows are laid out vehicle-major, so row
+                vehicle * len(names) + axis belongs to that vehicle/axis
+        """
+        if config is None:
+            config = load_pid_config()
+        axis_configs = [PIDConfig.from_dict(config[name]) for name in names]
+        return cls(axis_configs * count, vectorize_min_rows)
+
+    def set_config(self, index, config: PIDConfig):
+        """Load gains, limits and alpha for one row."""
+        self.configs[index] = config
+        if not self.vectorized:
+            self.pids[index].config = config
+        self.kp[index] = config.kp
+        self.ki[index] = config.ki
+        self.kd[index] = config.kd
+        self.output_min[index], self.output_max[index] = config.output_limits
+        self.integral_min[index], self.integral_max[index] = config.integral_limits
+        self.alpha[index] = config.derivative_filter_alpha
+
+    def reset(self, rows=None):
+        """Reset controller state for the given rows (all rows if None)."""
+        if rows is None:
+            rows = slice(None)
+        if not self.vectorized:
+            for pid in self._row_pids(rows):
+                pid.reset()
+            return
+        self.integral[rows] = 0.0
+        self.prev_error[rows] = 0.0
+        self.prev_derivative[rows] = 0.0
+        self.prev_time[rows] = np.nan
+
+    def _row_pids(self, rows):
+        if isinstance(rows, slice):
+            return self.pids[rows]
+        return [self.pids[i] for i in np.atleast_1d(rows).tolist()]
+
+    def _row_count(self, rows):
+        if isinstance(rows, slice):
+            return len(range(*rows.indices(self.size)))
+        return len(np.atleast_1d(rows))
+
+    def compute(self, setpoints, measurements, now=None, rows=None):
+        """
+        Compute PID outputs for every row (or the given subset of rows).
+        setpoints, measurements: array-likes with one entry per stepped row
+        now: timestamp for this update in seconds (monotonic clock if None)
+        rows: optional index array / slice selecting which rows to step
+        Returns an array of clamped outputs.
+        Raises ValueError if setpoints or measurements do not have one entry
+        per stepped row.
+        """
+        if now is None:
+            now = time.perf_counter()
+        if rows is None:
+            rows = slice(None)
+        count = self._row_count(rows)
+        if len(setpoints) != count or len(measurements) != count:
+            raise ValueError(
+                f"Expected {count} setpoints and measurements, got "
+                f"{len(setpoints)} and {len(measurements)}"
+            )
+
+        if not self.vectorized:
+            return np.array([
+                pid.compute(setpoint, measurement, now)
+                for pid, setpoint, measurement in zip(self._row_pids(rows), setpoints, measurements)
+            ])
+
+        kp = self.kp[rows]
+        ki = self.ki[rows]
+        kd = self.kd[rows]
+        alpha = self.alpha[rows]
+        integral = self.integral[rows]
+        prev_derivative = self.prev_derivative[rows]
+
+        prev_time = self.prev_time[rows]
+        dt = now - prev_time
+        active = dt > 0  # NaN (never stepped) compares False
+        safe_dt = np.where(active, dt, 1.0)
+
+        error = np.asarray(setpoints, dtype=float) - measurements
+        p = kp * error
+
+        integral = np.where(
+            active,
+            np.clip(integral + error * safe_dt,
+                    self.integral_min[rows], self.integral_max[rows]),
+            integral
+        )
+        i = ki * integral
+
+        prev_derivative = np.where(
+            active,
+            alpha * (error - self.prev_error[rows]) / safe_dt + (1 - alpha) * prev_derivative,
+            0.0
+        )
+        d = kd * prev_derivative
+
+        self.integral[rows] = integral
+        self.prev_derivative[rows] = prev_derivative
+        self.prev_error[rows] = error
+        self.prev_time[rows] = now
 
-        return output
\ No newline at end of file
+        return np.clip(p + i + d, self.output_min[rows], self.output_max[rows])
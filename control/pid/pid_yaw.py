@@ -1,19 +1,13 @@
 """
 Preconfigured PID controller for yaw position control.
-Loads tuning parameters from config/pid_config.json.
+Tuning parameters come from config/pid_config.json; the controller is
+built on first access of pid_yaw, not at import time.
 """
 
-from .pid_base import PID, PIDConfig
-from utils.config_loader import load_pid_config
+from .factory import get_pid
 
-# Load configuration for Y-axis PID
-_cfg = load_pid_config()["pid_yaw"]
 
-pid_yaw = PID(PIDConfig(
-    kp=_cfg["kp"],
-    ki=_cfg["ki"],
-    kd=_cfg["kd"],
-    output_limits=tuple(_cfg["output_limits"]),
-    integral_limits=tuple(_cfg["integral_limits"]),
-    derivative_filter_alpha=_cfg["derivative_filter_alpha"]
-))
\ No newline at end of file
+def __getattr__(name):
+    if name == "pid_yaw":
+        return get_pid("pid_yaw")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,17 +3,28 @@ High-level control orchestration package.
 
 This package includes:
 - Controller: the main PID control loop for 3-axis position hold
+- FleetController: asyncio controller flying many vehicles from one
+  process, with per-vehicle estimators and one vectorized PID bank
 - StateEstimator: sensor fusion logic that converts raw drone telemetry
   into world-frame position, velocity, and attitude estimates
+- KalmanStateEstimator: constant-acceleration Kalman filter backend
+  fusing velocity, acceleration and altitude sensors
+- build_estimator: builds the backend selected in estimator_config.json
 
 These components coordinate sensor updates, PID corrections, RC command
 output, and logging during flight.
 """
 
 from .controller import Controller
+from .fleet import FleetController
+from .estimators import build_estimator
+from .kalman_estimator import KalmanStateEstimator
 from .state_estimator import StateEstimator
 
 __all__ = [
     "Controller",
-    "StateEstimator"
+    "FleetController",
+    "StateEstimator",
+    "KalmanStateEstimator",
+    "build_estimator"
 ]
\ No newline at end of file
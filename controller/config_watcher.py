@@ -0,0 +1,91 @@
+import os
+import threading
+from pathlib import Path
+
+from control.pid.pid_base import AXIS_NAMES, PIDConfig
+from utils.config_loader import DEFAULT_PID_CONFIG_PATH, load_config
+
+
+class ConfigWatcher:
+    """
+    Watches pid_config.json for changes from a background thread.
+
+    The thread polls the file's mtime/size (one stat() per poll interval).
+    When the file changes, it parses and validates every axis entry and
+    publishes the new PIDConfigs as one pending update. Invalid files are
+    reported and ignored, so the gains being flown stay in place.
+
+    The control loop only checks `pending` (an attribute read) and calls
+    take_pending() at a tick boundary; it never touches the file or the
+    JSON parser.
+    """
+
+    def __init__(self, path=None, poll_interval=0.5, axes=AXIS_NAMES):
+        """
+        path: config file to watch (config/pid_config.json if None)
+        poll_interval: seconds between stat() checks
+        axes: pid_config.json entries to load, in PID order
+        """
+        self.path = Path(DEFAULT_PID_CONFIG_PATH if path is None else path)
+        self.poll_interval = poll_interval
+        self.axes = tuple(axes)
+        self.pending = None     # tuple of PIDConfig, one per axis
+        self.reloads = 0        # validated updates published
+        self.errors = 0         # changed files rejected by validation
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._signature = None
+
+    def start(self):
+        """Record the current file version and start polling."""
+        if self._thread is not None:
+            return
+        self._signature = self._stat()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ConfigWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
+
+    def take_pending(self):
+        """Return the latest validated update (or None) and clear it."""
+        with self._lock:
+            pending, self.pending = self.pending, None
+        return pending
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _run(self):
+        while not self._stop_event.wait(self.poll_interval):
+            self.check()
+
+    def check(self):
+        """Poll once; returns True if a new update was published."""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        self._signature = signature
+
+        try:
+            config = load_config(self.path)
+            configs = tuple(PIDConfig.from_dict(config[axis]).validate() for axis in self.axes)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.errors += 1
+            print(f"Ignoring invalid PID config {self.path}: {e!r}")
+            return False
+
+        with self._lock:
+            self.pending = configs
+        self.reloads += 1
+        print(f"PID config change detected in {self.path}; applying at next tick")
+        return True
@@ -1,7 +1,13 @@
-import time
-from .state_estimator import StateEstimator
-from control.pid import pid_x, pid_y, pid_z, pid_yaw
+from .config_watcher import ConfigWatcher
+from .instrumentation import StageTimer
+from .scheduler import LoopScheduler, RateGroups, TelemetryStats
+from .estimators import build_estimator
+from .state_estimator import EstimatedState
+from control.pid import create_pids
+from utils.clock import MonotonicClock
+from utils.flight_recorder import FlightRecorder
 from utils.logger import DataLogger
+from drone.drone_state import DroneState
 from utils.log_context import LogContext, PIDOutputs, RCOutputs
 
 
@@ -16,21 +22,105 @@ class Controller:
     - Loop timing and fail safes
     """
 
-    def __init__(self, drone_interface, target_altitude=0.5):
+    # Feedforward damping gains applied on top of the PID outputs
+    VEL_DAMPING_GAIN = 8.0
+    YAW_DAMPING_GAIN = 0.7
+
+    TRIGGERS = ("timer", "telemetry")
+
+    def __init__(self, drone_interface, target_altitude=0.5, clock=None, logger=None,
+                 loop_rate_hz=25.0, overrun_policy="skip", spin_time=0.0,
+                 stage_timing=False, pids=None, watch_config=None,
+                 reset_integrators_on_reload=False, rates=None, trigger="timer",
+                 telemetry_timeout=0.2, max_sample_age=0.05, estimator=None,
+                 flight_recorder=None, telemetry_publisher=None):
         """
         drone_interface: object implementing connect(), takeoff(), land(),
-                         get_state(), send_rc(lr, fb, ud, yaw)
+                         get_state(out=None), send_rc(lr, fb, ud, yaw)
         target_altitude: desired hover altitude in meters
+        clock: time source for the loop (MonotonicClock if None); pass a
+               VirtualClock to run simulations/replays faster than real time
+        logger: object implementing log_frame(ctx) and close()
+                (a full_pid DataLogger writing to logs/ if None)
+        loop_rate_hz: target control loop rate
+        overrun_policy: "skip" or "catch_up" (see LoopScheduler)
+        spin_time: busy-wait this many seconds before each deadline
+                   (e.g. 0.001) for lower wake-up jitter
+        stage_timing: record per-stage latency histograms (get_state,
+                      estimate, pid, log, send_rc); the default logger then
+                      uses the full_pid_timing profile to log them per row
+        pids: (pid_x, pid_y, pid_z, pid_yaw) PID instances to use
+              (new instances from config/pid_config.json if None, so
+              every controller owns its integrator state)
+        watch_config: hot-reload gains while flying; True watches
+                      config/pid_config.json, a path watches that file
+                      (disabled if None/False)
+        reset_integrators_on_reload: reset PID integrators and derivative
+                                     history when new gains are applied
+                                     (they are kept by default)
+        rates: multi-rate mode, {group: rate_hz} for any of "estimate",
+               "z_yaw", "xy", "log" and "rc" (see RateGroups); the loop
+               ticks at loop_rate_hz, which must be the fastest rate, and
+               unlisted groups run every tick. None runs everything at
+               loop_rate_hz.
+        trigger: "timer" ticks on the fixed loop_rate_hz schedule;
+                 "telemetry" runs an iteration as soon as a new telemetry
+                 packet arrives (drone must implement wait_for_state()),
+                 stamped with the packet's receive time
+        telemetry_timeout: in telemetry mode, seconds without a packet
+                           before a fallback tick runs on the last sample
+        max_sample_age: in telemetry mode, packets older than this when
+                        consumed are counted as stale
+        estimator: state estimator instance (built from
+                   config/estimator_config.json if None, see
+                   controller.estimators.build_estimator)
+        flight_recorder: FlightRecorder keeping every tick (raw state,
+                         estimate, P/I/D terms, RC output) in memory for
+                         post-mortems; True keeps the last 60 s at
+                         loop_rate_hz (disabled if None/False). It is
+                         dumped when start() ends, before landing, and on
+                         request_flight_dump()
+        telemetry_publisher: live stream for a ground station, e.g. a
+                             utils.telemetry_stream.TelemetryPublisher;
+                             publish(ctx, loop_stats) is called after each
+                             tick's RC output and must not block
         """
+        if trigger not in self.TRIGGERS:
+            raise ValueError(f"Unknown trigger: {trigger}")
         self.drone = drone_interface
-        self.state_estimator = StateEstimator()
+        self.clock = clock if clock is not None else MonotonicClock()
+        if estimator is None:
+            estimator = build_estimator(clock=self.clock, loop_rate_hz=loop_rate_hz)
+        self.state_estimator = estimator
+
+        if pids is None:
+            pids = create_pids()
+        self.pid_x, self.pid_y, self.pid_z, self.pid_yaw = pids
+
+        # Per-stage latency instrumentation (None when disabled)
+        self.stage_timer = StageTimer() if stage_timing else None
+
+        # Telemetry-triggered ticks
+        self.trigger = trigger
+        self.telemetry_timeout = telemetry_timeout
+        self.max_sample_age = max_sample_age
+        self.telemetry_stats = TelemetryStats()
+
+        # Per-group rates inside the single loop schedule
+        self.rate_groups = RateGroups(loop_rate_hz, rates)
+        self._every = self.rate_groups.every
+        self._tick = 0
 
         # Logger now handles frequency internally
-        self.logger = DataLogger(
-            filename="pid_flight.csv",
-            mode="full_pid",
-            log_every_n=5   # ~5 Hz logging at 25 Hz loop
-        )
+        if logger is None:
+            logger = DataLogger(
+                filename="pid_flight.csv",
+                mode="full_pid_timing" if stage_timing else "full_pid",
+                # ~5 Hz logging at 25 Hz loop, unless the "log" group sets the rate
+                log_every_n=1 if rates and "log" in rates else 5,
+                async_mode=True  # file I/O happens on a writer thread
+            )
+        self.logger = logger
 
         # Desired hover point (x=0, y=0, z=target_altitude)
         self.setpoint = {
@@ -39,9 +129,15 @@ class Controller:
             "z": target_altitude
         }
 
-        # Loop timing
-        self.loop_rate_hz = 25.0
+        # Loop timing (absolute-deadline scheduler)
+        self.loop_rate_hz = loop_rate_hz
         self.loop_dt = 1.0 / self.loop_rate_hz
+        self.scheduler = LoopScheduler(
+            self.clock,
+            rate_hz=loop_rate_hz,
+            overrun_policy=overrun_policy,
+            spin_time=spin_time
+        )
 
         # Failsafe flag
         self.running = True
@@ -49,8 +145,46 @@ class Controller:
         # Initialize yaw target (set properly after takeoff)
         self.target_yaw = None
 
-    def start(self):
-        """Initialize drone and begin control loop."""
+        # Per-tick state, preallocated once and refilled in place so the
+        # steady-state loop allocates no state containers
+        self._raw_state = DroneState.empty()
+        self._context = LogContext(
+            timestamp=0.0,
+            loop_dt=0.0,
+            est=EstimatedState.zeros(),
+            raw=self._raw_state,
+            pid=PIDOutputs(),
+            rc=RCOutputs(),
+            setpoint=[0.0, 0.0, 0.0, 0.0],
+            stages=self.stage_timer.last if self.stage_timer is not None else None
+        )
+
+        # Live gain reload (validated off the hot path, applied between ticks)
+        self.config_watcher = None
+        if watch_config:
+            self.config_watcher = ConfigWatcher(None if watch_config is True else watch_config)
+        self.reset_integrators_on_reload = reset_integrators_on_reload
+
+        # Full-rate in-memory black box (None when disabled)
+        if flight_recorder is True:
+            flight_recorder = FlightRecorder(capacity=int(60 * loop_rate_hz))
+        elif flight_recorder is False:
+            flight_recorder = None
+        self.flight_recorder = flight_recorder
+        self._dump_requested = False
+        if self.flight_recorder is not None:
+            self._context.terms = [0.0] * 12
+
+        # Live telemetry stream (None when disabled)
+        self.telemetry_publisher = telemetry_publisher
+
+        self._report_printed = False
+
+    def start(self, max_ticks=None):
+        """
+        Initialize drone and begin control loop.
+        max_ticks: stop after this many iterations (run until stopped if None)
+        """
         print("Connecting to drone...")
         self.drone.connect()
 
@@ -58,7 +192,7 @@ class Controller:
         self.drone.takeoff()
 
         print("Stabilizing before starting PID loop...")
-        time.sleep(2.0)
+        self.clock.sleep(2.0)
 
         # Reset estimator AFTER takeoff and stabilization
         self.state_estimator.reset()
@@ -69,15 +203,79 @@ class Controller:
 
         print("estimator reset... Starting PID loop...")
 
+        if self.config_watcher is not None:
+            self.config_watcher.start()
+
+        dump_reason = "landing"
         try:
-            self.control_loop()
+            self.control_loop(max_ticks)
         except KeyboardInterrupt:
             print("Kill switch activated.")
+            dump_reason = "kill_switch"
+        except BaseException:
+            dump_reason = "crash"
+            raise
         finally:
             print("Exiting...")
+            if self.config_watcher is not None:
+                self.config_watcher.stop()
+            # Written before landing, which may itself fail
+            self.dump_flight_recorder(dump_reason)
             print("Landing...")
             self.drone.land()
             self.logger.close()
+            if self.telemetry_publisher is not None:
+                self.telemetry_publisher.close()
+            self._print_report()
+
+    def request_flight_dump(self):
+        """
+        Ask the loop to dump the flight recorder between ticks; safe to
+        call from other threads and signal handlers.
+        """
+        self._dump_requested = True
+
+    def dump_flight_recorder(self, reason="manual"):
+        """
+        Write the flight recorder's buffered ticks to disk now.
+        Returns the file path (None if disabled or nothing new was recorded).
+        """
+        self._dump_requested = False
+        recorder = self.flight_recorder
+        if recorder is None:
+            return None
+        try:
+            path = recorder.dump(reason)
+        except Exception as e:
+            print(f"[FLIGHT RECORDER ERROR] Dump failed: {e}")
+            return None
+        if path is not None:
+            print(f"Flight recorder: {len(recorder)} ticks written to {path}")
+        return path
+
+    @property
+    def loop_stats(self):
+        """Live loop timing statistics (achieved period, jitter, overruns)."""
+        return self.scheduler.stats
+
+    def _print_report(self):
+        """Print loop timing and stage latency summaries once at shutdown."""
+        if self._report_printed:
+            return
+        self._report_printed = True
+        print(f"Loop timing: {self.loop_stats}")
+        if self.trigger == "telemetry":
+            print(f"Telemetry: {self.telemetry_stats}")
+        rc_output = getattr(self.drone, "rc_output", None)
+        if rc_output is not None:
+            print(f"RC packets: {rc_output}")
+        if self.telemetry_publisher is not None:
+            print(f"Telemetry stream: {self.telemetry_publisher}")
+        if any(every > 1 for every in self._every.values()):
+            print(f"Rate groups: {self.rate_groups}")
+        if self.stage_timer is not None:
+            print("Stage latency:")
+            print(self.stage_timer.report())
 
     @staticmethod
     def _angle_difference(target, current):
@@ -92,77 +290,286 @@ class Controller:
             diff += 360
         return diff
 
-    def control_loop(self):
-        """Main PID control loop running at ~25 Hz."""
+    def control_loop(self, max_ticks=None):
+        """
+        Main PID control loop running at ~25 Hz.
+        max_ticks: stop after this many iterations (run until stopped if None)
+        """
         print("Starting control loop...")
-
+        if self.trigger == "telemetry":
+            self._telemetry_loop(max_ticks)
+            return
+
+        scheduler = self.scheduler
+        scheduler.reset()
+        timer = self.stage_timer
+        now_ns = StageTimer.now_ns
+        # Stage boundaries (ns) of the current tick, see StageTimer.record
+        marks = [0] * 6 if timer is not None else None
+        prev_timestamp = None
+
+        watcher = self.config_watcher
+        publisher = self.telemetry_publisher
+        stats = scheduler.stats
+        raw_buffer = self._raw_state
+        estimate_every = self._every["estimate"]
+        rc_every = self._every["rc"]
+
+        ticks = 0
         while self.running:
-            loop_start = time.time()
-            timestamp = loop_start  # unified timestamp for this iteration
+            if max_ticks is not None and ticks >= max_ticks:
+                break
+            ticks += 1
+
+            # Swap in reloaded gains between ticks (already parsed and validated)
+            if watcher is not None and watcher.pending is not None:
+                self.apply_pid_configs(watcher.take_pending())
+            if self._dump_requested:
+                self.dump_flight_recorder()
+
+            # Wait for the next absolute deadline; this is the one clock read
+            # that every stage of the iteration shares
+            timestamp = scheduler.next_tick()
+            loop_dt = 0.0 if prev_timestamp is None else timestamp - prev_timestamp
+            prev_timestamp = timestamp
+
+            if timer is not None:
+                marks[0] = now_ns()
+
+            tick = self._tick
 
             # ---------------------------------------
-            # 1. Pull raw sensor data
+            # 1. Pull raw sensor data (estimator rate)
             # ---------------------------------------
-            raw_state = self.drone.get_state()  # returns DroneState
+            if tick % estimate_every == 0:
+                self.drone.get_state(raw_buffer)  # refills the DroneState
+
+            if timer is not None:
+                marks[1] = now_ns()
 
             # ---------------------------------------
-            # 2. Estimate world-frame state
+            # 2-4. Estimate, compute PID corrections, log
             # ---------------------------------------
-            est = self.state_estimator.estimate(raw_state)
+            ctx = self.step(raw_buffer, timestamp, loop_dt, marks)
+            rc = ctx.rc
 
             # ---------------------------------------
-            # 3. Compute PID corrections
+            # 5. Send RC command to drone (latest output of every group)
             # ---------------------------------------
+            if tick % rc_every == 0:
+                self.drone.send_rc(rc.lr, rc.fb, rc.ud, rc.yaw)
+
+            # Live stream (non-blocking; decimated by the publisher)
+            if publisher is not None:
+                publisher.publish(ctx, stats)
+
+            if timer is not None:
+                marks[5] = now_ns()
+                timer.record(*marks)
+
+    def _telemetry_loop(self, max_ticks):
+        """
+        Event-driven variant of control_loop: each iteration starts when
+        the drone's receive path signals a new packet, and estimation and
+        PIDs run on that packet's receive timestamp, so the estimator's dt
+        is the true inter-sample time. If no packet arrives within
+        telemetry_timeout, a fallback tick re-runs the PIDs and RC output
+        on the last estimate without feeding the duplicate sample to the
+        estimator.
+        """
+        clock = self.clock
+        stats = self.scheduler.stats
+        stats.reset()
+        telemetry = self.telemetry_stats
+        telemetry.reset()
+        timer = self.stage_timer
+        now_ns = StageTimer.now_ns
+        marks = [0] * 6 if timer is not None else None
+
+        watcher = self.config_watcher
+        publisher = self.telemetry_publisher
+        raw_buffer = self._raw_state
+        rc_every = self._every["rc"]
+        timeout = self.telemetry_timeout
+        max_age = self.max_sample_age
+
+        last_seq = None
+        prev_timestamp = None
+        prev_tick = None
+
+        ticks = 0
+        while self.running:
+            if max_ticks is not None and ticks >= max_ticks:
+                break
+            ticks += 1
+
+            if watcher is not None and watcher.pending is not None:
+                self.apply_pid_configs(watcher.take_pending())
+            if self._dump_requested:
+                self.dump_flight_recorder()
+
+            # Block until the receive path signals a new packet (or timeout)
+            fresh = self.drone.wait_for_state(last_seq, timeout)
+            now = clock.now()
+
+            stats.ticks += 1
+            if prev_tick is not None:
+                stats.update(now - prev_tick)
+            prev_tick = now
+
+            if timer is not None:
+                marks[0] = now_ns()
+
+            raw_state = self.drone.get_state(raw_buffer)
+
+            if timer is not None:
+                marks[1] = now_ns()
+
+            # Duplicate / stale detection
+            if fresh and raw_state.seq != last_seq:
+                if last_seq is not None and raw_state.seq > last_seq + 1:
+                    telemetry.missed += raw_state.seq - last_seq - 1
+                last_seq = raw_state.seq
+                timestamp = raw_state.timestamp if raw_state.timestamp is not None else now
+                age = now - timestamp
+                telemetry.record_sample(age, age > max_age)
+            else:
+                fresh = False
+                telemetry.timeouts += 1
+                timestamp = now
+
+            # Keep PID time monotonic across fallback ticks
+            if prev_timestamp is not None and timestamp < prev_timestamp:
+                timestamp = prev_timestamp
+            loop_dt = 0.0 if prev_timestamp is None else timestamp - prev_timestamp
+            prev_timestamp = timestamp
+
+            tick = self._tick
+            ctx = self.step(raw_state, timestamp, loop_dt, marks, fresh=fresh)
+            rc = ctx.rc
+
+            if tick % rc_every == 0:
+                self.drone.send_rc(rc.lr, rc.fb, rc.ud, rc.yaw)
+
+            # Live stream (non-blocking; decimated by the publisher)
+            if publisher is not None:
+                publisher.publish(ctx, stats)
+
+            if timer is not None:
+                marks[5] = now_ns()
+                timer.record(*marks)
+
+    def apply_pid_configs(self, configs):
+        """
+        Load new (x, y, z, yaw) PIDConfigs into the live PIDs.
+        Integrator and derivative state is kept unless
+        reset_integrators_on_reload is set.
+        """
+        pids = (self.pid_x, self.pid_y, self.pid_z, self.pid_yaw)
+        for pid, config in zip(pids, configs):
+            pid.config = config
+            if self.reset_integrators_on_reload:
+                pid.reset()
 
-            # Velocity damping (feedforward)
-            vx = est.velocity[0]
-            vy = est.velocity[1]
+    def step(self, raw_state, timestamp, loop_dt=0.0, marks=None, fresh=True):
+        """
+        Run estimation, the PID stack and logging for one telemetry sample
+        taken at `timestamp`, without touching the drone or the clock.
+        Returns the LogContext of the iteration (its rc field holds the
+        commands to send). Used by control_loop and by offline log replay.
 
-            vel_damping_gain = 8.0
+        The returned context is the controller's preallocated one and is
+        overwritten by the next step(); use ctx.copy() to keep it.
 
-            # --- X/Y/Z PID corrections ---
-            lr_cmd = pid_x.compute(self.setpoint["x"], est.position[0]) - vel_damping_gain * vx
-            fb_cmd = pid_y.compute(self.setpoint["y"], est.position[1]) - vel_damping_gain * vy
-            ud_cmd = pid_z.compute(self.setpoint["z"], est.position[2])
+        marks: optional stage-boundary list filled in for StageTimer
+        fresh: False when raw_state was already estimated (telemetry
+               timeout); the PIDs then run on the latest estimate
+        """
+        now_ns = StageTimer.now_ns
+        ctx = self._context
+        every = self._every
+        tick = self._tick
+        self._tick = tick + 1
+
+        # ---------------------------------------
+        # 2. Estimate world-frame state
+        # ---------------------------------------
+        if fresh and tick % every["estimate"] == 0:
+            est = self.state_estimator.estimate(raw_state, timestamp, ctx.est)
+            ctx.raw = raw_state
+        else:
+            est = ctx.est  # latest estimate
+
+        if marks is not None:
+            marks[2] = now_ns()
+
+        # ---------------------------------------
+        # 3. Compute PID corrections; groups that are not due keep their
+        #    latest output in ctx.pid / ctx.rc
+        # ---------------------------------------
+        pid = ctx.pid
+        rc = ctx.rc
+        setpoint = self.setpoint
+
+        # --- X/Y PID corrections with velocity damping (feedforward) ---
+        if tick % every["xy"] == 0:
+            vel_damping_gain = self.VEL_DAMPING_GAIN
+            lr_cmd = self.pid_x.compute(setpoint["x"], est.position[0], timestamp) - vel_damping_gain * est.velocity[0]
+            fb_cmd = self.pid_y.compute(setpoint["y"], est.position[1], timestamp) - vel_damping_gain * est.velocity[1]
+            pid.lr = rc.lr = lr_cmd
+            pid.fb = rc.fb = fb_cmd
+
+        if tick % every["z_yaw"] == 0:
+            # --- Z PID correction ---
+            ud_cmd = self.pid_z.compute(setpoint["z"], est.position[2], timestamp)
 
             # --- Yaw PID correction ---
             yaw_error = self._angle_difference(self.target_yaw, est.attitude[2])
-            yaw_cmd = pid_yaw.compute(0.0, yaw_error)
+            yaw_cmd = self.pid_yaw.compute(0.0, yaw_error, timestamp)
 
             # Yaw-rate damping
             yaw_rate = est.angular_velocity[2]
-            yaw_damping_gain = 0.7
+            yaw_damping_gain = self.YAW_DAMPING_GAIN
             yaw_cmd -= yaw_damping_gain * yaw_rate
 
-            # ---------------------------------------
-            # 4. Build logging context and log frame
-            # ---------------------------------------
-            elapsed = time.time() - loop_start
-
-            ctx = LogContext(
-                timestamp=timestamp,
-                loop_dt=elapsed,
-                est=est,
-                raw=raw_state,
-                pid=PIDOutputs(lr_cmd, fb_cmd, ud_cmd, yaw_cmd),
-                rc=RCOutputs(lr_cmd, fb_cmd, ud_cmd, yaw_cmd)
-            )
-
+            pid.ud = rc.ud = ud_cmd
+            pid.yaw = rc.yaw = yaw_cmd
+
+        if marks is not None:
+            marks[3] = now_ns()
+
+        # ---------------------------------------
+        # 4. Refill logging context and log frame
+        # ---------------------------------------
+        ctx.timestamp = timestamp
+        ctx.wall_time = timestamp + self.clock.wall_offset
+        ctx.loop_dt = loop_dt
+        targets = ctx.setpoint
+        targets[0] = setpoint["x"]
+        targets[1] = setpoint["y"]
+        targets[2] = setpoint["z"]
+        targets[3] = self.target_yaw
+
+        if tick % every["log"] == 0:
             self.logger.log_frame(ctx)
 
-            # ---------------------------------------
-            # 5. Send RC command to drone
-            # ---------------------------------------
-            self.drone.send_rc(lr_cmd, fb_cmd, ud_cmd, yaw_cmd)
+        # Every tick goes to the flight recorder, whatever the log rate
+        recorder = self.flight_recorder
+        if recorder is not None:
+            terms = ctx.terms
+            terms[0:3] = self.pid_x.terms
+            terms[3:6] = self.pid_y.terms
+            terms[6:9] = self.pid_z.terms
+            terms[9:12] = self.pid_yaw.terms
+            recorder.record(ctx)
 
-            # ---------------------------------------
-            # 6. Maintain loop timing
-            # ---------------------------------------
-            sleep_time = self.loop_dt - elapsed
-            if sleep_time > 0:
-                time.sleep(sleep_time)
+        if marks is not None:
+            marks[4] = now_ns()
+
+        return ctx
 
     def stop(self):
         """External stop trigger for fail safes."""
         self.running = False
-        self.logger.close()
\ No newline at end of file
+        self.logger.close()
+        self._print_report()
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+Pluggable state estimator backends.
+
+config/estimator_config.json selects the backend ("backend") and holds a
+parameter section per backend. Controller and FleetController build their
+estimators through build_estimator(), so switching backends is a config
+change.
+"""
+
+from .kalman_estimator import KalmanStateEstimator
+from .state_estimator import StateEstimator
+from utils.config_loader import load_estimator_config
+
+ESTIMATOR_BACKENDS = {
+    "complementary": lambda params, clock, loop_rate_hz: StateEstimator(clock=clock),
+    "kalman": lambda params, clock, loop_rate_hz: KalmanStateEstimator.from_config(
+        params, clock=clock, loop_rate_hz=loop_rate_hz),
+}
+
+
+def build_estimator(config=None, clock=None, backend=None, loop_rate_hz=None):
+    """
+    Build a state estimator.
+    config: parsed estimator_config.json dict (loaded from disk if None)
+    clock: fallback clock for the estimator
+    backend: override config["backend"]
+    loop_rate_hz: rate the estimator will be stepped at (backends that
+                  precompute per-period matrices derive their period from it)
+    """
+    if config is None:
+        config = load_estimator_config()
+    backend = backend or config.get("backend", "complementary")
+    try:
+        factory = ESTIMATOR_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown estimator backend: {backend}") from None
+    return factory(config.get(backend, {}), clock, loop_rate_hz)
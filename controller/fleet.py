@@ -0,0 +1,241 @@
+import asyncio
+
+import numpy as np
+
+from .controller import Controller
+from .scheduler import LoopScheduler
+from .estimators import build_estimator
+from .state_estimator import EstimatedState
+from control.pid import PIDBank
+from control.pid.pid_base import AXIS_NAMES
+from drone.drone_interface import DroneInterface
+from drone.drone_state import DroneState
+from utils.clock import MonotonicClock
+from utils.logger import DataLogger
+from utils.log_context import LogContext, PIDOutputs, RCOutputs
+
+
+class Vehicle:
+    """
+    Per-vehicle state owned by a FleetController: its drone, its own
+    estimator, its PID rows in the fleet's PIDBank, setpoint and logger.
+    """
+
+    def __init__(self, name, drone, first_row, target_altitude, logger, clock,
+                 estimator_config=None, loop_rate_hz=None):
+        self.name = name
+        self.drone = drone
+        self.state_estimator = build_estimator(estimator_config, clock=clock,
+                                               loop_rate_hz=loop_rate_hz)
+        self.logger = logger
+        self.rows = slice(first_row, first_row + len(AXIS_NAMES))
+
+        self.setpoint = {
+            "x": 0.0,
+            "y": 0.0,
+            "z": target_altitude
+        }
+        self.target_yaw = None
+
+        # Per-tick state, refilled in place every tick
+        self.raw_state = DroneState.empty()
+        self.context = LogContext(
+            timestamp=0.0,
+            loop_dt=0.0,
+            est=EstimatedState.zeros(),
+            raw=self.raw_state,
+            pid=PIDOutputs(),
+            rc=RCOutputs(),
+            setpoint=[0.0, 0.0, 0.0, 0.0]
+        )
+
+
+class FleetController:
+    """
+    Asyncio controller flying many vehicles from one process and one core.
+
+    Every vehicle gets its own state estimator and its own PID rows, so no
+    integrator state is shared. All PIDs of the fleet live in a single
+    PIDBank and are stepped with one bank call per tick (vectorized once
+    the fleet is large enough for that to pay off). Blocking
+    SDK calls (connect/takeoff/land) run in the default executor
+    concurrently; per-tick telemetry reads and RC sends are non-blocking
+    (DroneInterface snapshots the latest packet, send_rc is a UDP send).
+
+    The control law matches Controller: world-frame PID on x/y/z with
+    velocity damping, and heading hold with yaw-rate damping.
+    """
+
+    def __init__(self, drones, target_altitude=0.5, clock=None, loop_rate_hz=25.0,
+                 overrun_policy="skip", loggers=None, pid_config=None, estimator_config=None):
+        """
+        drones: mapping {name: drone} or sequence of drones implementing the
+                DroneInterface API (real Tellos or SimDrone stand-ins); a
+                host address string in place of a drone connects a
+                DroneInterface to the Tello at that address
+        target_altitude: desired hover altitude in meters for every vehicle
+        clock: shared time source (MonotonicClock if None)
+        loop_rate_hz / overrun_policy: fleet tick schedule (see LoopScheduler)
+        loggers: mapping {name: logger} (a full_pid DataLogger per vehicle
+                 for any vehicle not listed, if None)
+        pid_config: parsed pid_config.json dict (loaded from disk if None)
+        estimator_config: parsed estimator_config.json dict (loaded from
+                          disk if None)
+        """
+        if not isinstance(drones, dict):
+            drones = {f"drone{i}": drone for i, drone in enumerate(drones)}
+        loggers = loggers or {}
+
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.bank = PIDBank.from_config(pid_config, count=len(drones))
+        self.scheduler = LoopScheduler(self.clock, rate_hz=loop_rate_hz,
+                                       overrun_policy=overrun_policy)
+
+        self.vehicles = []
+        for index, (name, drone) in enumerate(drones.items()):
+            if isinstance(drone, str):
+                drone = DroneInterface(host=drone)
+            logger = loggers.get(name)
+            if logger is None:
+                logger = DataLogger(
+                    filename=f"{name}_pid_flight.csv",
+                    mode="full_pid",
+                    log_every_n=5,
+                    async_mode=True
+                )
+            self.vehicles.append(Vehicle(
+                name, drone, index * len(AXIS_NAMES),
+                target_altitude, logger, self.clock, estimator_config, loop_rate_hz
+            ))
+
+        # Preallocated per-tick bank inputs
+        self._setpoints = np.zeros(self.bank.size)
+        self._measurements = np.zeros(self.bank.size)
+
+        self.running = True
+
+    # ---------------------------------------------------------
+    # Lifecycle
+    # ---------------------------------------------------------
+
+    def run(self, max_ticks=None):
+        """Blocking entry point: run the whole flight on a new event loop."""
+        asyncio.run(self.start(max_ticks))
+
+    async def start(self, max_ticks=None):
+        """Connect, take off and stabilize every vehicle, then fly."""
+        print(f"Connecting to {len(self.vehicles)} drones...")
+        await self._for_each_drone("connect")
+
+        print("Taking off...")
+        await self._for_each_drone("takeoff")
+
+        print("Stabilizing before starting PID loop...")
+        await self.clock.sleep_until_async(self.clock.now() + 2.0)
+
+        for vehicle in self.vehicles:
+            vehicle.state_estimator.reset()
+            vehicle.target_yaw = vehicle.drone.get_state().orientation[2]
+        self.bank.reset()
+
+        try:
+            await self.control_loop(max_ticks)
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            print("Kill switch activated.")
+        finally:
+            print("Landing...")
+            await self._for_each_drone("land")
+            for vehicle in self.vehicles:
+                vehicle.logger.close()
+            print(f"Loop timing: {self.scheduler.stats}")
+
+    async def _for_each_drone(self, method):
+        """Run a blocking drone method on every vehicle concurrently."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(None, getattr(vehicle.drone, method))
+            for vehicle in self.vehicles
+        ))
+
+    def stop(self):
+        """External stop trigger for fail safes."""
+        self.running = False
+
+    # ---------------------------------------------------------
+    # Control loop
+    # ---------------------------------------------------------
+
+    async def control_loop(self, max_ticks=None):
+        """Fleet control loop: one vectorized PID step per tick for all vehicles."""
+        print("Starting fleet control loop...")
+
+        scheduler = self.scheduler
+        scheduler.reset()
+        prev_timestamp = None
+
+        ticks = 0
+        while self.running:
+            if max_ticks is not None and ticks >= max_ticks:
+                break
+            ticks += 1
+
+            timestamp = await scheduler.next_tick_async()
+            loop_dt = 0.0 if prev_timestamp is None else timestamp - prev_timestamp
+            prev_timestamp = timestamp
+
+            self.step(timestamp, loop_dt)
+
+    def step(self, timestamp, loop_dt=0.0):
+        """Run one control iteration for every vehicle at the given tick time."""
+        setpoints = self._setpoints
+        measurements = self._measurements
+        vehicles = self.vehicles
+
+        # 1-2. Telemetry and estimation, filling the bank's input rows
+        row = 0
+        for vehicle in vehicles:
+            raw_state = vehicle.drone.get_state(vehicle.raw_state)
+            est = vehicle.state_estimator.estimate(raw_state, timestamp, vehicle.context.est)
+
+            setpoint = vehicle.setpoint
+            setpoints[row] = setpoint["x"]
+            setpoints[row + 1] = setpoint["y"]
+            setpoints[row + 2] = setpoint["z"]
+            measurements[row] = est.position[0]
+            measurements[row + 1] = est.position[1]
+            measurements[row + 2] = est.position[2]
+            # Heading hold on the wrapped yaw error, same call as Controller's
+            # pid_yaw.compute(0.0, yaw_error)
+            setpoints[row + 3] = 0.0
+            measurements[row + 3] = Controller._angle_difference(vehicle.target_yaw, est.attitude[2])
+            row += len(AXIS_NAMES)
+
+        # 3. One vectorized PID update for the whole fleet
+        outputs = self.bank.compute(setpoints, measurements, timestamp).tolist()
+
+        # 4-5. Damping, logging and RC output
+        wall_time = timestamp + self.clock.wall_offset
+        row = 0
+        for vehicle in vehicles:
+            ctx = vehicle.context
+            est = ctx.est
+            lr_cmd = outputs[row] - Controller.VEL_DAMPING_GAIN * est.velocity[0]
+            fb_cmd = outputs[row + 1] - Controller.VEL_DAMPING_GAIN * est.velocity[1]
+            ud_cmd = outputs[row + 2]
+            yaw_cmd = outputs[row + 3] - Controller.YAW_DAMPING_GAIN * est.angular_velocity[2]
+            row += len(AXIS_NAMES)
+
+            ctx.timestamp = timestamp
+            ctx.wall_time = wall_time
+            ctx.loop_dt = loop_dt
+            ctx.pid.set(lr_cmd, fb_cmd, ud_cmd, yaw_cmd)
+            ctx.rc.set(lr_cmd, fb_cmd, ud_cmd, yaw_cmd)
+            setpoint = vehicle.setpoint
+            targets = ctx.setpoint
+            targets[0] = setpoint["x"]
+            targets[1] = setpoint["y"]
+            targets[2] = setpoint["z"]
+            targets[3] = vehicle.target_yaw
+
+            vehicle.logger.log_frame(ctx)
+            vehicle.drone.send_rc(lr_cmd, fb_cmd, ud_cmd, yaw_cmd)
@@ -0,0 +1,115 @@
+import bisect
+import time
+
+# Stages of one Controller.control_loop iteration, in execution order
+STAGES = ("get_state", "estimate", "pid", "log", "send_rc")
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram in nanoseconds.
+    Buckets are log-spaced (4 per octave) from 1 µs to ~16 s and allocated
+    once, so recording a sample only bisects a list and bumps a counter.
+    Percentiles are reported as the upper edge of the matching bucket
+    (within ~19 %); count, mean and max are exact.
+    """
+
+    BUCKETS_PER_OCTAVE = 4
+    MIN_NS = 1000
+    NUM_BUCKETS = 96
+
+    def __init__(self):
+        factor = 2.0 ** (1.0 / self.BUCKETS_PER_OCTAVE)
+        self.edges = [int(self.MIN_NS * factor ** i) for i in range(self.NUM_BUCKETS)]
+        self.counts = [0] * (self.NUM_BUCKETS + 1)   # last bucket: overflow
+        self.reset()
+
+    def reset(self):
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns):
+        self.counts[bisect.bisect_left(self.edges, ns)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, q):
+        """Approximate q-th percentile (0-100) in nanoseconds."""
+        if self.count == 0:
+            return 0
+        target = q / 100.0 * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target and count:
+                if index < len(self.edges):
+                    return min(self.edges[index], self.max_ns)
+                return self.max_ns
+        return self.max_ns
+
+    def summary(self):
+        """Return count/mean/p50/p99/max with times in microseconds."""
+        mean_ns = self.total_ns / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "mean_us": mean_ns / 1e3,
+            "p50_us": self.percentile(50) / 1e3,
+            "p99_us": self.percentile(99) / 1e3,
+            "max_us": self.max_ns / 1e3,
+        }
+
+
+class StageTimer:
+    """
+    Per-stage latency instrumentation for the control loop.
+
+    The controller takes one perf_counter_ns() reading at each stage
+    boundary and calls record() once per tick with those readings.
+    `last` holds the most recent duration of every stage in microseconds
+    and is updated in place, so it can be referenced from log rows.
+    """
+
+    def __init__(self, stages=STAGES):
+        self.stages = tuple(stages)
+        self.histograms = [LatencyHistogram() for _ in self.stages]
+        self.last = [0.0] * len(self.stages)
+
+    # Bound for the controller's hot path
+    now_ns = staticmethod(time.perf_counter_ns)
+
+    def record(self, *boundaries):
+        """
+        boundaries: len(stages) + 1 timestamps (ns) taken before the first
+                    stage, between stages and after the last stage
+        """
+        last = self.last
+        histograms = self.histograms
+        for i in range(len(histograms)):
+            elapsed = boundaries[i + 1] - boundaries[i]
+            histograms[i].record(elapsed)
+            last[i] = elapsed / 1e3
+
+    def reset(self):
+        for histogram in self.histograms:
+            histogram.reset()
+        for i in range(len(self.last)):
+            self.last[i] = 0.0
+
+    def summary(self):
+        """Return {stage: histogram summary}."""
+        return {stage: hist.summary() for stage, hist in zip(self.stages, self.histograms)}
+
+    def report(self):
+        """Format the per-stage latency table as text."""
+        lines = [f"{'stage':<10} {'count':>8} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'max us':>9}"]
+        for stage, s in self.summary().items():
+            lines.append(
+                f"{stage:<10} {s['count']:>8} {s['mean_us']:>9.1f} {s['p50_us']:>9.1f} "
+                f"{s['p99_us']:>9.1f} {s['max_us']:>9.1f}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,221 @@
+import math
+
+import numpy as np
+
+from .state_estimator import EstimatedState, StateEstimator
+from drone.drone_state import DroneState
+from utils.transforms import body_to_world_velocity
+
+GRAVITY = 9.81  # m/s^2
+
+
+class KalmanStateEstimator(StateEstimator):
+    """
+    Constant-acceleration Kalman filter per world axis.
+
+    Each axis (x, y, z) has the state [position, velocity, acceleration],
+    driven by white jerk noise. The three axes are stored as one (3, 3)
+    state array and one (3, 3, 3) covariance stack, so the predict step and
+    every measurement update run vectorized across axes.
+
+    Measurements (all sequential scalar updates):
+    - world-frame velocity from vgx/vgy/vgz (rotated by yaw), every axis
+    - world-frame acceleration from agx/agy/agz (milli-g, gravity removed)
+    - altitude from ToF, height and barometer relative to their takeoff
+      baselines, each with its own noise, z axis only
+
+    The transition and process-noise matrices are built for nominal_dt (the
+    loop period) up front and reused for every dt within dt_tolerance of it,
+    so steady-rate loops with ordinary scheduling jitter never recompute
+    them. Ticks further off nominal (overruns, telemetry-triggered loops)
+    use a second set built for their dt, cached for the next such tick.
+
+    Velocities are converted to world-frame m/s with the same
+    utils.transforms helper as StateEstimator. Yaw and yaw rate are
+    estimated exactly as in StateEstimator.
+
+    Limitation: agx/agy are treated as linear acceleration in the level
+    body frame and rotated by yaw only; pitch and roll are ignored, and
+    gravity is removed from z alone. On a real Tello the accelerometer
+    also measures gravity projected by tilt (about 1.7 m/s² horizontally at
+    10°), which this filter reads as horizontal acceleration. SimDrone
+    reports level linear acceleration, so simulated runs do not show it.
+    Keep the complementary backend (the default) for real flights until
+    the acceleration update is tilt-compensated.
+    """
+
+    def __init__(self, clock=None, nominal_dt=0.04, dt_tolerance=0.05,
+                 jerk_noise=(4.0, 4.0, 4.0), velocity_noise=0.05, acceleration_noise=0.3,
+                 tof_noise=0.02, height_noise=0.06, baro_noise=0.3,
+                 initial_variance=(1e-4, 0.25, 1.0)):
+        """
+        clock: fallback clock for estimate() calls without a timestamp
+        nominal_dt: loop period the matrices are precomputed for (s)
+        dt_tolerance: relative dt error, as a fraction of nominal_dt, within
+                      which cached matrices are reused
+        jerk_noise: per-axis white-jerk spectral density (m²/s⁵)
+        velocity_noise / acceleration_noise: measurement std devs (m/s, m/s²)
+        tof_noise / height_noise / baro_noise: altitude std devs (m)
+        initial_variance: [position, velocity, acceleration] variance after reset
+        """
+        super().__init__(clock=clock)
+        self.nominal_dt = nominal_dt
+        self.dt_tolerance = dt_tolerance
+        self.jerk_noise = np.asarray(jerk_noise, dtype=float)
+        self.velocity_var = np.full(3, velocity_noise ** 2)
+        self.acceleration_var = np.full(3, acceleration_noise ** 2)
+        self.altitude_vars = (
+            np.array([tof_noise ** 2]),
+            np.array([baro_noise ** 2]),
+            np.array([height_noise ** 2]),
+        )
+        self.initial_variance = np.asarray(initial_variance, dtype=float)
+
+        self.state = np.zeros((3, 3))        # [axis][position, velocity, acceleration]
+        self.covariance = np.zeros((3, 3, 3))
+        self._measurement = np.zeros(3)
+
+        self._nominal = self._transition(nominal_dt)
+        self._off_nominal_dt = nominal_dt
+        self._off_nominal = self._nominal
+        self._reset_filter()
+
+    @classmethod
+    def from_config(cls, config, clock=None, loop_rate_hz=None):
+        """
+        Build from the "kalman" section of estimator_config.json.
+        loop_rate_hz: control loop rate; nominal_dt defaults to its period
+                      unless the config sets nominal_dt explicitly
+        """
+        params = dict(config)
+        if loop_rate_hz is not None:
+            params.setdefault("nominal_dt", 1.0 / loop_rate_hz)
+        return cls(clock=clock, **params)
+
+    # ---------------------------------------------------------
+    # Filter internals
+    # ---------------------------------------------------------
+
+    def _reset_filter(self):
+        self.state[:] = 0.0
+        self.covariance[:] = 0.0
+        for axis in range(3):
+            self.covariance[axis] = np.diag(self.initial_variance)
+
+    def _transition(self, dt):
+        """Build (F(dt), F(dt)^T, per-axis white-jerk Q(dt))."""
+        dt2 = dt * dt
+        F = np.array([
+            [1.0, dt, 0.5 * dt2],
+            [0.0, 1.0, dt],
+            [0.0, 0.0, 1.0],
+        ])
+        q = np.array([
+            [dt2 * dt2 * dt / 20.0, dt2 * dt2 / 8.0, dt2 * dt / 6.0],
+            [dt2 * dt2 / 8.0, dt2 * dt / 3.0, dt2 / 2.0],
+            [dt2 * dt / 6.0, dt2 / 2.0, dt],
+        ])
+        return F, F.T.copy(), self.jerk_noise[:, None, None] * q
+
+    def _predict(self, dt):
+        tolerance = self.dt_tolerance * self.nominal_dt
+        if abs(dt - self.nominal_dt) <= tolerance:
+            F, FT, Q = self._nominal
+        else:
+            if abs(dt - self._off_nominal_dt) > tolerance:
+                self._off_nominal_dt = dt
+                self._off_nominal = self._transition(dt)
+            F, FT, Q = self._off_nominal
+        self.state = self.state @ FT
+        self.covariance = F @ self.covariance @ FT + Q
+
+    def _update(self, axes, k, measurement, variance):
+        """
+        Scalar update of state component k on the given axes (a slice),
+        vectorized across those axes.
+        """
+        P = self.covariance[axes]
+        X = self.state[axes]
+        Pk = P[:, :, k]                      # P H^T, one row per axis
+        gain = Pk / (Pk[:, k] + variance)[:, None]
+        X += gain * (measurement - X[:, k])[:, None]
+        P -= gain[:, :, None] * Pk[:, None, :]
+
+    # ---------------------------------------------------------
+    # Estimation
+    # ---------------------------------------------------------
+
+    def estimate(self, state: DroneState, timestamp=None, out: EstimatedState = None) -> EstimatedState:
+        """Same contract as StateEstimator.estimate()."""
+        now = self.clock.now() if timestamp is None else timestamp
+        dt = 0.0 if self.prev_time is None else now - self.prev_time
+        self.prev_time = now
+
+        pitch, roll, yaw = state.orientation
+        yaw_rad = math.radians(yaw)
+        cos_yaw = math.cos(yaw_rad)
+        sin_yaw = math.sin(yaw_rad)
+
+        if dt > 0:
+            self._predict(dt)
+
+        measurement = self._measurement
+        all_axes = slice(0, 3)
+
+        # Velocity: body dm/s → world m/s
+        measurement[:] = body_to_world_velocity(state.velocity, yaw)
+        self._update(all_axes, 1, measurement, self.velocity_var)
+
+        # Acceleration: body milli-g → world m/s², gravity removed from z.
+        # Yaw-only rotation: tilt is ignored (see the class docstring)
+        ax_b = state.acceleration[0] / 1000.0 * GRAVITY
+        ay_b = state.acceleration[1] / 1000.0 * GRAVITY
+        measurement[0] = ax_b * cos_yaw - ay_b * sin_yaw
+        measurement[1] = ax_b * sin_yaw + ay_b * cos_yaw
+        measurement[2] = -(state.acceleration[2] / 1000.0 + 1.0) * GRAVITY
+        self._update(all_axes, 2, measurement, self.acceleration_var)
+
+        # Altitude sensors, one scalar update each on z
+        z_axis = slice(2, 3)
+        for value, variance in zip(self._relative_altitudes(state.elevation), self.altitude_vars):
+            self._update(z_axis, 0, value, variance)
+
+        yaw_rate = self._estimate_yaw_rate(yaw, dt)
+
+        (x, vx, _), (y, vy, _), (z, vz, _) = self.state.tolist()
+        self.x = x
+        self.y = y
+        self.prev_z = z
+        return self._build_state(out, x, y, z, vx, vy, vz, pitch, roll, yaw, yaw_rate)
+
+    def estimate_batch(self, orientation, velocity, elevation, timestamps, acceleration=None):
+        """
+        Run estimate() over a whole recording (the filter is recursive, so
+        this is a Python loop). acceleration: (N, 3) milli-g, zeros if None.
+        Returns an EstimatedState of (N, 3) arrays.
+        """
+        orientation = np.asarray(orientation, dtype=float).reshape(-1, 3)
+        velocity = np.asarray(velocity, dtype=float).reshape(-1, 3)
+        elevation = np.asarray(elevation, dtype=float).reshape(-1, 3)
+        if acceleration is None:
+            acceleration = np.tile([0.0, 0.0, -1000.0], (len(orientation), 1))
+        n = len(timestamps)
+        result = EstimatedState(np.empty((n, 3)), np.empty((n, 3)), np.empty((n, 3)), np.empty((n, 3)))
+        sample = DroneState.empty()
+        out = EstimatedState.zeros()
+        for i, timestamp in enumerate(timestamps):
+            sample.orientation = orientation[i].tolist()
+            sample.velocity = velocity[i].tolist()
+            sample.elevation = elevation[i].tolist()
+            sample.acceleration = list(acceleration[i])
+            self.estimate(sample, float(timestamp), out)
+            result.position[i] = out.position
+            result.velocity[i] = out.velocity
+            result.attitude[i] = out.attitude
+            result.angular_velocity[i] = out.angular_velocity
+        return result
+
+    def reset(self):
+        """Reset the filter state, covariance and altitude baselines."""
+        super().reset()
+        self._reset_filter()
@@ -0,0 +1,243 @@
+import math
+
+
+class LoopStats:
+    """
+    Running statistics of the achieved loop period.
+    Uses Welford's algorithm, so it is O(1) per tick and safe to read
+    while flying.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.ticks = 0
+        self.overruns = 0        # ticks that started after their deadline
+        self.skipped = 0         # deadlines dropped by the "skip" policy
+        self.periods = 0         # number of measured periods
+        self.mean_period = 0.0
+        self._m2 = 0.0
+        self.min_period = math.inf
+        self.max_period = 0.0
+
+    def update(self, period):
+        self.periods += 1
+        delta = period - self.mean_period
+        self.mean_period += delta / self.periods
+        self._m2 += delta * (period - self.mean_period)
+        if period < self.min_period:
+            self.min_period = period
+        if period > self.max_period:
+            self.max_period = period
+
+    @property
+    def jitter(self):
+        """Standard deviation of the achieved period in seconds."""
+        return math.sqrt(self._m2 / self.periods) if self.periods > 1 else 0.0
+
+    @property
+    def achieved_rate_hz(self):
+        return 1.0 / self.mean_period if self.mean_period > 0 else 0.0
+
+    def summary(self):
+        """Return the statistics as a plain dict."""
+        return {
+            "ticks": self.ticks,
+            "achieved_rate_hz": self.achieved_rate_hz,
+            "mean_period_s": self.mean_period,
+            "jitter_s": self.jitter,
+            "min_period_s": self.min_period if self.periods else 0.0,
+            "max_period_s": self.max_period,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+        }
+
+    def __str__(self):
+        s = self.summary()
+        return (
+            f"{s['ticks']} ticks at {s['achieved_rate_hz']:.2f} Hz "
+            f"(period {s['mean_period_s'] * 1e3:.2f} ms, jitter {s['jitter_s'] * 1e3:.3f} ms, "
+            f"min {s['min_period_s'] * 1e3:.2f} ms, max {s['max_period_s'] * 1e3:.2f} ms), "
+            f"{s['overruns']} overruns, {s['skipped']} skipped"
+        )
+
+
+class TelemetryStats:
+    """
+    Counters for telemetry-triggered control (Controller(trigger="telemetry")).
+    Sample age is measured from packet receipt to the start of the tick
+    that consumes it.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.samples = 0     # fresh packets consumed
+        self.missed = 0      # packets superseded before a tick could consume them
+        self.timeouts = 0    # fallback ticks run on the previous sample
+        self.stale = 0       # fresh packets older than max_sample_age when consumed
+        self._age_total = 0.0
+        self.max_age = 0.0
+
+    def record_sample(self, age, stale):
+        self.samples += 1
+        self._age_total += age
+        if age > self.max_age:
+            self.max_age = age
+        if stale:
+            self.stale += 1
+
+    @property
+    def mean_age(self):
+        return self._age_total / self.samples if self.samples else 0.0
+
+    def summary(self):
+        return {
+            "samples": self.samples,
+            "missed": self.missed,
+            "timeouts": self.timeouts,
+            "stale": self.stale,
+            "mean_age_s": self.mean_age,
+            "max_age_s": self.max_age,
+        }
+
+    def __str__(self):
+        s = self.summary()
+        return (
+            f"{s['samples']} samples (mean age {s['mean_age_s'] * 1e3:.2f} ms, "
+            f"max {s['max_age_s'] * 1e3:.2f} ms), {s['missed']} missed, "
+            f"{s['stale']} stale, {s['timeouts']} timeouts"
+        )
+
+
+class LoopScheduler:
+    """
+    Fixed-rate loop scheduler targeting absolute deadlines on a grid
+    (t0, t0 + T, t0 + 2T, ...), so work done inside a tick never shifts
+    later ticks and no drift builds up.
+
+    Overrun policies (when a tick starts after its deadline):
+    - "skip":     run the late tick now and drop the deadlines that were
+                  missed, so the loop never bursts to catch up
+    - "catch_up": keep every deadline; following ticks run back-to-back
+                  until the schedule is met again
+    """
+
+    POLICIES = ("skip", "catch_up")
+
+    def __init__(self, clock, rate_hz=25.0, overrun_policy="skip", spin_time=0.0):
+        """
+        clock: clock providing now() and sleep_until()
+        rate_hz: target loop rate
+        overrun_policy: "skip" or "catch_up"
+        spin_time: busy-wait for the final spin_time seconds before each
+                   deadline (e.g. 0.001) for lower wake-up jitter
+        """
+        if overrun_policy not in self.POLICIES:
+            raise ValueError(f"Unknown overrun policy: {overrun_policy}")
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be positive")
+        self.clock = clock
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.overrun_policy = overrun_policy
+        self.spin_time = spin_time
+        self.stats = LoopStats()
+        self.reset()
+
+    def reset(self):
+        """Restart the schedule; the next tick starts immediately."""
+        self.deadline = None
+        self.last_tick = None
+        self.stats.reset()
+
+    def next_tick(self):
+        """
+        Wait for the next deadline and return the tick timestamp.
+        The first call returns immediately and anchors the schedule.
+        """
+        deadline = self._next_deadline()
+        if deadline is not None:
+            self.clock.sleep_until(deadline, self.spin_time)
+        return self._mark_tick()
+
+    async def next_tick_async(self):
+        """next_tick() for asyncio loops: awaits instead of blocking."""
+        deadline = self._next_deadline()
+        if deadline is not None:
+            await self.clock.sleep_until_async(deadline)
+        return self._mark_tick()
+
+    def _next_deadline(self):
+        """
+        Advance the schedule by one period.
+        Returns the deadline to wait for, or None if the tick is due now.
+        """
+        now = self.clock.now()
+        if self.deadline is None:
+            self.deadline = now
+            return None
+
+        period = self.period
+        self.deadline += period
+        if now < self.deadline:
+            return self.deadline
+
+        self.stats.overruns += 1
+        if self.overrun_policy == "skip":
+            missed = int((now - self.deadline) // period)
+            self.stats.skipped += missed
+            self.deadline += missed * period
+        return None
+
+    def _mark_tick(self):
+        now = self.clock.now()
+        stats = self.stats
+        stats.ticks += 1
+        if self.last_tick is not None:
+            stats.update(now - self.last_tick)
+        self.last_tick = now
+        return now
+
+
+class RateGroups:
+    """
+    Multi-rate schedule layered on one LoopScheduler.
+
+    The scheduler ticks at the base (fastest) rate; each group runs on every
+    Nth base tick, N = round(base_rate / group_rate), so all groups stay
+    phase-locked to the same deadline grid. Groups:
+    - "estimate": telemetry read and state estimation
+    - "z_yaw":    inner altitude and heading PIDs
+    - "xy":       outer horizontal position PIDs
+    - "log":      log_frame() calls
+    - "rc":       RC command output (composed from each group's latest output)
+    Groups without a configured rate run every base tick.
+    """
+
+    GROUPS = ("estimate", "z_yaw", "xy", "log", "rc")
+
+    def __init__(self, base_rate_hz, rates=None):
+        """
+        base_rate_hz: scheduler tick rate
+        rates: {group: rate_hz}; each rate must not exceed base_rate_hz
+        """
+        self.base_rate_hz = base_rate_hz
+        self.every = dict.fromkeys(self.GROUPS, 1)
+        for group, rate in (rates or {}).items():
+            if group not in self.every:
+                raise ValueError(f"Unknown rate group: {group}")
+            if not 0 < rate <= base_rate_hz:
+                raise ValueError(
+                    f"Rate for {group!r} must be in (0, {base_rate_hz}] Hz, got {rate}"
+                )
+            self.every[group] = max(1, round(base_rate_hz / rate))
+
+    def rate_hz(self, group):
+        """Effective rate of a group after rounding to whole base ticks."""
+        return self.base_rate_hz / self.every[group]
+
+    def __str__(self):
+        return ", ".join(f"{group} {self.rate_hz(group):g} Hz" for group in self.GROUPS)
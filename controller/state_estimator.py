@@ -1,18 +1,49 @@
-import time
-from dataclasses import dataclass
+import numpy as np
+
 from drone.drone_state import DroneState
-from utils.transforms import body_to_world_velocity
+from utils.clock import MonotonicClock
+from utils.filters import exponential_moving_average_array
+from utils.transforms import body_to_world_velocity, body_to_world_velocity_batch
 
-@dataclass
 class EstimatedState:
     """
     High-level estimated state used by the PID controller.
     All values are in world-frame coordinates.
+    From estimate_batch(), each field is an (N, 3) array instead.
+
+    Slotted and mutable so the controller can preallocate one instance and
+    have estimate(..., out=...) refill it every tick. Consumers that keep a
+    state beyond the current tick must call copy().
     """
-    position: list     # [x, y, z] in meters
-    velocity: list     # [vx, vy, vz] in m/s
-    attitude: list     # [pitch, roll, yaw] in degrees
-    angular_velocity: list  # [pitch_rate, roll_rate, yaw_rate] in deg/s
+
+    __slots__ = ("position", "velocity", "attitude", "angular_velocity")
+
+    def __init__(self, position, velocity, attitude, angular_velocity):
+        self.position = position                  # [x, y, z] in meters
+        self.velocity = velocity                  # [vx, vy, vz] in m/s
+        self.attitude = attitude                  # [pitch, roll, yaw] in degrees
+        self.angular_velocity = angular_velocity  # [pitch_rate, roll_rate, yaw_rate] in deg/s
+
+    @classmethod
+    def zeros(cls):
+        """Preallocated zero state for filling in place."""
+        return cls([0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0])
+
+    def copy(self):
+        """Independent snapshot safe to retain across ticks."""
+        return EstimatedState(
+            self.position.copy(), self.velocity.copy(),
+            self.attitude.copy(), self.angular_velocity.copy()
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, EstimatedState):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"EstimatedState({fields})"
 
 
 class StateEstimator:
@@ -21,7 +52,10 @@ class StateEstimator:
     position and velocity estimate suitable for PID control.
     """
 
-    def __init__(self):
+    def __init__(self, clock=None):
+        # Fallback clock, only used when estimate() is called without a timestamp
+        self.clock = clock if clock is not None else MonotonicClock()
+
         # Integrated horizontal position (x, y)
         self.x = 0.0
         self.y = 0.0
@@ -45,15 +79,14 @@ class StateEstimator:
         self.prev_yaw_rate = 0.0
         self.alpha_yaw_rate = 0.7  # low‑pass filter weight
 
-    def _fuse_altitude(self, elevation):
+    def _relative_altitudes(self, elevation):
         """
-        Fuse ToF, barometer, and height into a stable altitude estimate.
-        elevation = [tof_cm, baro_m, height_cm]
-
-        Returns altitude in meters, relative to the baseline at takeoff.
+        Return (rel_tof, rel_baro, rel_height) in meters relative to the
+        baselines captured on the first call after a reset.
+        elevation = [tof_cm, baro_cm, height_cm]
         """
         tof_m = elevation[0] / 100.0
-        baro_m = elevation[1]
+        baro_m = elevation[1] / 100.0
         height_m = elevation[2] / 100.0
 
         # Initialize baselines at first call (assumed near ground / takeoff)
@@ -62,10 +95,21 @@ class StateEstimator:
             self._baseline_baro_m = baro_m
             self._baseline_height_m = height_m
 
+        return (
+            tof_m - self._baseline_tof_m,
+            baro_m - self._baseline_baro_m,
+            height_m - self._baseline_height_m,
+        )
+
+    def _fuse_altitude(self, elevation):
+        """
+        Fuse ToF, barometer, and height into a stable altitude estimate.
+        elevation = [tof_cm, baro_cm, height_cm]
+
+        Returns altitude in meters, relative to the baseline at takeoff.
+        """
         # Work in relative terms
-        rel_tof = tof_m - self._baseline_tof_m
-        rel_baro = baro_m - self._baseline_baro_m
-        rel_height = height_m - self._baseline_height_m
+        rel_tof, rel_baro, rel_height = self._relative_altitudes(elevation)
 
         # ToF is accurate at low altitudes, height is stable, baro is smooth
         raw_z = 0.5 * rel_tof + 0.3 * rel_height + 0.2 * rel_baro
@@ -81,12 +125,16 @@ class StateEstimator:
 
         return self.prev_z
 
-    def estimate(self, state: DroneState) -> EstimatedState:
+    def estimate(self, state: DroneState, timestamp=None, out: EstimatedState = None) -> EstimatedState:
         """
         Main estimation function.
         Takes raw DroneState and returns an EstimatedState.
+        timestamp: tick time from the controller's clock (read from
+                   self.clock if None)
+        out: preallocated EstimatedState to fill in place instead of
+             allocating a new one (see EstimatedState.zeros())
         """
-        now = time.time()
+        now = self.clock.now() if timestamp is None else timestamp
 
         # ----------------------------------------------------
         # Compute dt for integration and yaw-rate calculation
@@ -123,6 +171,16 @@ class StateEstimator:
         # ----------------------------------------------------
         # Compute yaw-rate numerically (Tello does not expose gyro)
         # ----------------------------------------------------
+        yaw_rate = self._estimate_yaw_rate(yaw, dt)
+
+        # ----------------------------------------------------
+        # Build (or refill) and return the estimated state object
+        # ----------------------------------------------------
+        return self._build_state(out, self.x, self.y, z, vx_w, vy_w, vz_w,
+                                 pitch, roll, yaw, yaw_rate)
+
+    def _estimate_yaw_rate(self, yaw, dt):
+        """Filtered numerical yaw rate (deg/s) from successive yaw readings."""
         if self.prev_yaw is None or dt == 0:
             yaw_rate = 0.0
         else:
@@ -145,19 +203,130 @@ class StateEstimator:
         # Store for next iteration
         self.prev_yaw = yaw
         self.prev_yaw_rate = yaw_rate
+        return yaw_rate
 
-        # ----------------------------------------------------
-        # Build and return the estimated state object
-        # (pitch_rate and roll_rate unavailable → set to 0.0)
-        # ----------------------------------------------------
-        est = EstimatedState(
-            position=[self.x, self.y, z],
-            velocity=[vx_w, vy_w, vz_w],
-            attitude=[pitch, roll, yaw],
-            angular_velocity=[0.0, 0.0, yaw_rate]  # Only yaw-rate is computed
+    @staticmethod
+    def _build_state(out, x, y, z, vx, vy, vz, pitch, roll, yaw, yaw_rate):
+        """
+        Return a new EstimatedState, or refill `out` in place.
+        (pitch_rate and roll_rate unavailable → set to 0.0)
+        """
+        if out is None:
+            return EstimatedState(
+                position=[x, y, z],
+                velocity=[vx, vy, vz],
+                attitude=[pitch, roll, yaw],
+                angular_velocity=[0.0, 0.0, yaw_rate]  # Only yaw-rate is computed
+            )
+
+        position = out.position
+        position[0] = x
+        position[1] = y
+        position[2] = z
+
+        velocity = out.velocity
+        velocity[0] = vx
+        velocity[1] = vy
+        velocity[2] = vz
+
+        attitude = out.attitude
+        attitude[0] = pitch
+        attitude[1] = roll
+        attitude[2] = yaw
+
+        angular_velocity = out.angular_velocity
+        angular_velocity[0] = 0.0
+        angular_velocity[1] = 0.0
+        angular_velocity[2] = yaw_rate
+        return out
+
+    def estimate_batch(self, orientation, velocity, elevation, timestamps) -> EstimatedState:
+        """
+        Vectorized estimate() over a whole recording.
+
+        orientation: (N, 3) [pitch, roll, yaw] in degrees
+        velocity: (N, 3) body-frame [vgx, vgy, vgz] in dm/s
+        elevation: (N, 3) [tof_cm, baro_cm, height_cm]
+        timestamps: (N,) sample times in seconds
+
+        Returns an EstimatedState whose fields are (N, 3) arrays, matching
+        N successive estimate() calls to within floating-point rounding.
+        The batch continues from the estimator's current state and leaves
+        it as if the samples had been estimated one by one.
+        """
+        orientation = np.asarray(orientation, dtype=float).reshape(-1, 3)
+        velocity = np.asarray(velocity, dtype=float).reshape(-1, 3)
+        elevation = np.asarray(elevation, dtype=float).reshape(-1, 3)
+        timestamps = np.asarray(timestamps, dtype=float)
+        n = len(timestamps)
+
+        empty = np.zeros((n, 3))
+        if n == 0:
+            return EstimatedState(position=empty, velocity=empty.copy(),
+                                  attitude=empty.copy(), angular_velocity=empty.copy())
+
+        # dt per sample (0 for the very first sample after a reset)
+        dt = np.empty(n)
+        dt[0] = 0.0 if self.prev_time is None else timestamps[0] - self.prev_time
+        dt[1:] = np.diff(timestamps)
+
+        yaw = orientation[:, 2]
+
+        # Body-frame velocity → world-frame
+        world_velocity = body_to_world_velocity_batch(velocity, yaw)
+
+        # Horizontal position: running sums of v * dt (skipping dt <= 0),
+        # accumulated in the same order as the scalar path
+        position = np.empty((n, 3))
+        moving = dt > 0
+        for axis, start in ((0, self.x), (1, self.y)):
+            steps = np.empty(n + 1)
+            steps[0] = start
+            steps[1:] = np.where(moving, world_velocity[:, axis] * dt, 0.0)
+            position[:, axis] = np.cumsum(steps)[1:]
+
+        # Altitude fusion relative to the takeoff baselines
+        if self._baseline_tof_m is None:
+            self._baseline_tof_m = elevation[0, 0] / 100.0
+            self._baseline_baro_m = elevation[0, 1] / 100.0
+            self._baseline_height_m = elevation[0, 2] / 100.0
+        raw_z = (
+            0.5 * (elevation[:, 0] / 100.0 - self._baseline_tof_m) +
+            0.3 * (elevation[:, 2] / 100.0 - self._baseline_height_m) +
+            0.2 * (elevation[:, 1] / 100.0 - self._baseline_baro_m)
         )
+        position[:, 2], self.prev_z = exponential_moving_average_array(
+            raw_z, self.alpha_altitude, self.prev_z
+        )
+
+        # Yaw rate: wrapped numerical derivative, then low-pass filtered
+        prev_yaw = np.empty(n)
+        prev_yaw[0] = yaw[0] if self.prev_yaw is None else self.prev_yaw
+        prev_yaw[1:] = yaw[:-1]
+        dyaw = yaw - prev_yaw
+        dyaw = np.where(dyaw > 180, dyaw - 360, np.where(dyaw < -180, dyaw + 360, dyaw))
+        has_rate = dt != 0
+        if self.prev_yaw is None:
+            has_rate[0] = False
+        raw_rate = np.where(has_rate, dyaw / np.where(has_rate, dt, 1.0), 0.0)
+
+        angular_velocity = np.zeros((n, 3))
+        angular_velocity[:, 2], self.prev_yaw_rate = exponential_moving_average_array(
+            raw_rate, self.alpha_yaw_rate, self.prev_yaw_rate
+        )
+
+        # Carry state forward for subsequent estimate() calls
+        self.x = float(position[-1, 0])
+        self.y = float(position[-1, 1])
+        self.prev_time = float(timestamps[-1])
+        self.prev_yaw = float(yaw[-1])
 
-        return est
+        return EstimatedState(
+            position=position,
+            velocity=world_velocity,
+            attitude=orientation.copy(),
+            angular_velocity=angular_velocity
+        )
 
     def reset(self):
         """Reset estimator state, including altitude baselines."""
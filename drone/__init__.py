@@ -5,7 +5,10 @@ This package provides:
 - DroneInterface: a high-level wrapper around the Tello SDK,
   offering a clean, consistent API for connection, flight
   commands, and telemetry retrieval.
-- DroneState: a structured dataclass encapsulating all raw
+- SimDrone: a headless Tello-like simulator implementing the same
+  API, for running the full control stack without hardware.
+- RCOutputStage: RC command coalescing with a keepalive interval.
+- DroneState: a structured slotted class encapsulating all raw
   sensor readings returned by the drone.
 
 These modules allow the rest of the control system to remain
@@ -14,8 +17,12 @@ drone‑agnostic and modular.
 
 from .drone_interface import DroneInterface
 from .drone_state import DroneState
+from .rc_output import RCOutputStage
+from .sim_drone import SimDrone
 
 __all__ = [
     "DroneInterface",
     "DroneState",
+    "RCOutputStage",
+    "SimDrone",
 ]
\ No newline at end of file
@@ -1,5 +1,52 @@
-from djitellopy import Tello
+import threading
+import time
+
+try:
+    from djitellopy import Tello
+    from djitellopy import tello as tello_sdk
+except ImportError:  # allows SimDrone-only installs without the Tello SDK
+    Tello = None
+    tello_sdk = None
+
 from .drone_state import DroneState
+from .rc_output import RCOutputStage
+
+
+class _StateSlot(dict):
+    """
+    Drop-in replacement for djitellopy's per-drone record
+    ({'responses': [...], 'state': {...}}).
+
+    The SDK's receiver thread stores every parsed state packet with
+    record['state'] = new_dict. Intercepting that assignment lets us stamp
+    each packet with a sequence number and a monotonic receive time
+    (same time base as utils.clock.MonotonicClock). The triple is published
+    as one tuple, so readers always get a coherent snapshot with a single
+    attribute read. Packet dicts are never mutated after parsing, so the
+    snapshot can be used without copying.
+
+    Publishing a packet also notifies a condition variable, so a control
+    loop can block in wait_for_packet() and wake as soon as telemetry
+    arrives instead of polling on a timer.
+    """
+
+    def __init__(self, record):
+        super().__init__(record)
+        self.packet = (0, None, record.get("state", {}))
+        self._arrived = threading.Condition()
+
+    def __setitem__(self, key, value):
+        if key == "state":
+            received = time.perf_counter()
+            with self._arrived:
+                self.packet = (self.packet[0] + 1, received, value)
+                self._arrived.notify_all()
+        super().__setitem__(key, value)
+
+    def wait_for_packet(self, last_seq, timeout):
+        """Block until a packet newer than last_seq is published; False on timeout."""
+        with self._arrived:
+            return self._arrived.wait_for(lambda: self.packet[0] != last_seq, timeout)
 
 
 class DroneInterface:
@@ -8,9 +55,32 @@ class DroneInterface:
     Provides a clean, consistent API for the controller.
     """
 
-    def __init__(self):
-        self.drone = Tello()
+    def __init__(self, host=None, rc_keepalive_interval=0.5):
+        """
+        host: the drone's IP address (Tello.TELLO_IP, the drone's own access
+              point, if None); give each drone of a fleet its own address
+        rc_keepalive_interval: duplicate RC commands are suppressed, but a
+                               packet is always sent at least this often
+                               (seconds); None sends every command
+        """
+        if Tello is None:
+            raise ImportError("DroneInterface requires djitellopy (pip install djitellopy==2.5.0).")
+        if host is None:
+            host = Tello.TELLO_IP
+        self.host = host
+        self.drone = Tello(host)
         self.connected = False
+        self.rc_output = RCOutputStage(self.drone.send_rc_control,
+                                       keepalive_interval=rc_keepalive_interval)
+
+        # Hook the SDK's state record for atomic, sequence-stamped snapshots.
+        # The SDK keys records (and routes state packets) by sender address
+        record = getattr(tello_sdk, "drones", {}).get(host)
+        if not isinstance(record, dict) or "state" not in record:
+            raise RuntimeError("Unsupported djitellopy version: no per-drone state record "
+                               "to hook (DroneInterface is built against djitellopy 2.5.0)")
+        self._state_slot = _StateSlot(record)
+        tello_sdk.drones[host] = self._state_slot
 
     # ---------------------------------------------------------
     # Connection & Flight Control
@@ -27,45 +97,67 @@ class DroneInterface:
         if not self.connected:
             raise RuntimeError("Drone not connected.")
         self.drone.takeoff()
+        self.rc_output.reset()
 
     def land(self):
         """Command the drone to land."""
         if not self.connected:
             return
         self.drone.land()
+        self.rc_output.reset()
 
     # ---------------------------------------------------------
     # Sensor State Retrieval
     # ---------------------------------------------------------
 
-    def get_state(self) -> DroneState:
+    def get_state(self, out: DroneState = None) -> DroneState:
         """
-        Query Tello telemetry and return a DroneState object.
+        Return a DroneState built from the latest telemetry packet.
+        All fields come from one packet, read in a single pass, and carry
+        that packet's sequence number and receive timestamp.
         This keeps the rest of the system drone-agnostic.
+
+        out: preallocated DroneState to fill in place instead of allocating
+             a new one (see DroneState.empty())
+        """
+        seq, received, s = self._state_slot.packet
+        if out is None:
+            out = DroneState.empty()
+        try:
+            orientation = out.orientation
+            orientation[0] = s["pitch"]
+            orientation[1] = s["roll"]
+            orientation[2] = s["yaw"]
+
+            velocity = out.velocity
+            velocity[0] = s["vgx"]
+            velocity[1] = s["vgy"]
+            velocity[2] = s["vgz"]
+
+            elevation = out.elevation
+            elevation[0] = s["tof"]     # cm
+            elevation[1] = s["baro"] * 100.0    # cm, as Tello.get_barometer()
+            elevation[2] = s["h"]       # cm
+
+            acceleration = out.acceleration
+            acceleration[0] = s["agx"]
+            acceleration[1] = s["agy"]
+            acceleration[2] = s["agz"]
+
+            out.battery = s["bat"]
+        except KeyError as e:
+            raise RuntimeError(f"Telemetry field missing from state packet: {e}")
+        out.seq = seq
+        out.timestamp = received
+        return out
+
+    def wait_for_state(self, last_seq=None, timeout=None):
+        """
+        Wait until a telemetry packet newer than last_seq has arrived.
+        Wakes from the SDK's receive path as soon as the packet is parsed.
+        Returns True if new telemetry is available, False on timeout.
         """
-        return DroneState(
-            orientation=[
-                self.drone.get_pitch(),
-                self.drone.get_roll(),
-                self.drone.get_yaw()
-            ],
-            velocity=[
-                self.drone.get_speed_x(),
-                self.drone.get_speed_y(),
-                self.drone.get_speed_z()
-            ],
-            elevation=[
-                self.drone.get_distance_tof(),  # cm
-                self.drone.get_barometer(),     # m
-                self.drone.get_height()         # cm
-            ],
-            acceleration=[
-                self.drone.get_acceleration_x(),
-                self.drone.get_acceleration_y(),
-                self.drone.get_acceleration_z()
-            ],
-            battery = self.drone.get_battery()
-        )
+        return self._state_slot.wait_for_packet(last_seq, timeout)
 
     # ---------------------------------------------------------
     # RC Command Output
@@ -75,5 +167,7 @@ class DroneInterface:
         """
         Send RC control commands to the drone.
         Values should be in the range [-100, 100].
+        Commands identical (after int truncation) to the previous packet
+        are coalesced, with a keepalive; see RCOutputStage.
         """
-        self.drone.send_rc_control(int(lr), int(fb), int(ud), int(yaw))
\ No newline at end of file
+        self.rc_output.send(lr, fb, ud, yaw)
\ No newline at end of file
@@ -1,9 +1,43 @@
-from dataclasses import dataclass
-
-@dataclass
 class DroneState:
-    orientation: list   # [pitch, roll, yaw]
-    velocity: list      # [vgx, vgy, vgz]
-    elevation: list     # [tof, baro, height]
-    acceleration: list  # [agx, agy, agz]
-    battery: int
\ No newline at end of file
+    """
+    Raw telemetry of one packet.
+
+    Slotted and mutable so a single instance can be preallocated and
+    refilled every tick (see DroneInterface.get_state(out=...)). An
+    instance filled in place is overwritten by the next tick; consumers
+    that keep a state beyond the current tick must call copy().
+    """
+
+    __slots__ = ("orientation", "velocity", "elevation", "acceleration",
+                 "battery", "seq", "timestamp")
+
+    def __init__(self, orientation, velocity, elevation, acceleration, battery,
+                 seq=0, timestamp=None):
+        self.orientation = orientation    # [pitch, roll, yaw]
+        self.velocity = velocity          # [vgx, vgy, vgz]
+        self.elevation = elevation        # [tof, baro, height] in cm
+        self.acceleration = acceleration  # [agx, agy, agz]
+        self.battery = battery            # int
+        self.seq = seq                    # telemetry packet sequence number
+        self.timestamp = timestamp        # monotonic receive time of the packet (s)
+
+    @classmethod
+    def empty(cls):
+        """Preallocated zero state for filling in place."""
+        return cls([0, 0, 0], [0, 0, 0], [0, 0.0, 0], [0.0, 0.0, 0.0], 0)
+
+    def copy(self):
+        """Independent snapshot (new lists) safe to retain across ticks."""
+        return DroneState(
+            list(self.orientation), list(self.velocity), list(self.elevation),
+            list(self.acceleration), self.battery, self.seq, self.timestamp
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, DroneState):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"DroneState({fields})"
@@ -0,0 +1,69 @@
+"""
+RC command output stage: coalesces duplicate commands with a keepalive.
+
+The Tello only acts on the integer stick values, so in a steady hover most
+ticks produce an rc packet identical to the previous one. RCOutputStage
+drops those duplicates but always re-sends the current command once
+keepalive_interval has passed since the last packet, so the drone's
+command-timeout failsafe never trips.
+"""
+
+from utils.clock import MonotonicClock
+
+
+class RCOutputStage:
+    """Sends (lr, fb, ud, yaw) through `transmit` only when needed."""
+
+    def __init__(self, transmit, clock=None, keepalive_interval=0.5):
+        """
+        transmit: function(lr, fb, ud, yaw) taking ints, e.g. Tello.send_rc_control
+        clock: time source for the keepalive (MonotonicClock if None)
+        keepalive_interval: maximum seconds between packets; None disables
+                            coalescing so every command is sent
+        """
+        self.transmit = transmit
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.keepalive_interval = keepalive_interval
+        self.sent = 0
+        self.suppressed = 0
+        self.reset()
+
+    def reset(self):
+        """Forget the last command so the next one is always sent."""
+        self.last_command = None
+        self.last_sent_time = None
+
+    def send(self, lr, fb, ud, yaw):
+        """
+        Truncate to int like the SDK and transmit unless the command equals
+        the last one sent and the keepalive has not expired.
+        Returns True if a packet was sent.
+        """
+        command = (int(lr), int(fb), int(ud), int(yaw))
+        now = self.clock.now()
+        if (
+            self.keepalive_interval is not None
+            and command == self.last_command
+            and now - self.last_sent_time < self.keepalive_interval
+        ):
+            self.suppressed += 1
+            return False
+
+        self.transmit(*command)
+        self.last_command = command
+        self.last_sent_time = now
+        self.sent += 1
+        return True
+
+    def summary(self):
+        total = self.sent + self.suppressed
+        return {
+            "sent": self.sent,
+            "suppressed": self.suppressed,
+            "suppressed_fraction": self.suppressed / total if total else 0.0,
+        }
+
+    def __str__(self):
+        s = self.summary()
+        return (f"{s['sent']} sent, {s['suppressed']} suppressed "
+                f"({s['suppressed_fraction'] * 100:.1f} %)")
@@ -0,0 +1,290 @@
+import math
+import random
+from .drone_state import DroneState
+from utils.clock import VirtualClock
+
+GRAVITY = 9.81  # m/s^2
+
+
+class SimDrone:
+    """
+    Headless Tello-like drone for simulation, CI and loop profiling.
+    Implements the same API as DroneInterface (connect, takeoff, land,
+    get_state, send_rc) on top of a simple quadrotor model:
+
+    - RC commands map to target body-frame velocities / yaw rate
+      (lr -> body x, fb -> body y, ud -> z, yaw -> yaw rate). Attitude
+      uses the frame of utils.transforms (x right, y forward, yaw
+      counter-clockwise positive); positive RC yaw turns clockwise, as on
+      the Tello, so it decreases the yaw reading
+    - Velocities follow their targets through a first-order lag
+    - Telemetry mimics the Tello SDK: integer degrees, dm/s velocities,
+      ToF/height/barometer in cm, accelerations in milli-g, with noise
+
+    Physics advance lazily to clock.now() whenever the drone is queried or
+    commanded, so sharing a VirtualClock with the Controller runs the full
+    control stack as fast as the CPU allows:
+
+        clock = VirtualClock()
+        drone = SimDrone(clock=clock)
+        Controller(drone, clock=clock).start(max_ticks=5000)
+    """
+
+    def __init__(self, clock=None, seed=None, noise=True,
+                 max_speed=1.0, max_vertical_speed=0.8, max_yaw_rate=100.0,
+                 velocity_time_constant=0.3, yaw_time_constant=0.15,
+                 takeoff_height=0.8, wind=(0.0, 0.0),
+                 initial_position=(0.0, 0.0), initial_yaw=0.0,
+                 ground_pressure_altitude=100.0, step_dt=0.005,
+                 telemetry_rate_hz=None):
+        """
+        clock: clock shared with the Controller (a new VirtualClock if None)
+        seed: random seed for reproducible sensor noise
+        noise: disable to get exact, noise-free telemetry
+        max_speed / max_vertical_speed: m/s at full RC deflection
+        max_yaw_rate: deg/s at full RC deflection
+        velocity_time_constant / yaw_time_constant: first-order lag in s
+        takeoff_height: hover height reached by takeoff() in m
+        wind: constant world-frame drift velocity (vx, vy) in m/s
+        ground_pressure_altitude: barometer reading on the ground in m
+        step_dt: maximum physics integration step in s
+        telemetry_rate_hz: emit state packets on a fixed clock grid at this
+                           rate, like the Tello's UDP stream; needed for
+                           wait_for_state(). If None, every get_state()
+                           call produces a fresh packet.
+        """
+        self.clock = clock if clock is not None else VirtualClock()
+        self.rng = random.Random(seed)
+        self.noise = noise
+
+        self.max_speed = max_speed
+        self.max_vertical_speed = max_vertical_speed
+        self.max_yaw_rate = max_yaw_rate
+        self.velocity_time_constant = velocity_time_constant
+        self.yaw_time_constant = yaw_time_constant
+        self.takeoff_height = takeoff_height
+        self.wind = tuple(wind)
+        self.ground_pressure_altitude = ground_pressure_altitude
+        self.step_dt = step_dt
+        self.telemetry_rate_hz = telemetry_rate_hz
+
+        # True world-frame state
+        self.position = [initial_position[0], initial_position[1], 0.0]
+        self.velocity = [0.0, 0.0, 0.0]
+        self.acceleration = [0.0, 0.0, 0.0]
+        self.yaw = initial_yaw          # degrees
+        self.yaw_rate = 0.0             # deg/s
+        self.battery = 100.0            # percent
+
+        # Latest RC command (lr, fb, ud, yaw) in [-100, 100]
+        self.rc = (0, 0, 0, 0)
+        self.rc_count = 0
+        self.telemetry_seq = 0
+
+        self.connected = False
+        self.flying = False
+        self.last_update = None
+
+    # ---------------------------------------------------------
+    # Connection & Flight Control
+    # ---------------------------------------------------------
+
+    def connect(self):
+        """Mark the simulated drone as connected."""
+        self.connected = True
+        self.last_update = self.clock.now()
+
+    def takeoff(self):
+        """Climb instantly to the takeoff hover height."""
+        if not self.connected:
+            raise RuntimeError("Drone not connected.")
+        self._advance()
+        self.flying = True
+        self.position[2] = self.takeoff_height
+        self.velocity = [0.0, 0.0, 0.0]
+        self.rc = (0, 0, 0, 0)
+
+    def land(self):
+        """Set the drone down at its current x/y position."""
+        if not self.connected:
+            return
+        self._advance()
+        self.flying = False
+        self.position[2] = 0.0
+        self.velocity = [0.0, 0.0, 0.0]
+        self.acceleration = [0.0, 0.0, 0.0]
+        self.yaw_rate = 0.0
+
+    # ---------------------------------------------------------
+    # Sensor State Retrieval
+    # ---------------------------------------------------------
+
+    def get_state(self, out: DroneState = None) -> DroneState:
+        """
+        Sample Tello-style telemetry at the current clock time.
+        out: preallocated DroneState to fill in place (new one if None)
+        """
+        self._advance()
+        if self.telemetry_rate_hz is None:
+            self.telemetry_seq += 1
+            received = self.last_update
+        else:
+            self.telemetry_seq = self._packet_index(self.last_update)
+            received = self.telemetry_seq / self.telemetry_rate_hz
+
+        yaw_rad = math.radians(self.yaw)
+        cos_yaw = math.cos(yaw_rad)
+        sin_yaw = math.sin(yaw_rad)
+
+        # World → body (inverse of utils.transforms.body_to_world_velocity)
+        vx, vy, vz = self.velocity
+        vbx = vx * cos_yaw + vy * sin_yaw
+        vby = -vx * sin_yaw + vy * cos_yaw
+
+        ax, ay, az = self.acceleration
+        abx = ax * cos_yaw + ay * sin_yaw
+        aby = -ax * sin_yaw + ay * cos_yaw
+
+        # Small-angle tilt needed to produce the horizontal acceleration
+        pitch = math.degrees(math.atan2(abx, GRAVITY))
+        roll = math.degrees(math.atan2(aby, GRAVITY))
+
+        z = self.position[2]
+        gauss = self._gauss
+
+        if out is None:
+            out = DroneState.empty()
+
+        orientation = out.orientation
+        orientation[0] = round(pitch + gauss(0.3))
+        orientation[1] = round(roll + gauss(0.3))
+        orientation[2] = round(self._wrap(self.yaw + gauss(0.3)))
+
+        velocity = out.velocity
+        velocity[0] = round(vbx * 10.0 + gauss(0.3))   # dm/s
+        velocity[1] = round(vby * 10.0 + gauss(0.3))
+        velocity[2] = round(vz * 10.0 + gauss(0.3))
+
+        elevation = out.elevation
+        elevation[0] = max(10, round(z * 100.0 + gauss(1.0)))                  # tof cm
+        elevation[1] = (self.ground_pressure_altitude + z + gauss(0.1)) * 100.0  # baro cm
+        elevation[2] = int(round((z * 100.0 + gauss(2.0)) / 10.0)) * 10        # height cm
+
+        acceleration = out.acceleration
+        acceleration[0] = abx / GRAVITY * 1000.0 + gauss(5.0)                  # milli-g
+        acceleration[1] = aby / GRAVITY * 1000.0 + gauss(5.0)
+        acceleration[2] = -(1.0 + az / GRAVITY) * 1000.0 + gauss(5.0)
+
+        out.battery = int(self.battery)
+        out.seq = self.telemetry_seq
+        out.timestamp = received
+        return out
+
+    def wait_for_state(self, last_seq=None, timeout=None):
+        """
+        Wait (on the drone's clock) until a packet newer than last_seq is
+        due. Returns True if new telemetry is available, False on timeout.
+        """
+        rate = self.telemetry_rate_hz
+        if rate is None:
+            raise RuntimeError("SimDrone needs telemetry_rate_hz for wait_for_state()")
+        now = self.clock.now()
+        seq = self._packet_index(now)
+        if seq != last_seq:
+            return True
+        next_packet = (seq + 1) / rate
+        if timeout is not None and next_packet - now > timeout:
+            self.clock.sleep_until(now + timeout)
+            return False
+        self.clock.sleep_until(next_packet)
+        return True
+
+    def _packet_index(self, now):
+        # Small epsilon so a packet due exactly at `now` is already visible
+        return int(math.floor(now * self.telemetry_rate_hz + 1e-9))
+
+    # ---------------------------------------------------------
+    # RC Command Output
+    # ---------------------------------------------------------
+
+    def send_rc(self, lr, fb, ud, yaw):
+        """
+        Apply RC control commands (truncated to int like the SDK).
+        Values should be in the range [-100, 100].
+        """
+        self._advance()
+        self.rc = (
+            self._clamp_rc(int(lr)),
+            self._clamp_rc(int(fb)),
+            self._clamp_rc(int(ud)),
+            self._clamp_rc(int(yaw))
+        )
+        self.rc_count += 1
+
+    # ---------------------------------------------------------
+    # Dynamics
+    # ---------------------------------------------------------
+
+    def _advance(self):
+        """Integrate the dynamics up to the current clock time."""
+        now = self.clock.now()
+        if self.last_update is None:
+            self.last_update = now
+            return
+        remaining = now - self.last_update
+        self.last_update = now
+
+        while remaining > 0:
+            dt = min(self.step_dt, remaining)
+            self._step(dt)
+            remaining -= dt
+
+    def _step(self, dt):
+        if not self.flying:
+            return
+
+        lr, fb, ud, yaw_cmd = self.rc
+
+        # Target body-frame velocity → world frame
+        vbx = lr / 100.0 * self.max_speed
+        vby = fb / 100.0 * self.max_speed
+        yaw_rad = math.radians(self.yaw)
+        cos_yaw = math.cos(yaw_rad)
+        sin_yaw = math.sin(yaw_rad)
+        target = (
+            vbx * cos_yaw - vby * sin_yaw + self.wind[0],
+            vbx * sin_yaw + vby * cos_yaw + self.wind[1],
+            ud / 100.0 * self.max_vertical_speed
+        )
+
+        # First-order velocity response
+        tau = self.velocity_time_constant
+        for axis in range(3):
+            accel = (target[axis] - self.velocity[axis]) / tau
+            self.acceleration[axis] = accel
+            self.velocity[axis] += accel * dt
+            self.position[axis] += self.velocity[axis] * dt
+
+        if self.position[2] < 0.0:
+            self.position[2] = 0.0
+            self.velocity[2] = max(0.0, self.velocity[2])
+
+        # First-order yaw-rate response (positive RC yaw turns clockwise)
+        target_rate = -yaw_cmd / 100.0 * self.max_yaw_rate
+        self.yaw_rate += (target_rate - self.yaw_rate) * dt / self.yaw_time_constant
+        self.yaw = self._wrap(self.yaw + self.yaw_rate * dt)
+
+        # ~13 minutes of hover on a full battery
+        self.battery = max(0.0, self.battery - dt * (100.0 / 780.0))
+
+    def _gauss(self, sigma):
+        return self.rng.gauss(0.0, sigma) if self.noise else 0.0
+
+    @staticmethod
+    def _wrap(angle):
+        """Wrap an angle in degrees to [-180, 180)."""
+        return (angle + 180.0) % 360.0 - 180.0
+
+    @staticmethod
+    def _clamp_rc(value):
+        return max(-100, min(100, value))
@@ -1,5 +1,11 @@
+import argparse
+import signal
+
 from drone.drone_interface import DroneInterface
+from drone.sim_drone import SimDrone
 from controller.controller import Controller
+from utils.clock import MonotonicClock
+from utils.telemetry_stream import TelemetryPublisher
 
 
 def main():
@@ -7,12 +13,58 @@ def main():
     Entry point for the 3-axis PID position controller.
     Initializes the drone interface and starts the control loop.
     """
-    drone = DroneInterface()
+    parser = argparse.ArgumentParser(description="3-axis PID position controller")
+    parser.add_argument("--sim", action="store_true",
+                        help="fly the headless SimDrone instead of a real Tello")
+    parser.add_argument("--trigger", choices=("timer", "telemetry"), default="timer",
+                        help="tick on a fixed timer or on each new telemetry packet")
+    parser.add_argument("--watch-config", action="store_true",
+                        help="apply edits to config/pid_config.json while flying")
+    parser.add_argument("--reset-on-reload", action="store_true",
+                        help="reset PID integrators when reloaded gains are applied")
+    parser.add_argument("--flight-recorder", action="store_true",
+                        help="keep the last 60 s of ticks in memory and dump them to logs/ "
+                             "on landing, on errors and on SIGUSR1")
+    parser.add_argument("--telemetry-port", type=int,
+                        help="stream live telemetry frames over UDP to this port "
+                             "(view with python -m tools.telemetry_viewer)")
+    parser.add_argument("--telemetry-host", default="127.0.0.1",
+                        help="ground-station address for --telemetry-port")
+    parser.add_argument("--telemetry-every", type=int, default=5,
+                        help="send one telemetry frame every N control ticks")
+    args = parser.parse_args()
+
+    clock = MonotonicClock()
+    if args.sim:
+        # Packetized telemetry is only needed for telemetry-triggered ticks
+        telemetry_rate_hz = 10.0 if args.trigger == "telemetry" else None
+        drone = SimDrone(clock=clock, telemetry_rate_hz=telemetry_rate_hz)
+    else:
+        drone = DroneInterface()
+
+    publisher = None
+    if args.telemetry_port is not None:
+        publisher = TelemetryPublisher((args.telemetry_host, args.telemetry_port),
+                                       name="sim" if args.sim else "tello",
+                                       every_n=args.telemetry_every)
 
     # Target hover altitude in meters
     target_altitude = 0.5
 
-    controller = Controller(drone_interface=drone, target_altitude=target_altitude)
+    controller = Controller(
+        drone_interface=drone,
+        target_altitude=target_altitude,
+        clock=clock,
+        trigger=args.trigger,
+        watch_config=args.watch_config,
+        reset_integrators_on_reload=args.reset_on_reload,
+        flight_recorder=args.flight_recorder,
+        telemetry_publisher=publisher
+    )
+
+    # On-demand black-box dump: kill -USR1 <pid>
+    if args.flight_recorder and hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, frame: controller.request_flight_dump())
 
     try:
         controller.start()
@@ -24,4 +76,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,65 @@
+"""
+Shared test setup: simulated flights on a VirtualClock, so they run
+faster than real time and are deterministic for a given SimDrone seed.
+"""
+
+import contextlib
+import io
+
+import pytest
+
+from controller.controller import Controller
+from drone.sim_drone import SimDrone
+from utils.clock import VirtualClock
+from utils.logger import NullLogger
+
+
+class SimFlight:
+    """A Controller flying a SimDrone, both on one VirtualClock."""
+
+    def __init__(self, logger=None, controller_options=None, **sim_options):
+        """
+        logger: function(drone) returning the controller's logger, e.g. a
+                NullLogger subclass that inspects the simulated truth
+                (NullLogger if None)
+        controller_options: extra Controller keyword arguments
+        sim_options: SimDrone keyword arguments (seed, noise, wind, ...)
+        """
+        self.clock = VirtualClock()
+        self.drone = SimDrone(clock=self.clock, **sim_options)
+        self.logger = logger(self.drone) if logger is not None else NullLogger()
+        self.controller = Controller(self.drone, clock=self.clock, logger=self.logger,
+                                     **(controller_options or {}))
+
+    def fly(self, max_ticks):
+        """Take off, run max_ticks control ticks and land, silencing stdout."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.controller.start(max_ticks=max_ticks)
+        return self
+
+
+class HeadingKick(NullLogger):
+    """Turns the sim drone by `offset` degrees at tick `at`."""
+
+    def __init__(self, drone, at=25, offset=-30.0):
+        self.drone = drone
+        self.at = at
+        self.offset = offset
+        self.ticks = 0
+
+    def log_frame(self, context):
+        self.ticks += 1
+        if self.ticks == self.at:
+            self.drone.yaw += self.offset
+
+
+@pytest.fixture
+def sim_flight():
+    """SimFlight factory: sim_flight(logger=..., seed=..., ...)."""
+    return SimFlight
+
+
+@pytest.fixture
+def heading_kick():
+    """The HeadingKick logger class, for knocking a sim heading off target."""
+    return HeadingKick
@@ -0,0 +1,97 @@
+"""
+RingBuffer hands rows from the control loop to the writer thread: FIFO
+order, drop-oldest overflow with a dropped count. The async DataLogger
+flushes in the background, writes every buffered row on close and stops
+its writer thread.
+"""
+
+import csv
+import time
+
+import pytest
+
+from controller.state_estimator import EstimatedState
+from drone.drone_state import DroneState
+from utils.log_context import LogContext, PIDOutputs, RCOutputs
+from utils.logger import DataLogger
+from utils.ring_buffer import RingBuffer
+
+
+def make_context(timestamp):
+    return LogContext(
+        timestamp=timestamp,
+        loop_dt=0.04,
+        est=EstimatedState.zeros(),
+        raw=DroneState.empty(),
+        pid=PIDOutputs(),
+        rc=RCOutputs(),
+        setpoint=[0.0, 0.0, 0.5, 0.0]
+    )
+
+
+def read_times(path):
+    with open(path, newline="") as f:
+        return [float(row["time"]) for row in csv.DictReader(f)]
+
+
+def test_ring_buffer_is_fifo_across_wraparound():
+    buffer = RingBuffer(4)
+    for record in range(3):
+        buffer.push(record)
+    assert buffer.drain() == [0, 1, 2]
+    for record in range(3, 7):
+        buffer.push(record)
+    assert len(buffer) == 4
+    assert buffer.drain() == [3, 4, 5, 6]
+    assert buffer.drain() == []
+    assert buffer.dropped == 0
+
+
+def test_ring_buffer_overflow_drops_oldest():
+    buffer = RingBuffer(3)
+    for record in range(8):
+        buffer.push(record)
+    assert buffer.dropped == 5
+    assert buffer.drain() == [5, 6, 7]
+
+
+def test_ring_buffer_rejects_zero_capacity():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+def test_async_overflow_counts_dropped_rows(tmp_path):
+    # The writer thread never wakes before close(), so the buffer overflows
+    logger = DataLogger(directory=tmp_path, async_mode=True, buffer_size=4, flush_interval=60.0)
+    for tick in range(10):
+        logger.log_frame(make_context(float(tick)))
+    assert logger.dropped_frames == 6
+
+    logger.close()
+    assert read_times(logger.filepath) == [6.0, 7.0, 8.0, 9.0]
+
+
+def test_async_close_flushes_and_stops_writer(tmp_path):
+    logger = DataLogger(directory=tmp_path, async_mode=True, flush_interval=60.0)
+    for tick in range(50):
+        logger.log_frame(make_context(float(tick)))
+    assert logger._writer_thread.is_alive()
+
+    logger.close()
+    assert not logger._writer_thread.is_alive()
+    assert read_times(logger.filepath) == [float(tick) for tick in range(50)]
+    assert logger.dropped_frames == 0
+    logger.close()  # second close is a no-op
+
+
+def test_writer_thread_flushes_in_background(tmp_path):
+    logger = DataLogger(directory=tmp_path, async_mode=True, flush_interval=0.01)
+    try:
+        for tick in range(5):
+            logger.log_frame(make_context(float(tick)))
+        deadline = time.monotonic() + 2.0
+        while len(read_times(logger.filepath)) < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert read_times(logger.filepath) == [0.0, 1.0, 2.0, 3.0, 4.0]
+    finally:
+        logger.close()
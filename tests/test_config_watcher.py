@@ -0,0 +1,112 @@
+"""
+Live PID config reload: a valid edit is published as one pending update,
+an invalid one is rejected and the flown gains stay, and the controller
+swaps pending gains in only between ticks.
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+
+import pytest
+
+from controller.config_watcher import ConfigWatcher
+from utils.config_loader import DEFAULT_PID_CONFIG_PATH, load_pid_config
+from utils.logger import NullLogger
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "pid_config.json"
+    shutil.copy(DEFAULT_PID_CONFIG_PATH, path)
+    return path
+
+
+def write_config(path, config):
+    """Rewrite the file with a strictly newer mtime, so a change is always seen."""
+    mtime_ns = os.stat(path).st_mtime_ns
+    path.write_text(json.dumps(config))
+    os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+
+def make_watcher(path):
+    watcher = ConfigWatcher(path, poll_interval=3600.0)   # polled by hand
+    watcher.start()
+    return watcher
+
+
+def test_valid_change_is_published(config_path):
+    watcher = make_watcher(config_path)
+    try:
+        assert not watcher.check()
+
+        config = load_pid_config(config_path)
+        config["pid_x"]["kp"] = 91.0
+        write_config(config_path, config)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert watcher.check()
+
+        pending = watcher.take_pending()
+        assert pending[0].kp == 91.0
+        assert watcher.reloads == 1 and watcher.errors == 0
+        assert watcher.take_pending() is None
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda config: config["pid_z"].update(kp=-1.0),
+    lambda config: config["pid_yaw"].update(output_limits=[10, -10]),
+    lambda config: config.pop("pid_y"),
+])
+def test_invalid_change_is_rejected(config_path, corrupt):
+    watcher = make_watcher(config_path)
+    try:
+        config = load_pid_config(config_path)
+        corrupt(config)
+        write_config(config_path, config)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert not watcher.check()
+        assert watcher.pending is None
+        assert watcher.errors == 1 and watcher.reloads == 0
+    finally:
+        watcher.stop()
+
+
+class MidTickEdit(NullLogger):
+    """Publishes a gain change from inside tick `at` and records pid_x's kp."""
+
+    def __init__(self, path, at=10, kp=91.0):
+        self.path = path
+        self.at = at
+        self.kp = kp
+        self.controller = None
+        self.kps = []
+
+    def log_frame(self, context):
+        controller = self.controller
+        self.kps.append(controller.pid_x.config.kp)
+        if len(self.kps) == self.at:
+            config = load_pid_config(self.path)
+            config["pid_x"]["kp"] = self.kp
+            write_config(self.path, config)
+            assert controller.config_watcher.check()
+            # Published, but the running tick keeps its gains
+            assert controller.pid_x.config.kp != self.kp
+
+
+def test_pending_gains_apply_at_tick_boundary(sim_flight, config_path):
+    flight = sim_flight(logger=lambda drone: MidTickEdit(config_path),
+                        controller_options={"watch_config": config_path})
+    controller = flight.controller
+    controller.config_watcher.poll_interval = 3600.0   # polled by hand
+    logger = flight.logger
+    logger.controller = controller
+    original_kp = controller.pid_x.config.kp
+
+    flight.fly(max_ticks=20)
+
+    assert logger.kps[:10] == [original_kp] * 10
+    assert logger.kps[10:] == [91.0] * 10
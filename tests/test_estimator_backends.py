@@ -0,0 +1,61 @@
+"""
+The complementary and Kalman estimator backends read the same telemetry
+units, so on a clean constant-velocity input they agree on velocity and
+on the integrated position.
+"""
+
+import math
+
+import numpy as np
+
+from controller.estimators import build_estimator
+from drone.drone_state import DroneState
+
+DT = 0.04
+BODY_VELOCITY = [5.0, -2.0, 0.0]      # dm/s
+YAW = 30.0
+
+
+def fly_constant_velocity(backend, ticks=250):
+    estimator = build_estimator({}, backend=backend)
+    state = DroneState.empty()
+    state.orientation = [0.0, 0.0, YAW]
+    state.velocity = list(BODY_VELOCITY)
+    state.elevation = [80.0, 10080.0, 80.0]
+    state.acceleration = [0.0, 0.0, -1000.0]
+    for tick in range(ticks):
+        est = estimator.estimate(state, tick * DT)
+    return est
+
+
+def test_backends_agree_on_constant_velocity():
+    complementary = fly_constant_velocity("complementary")
+    kalman = fly_constant_velocity("kalman")
+
+    yaw = math.radians(YAW)
+    vx_b, vy_b = BODY_VELOCITY[0] / 10.0, BODY_VELOCITY[1] / 10.0
+    expected = [vx_b * math.cos(yaw) - vy_b * math.sin(yaw),
+                vx_b * math.sin(yaw) + vy_b * math.cos(yaw)]
+
+    assert np.allclose(complementary.velocity[:2], expected, atol=1e-9)
+    assert np.allclose(kalman.velocity[:2], expected, atol=1e-3)
+    assert np.allclose(kalman.position[:2], complementary.position[:2], atol=0.05)
+
+
+def test_kalman_period_follows_loop_rate():
+    estimator = build_estimator({}, backend="kalman", loop_rate_hz=50.0)
+    assert estimator.nominal_dt == 0.02
+
+    # Scheduling jitter within the tolerance reuses the nominal matrices
+    state = DroneState.empty()
+    state.elevation = [80.0, 10080.0, 80.0]
+    state.acceleration = [0.0, 0.0, -1000.0]
+    timestamp = 0.0
+    for jitter in (0.0, 0.0004, -0.0006, 0.0008, -0.0002):
+        timestamp += 0.02 + jitter
+        estimator.estimate(state, timestamp)
+    assert estimator._off_nominal is estimator._nominal
+
+    # An overrun tick gets matrices for its own dt
+    estimator.estimate(state, timestamp + 0.06)
+    assert estimator._off_nominal is not estimator._nominal
@@ -0,0 +1,73 @@
+"""
+FleetController heading hold uses the same yaw sign as Controller, so a
+knocked-off simulated heading returns to its target, and host addresses
+give each real drone its own DroneInterface and SDK state record.
+"""
+
+import contextlib
+import io
+
+from controller.controller import Controller
+from controller import fleet as fleet_module
+from controller.fleet import FleetController
+from drone import drone_interface
+from drone.sim_drone import SimDrone
+from utils.clock import VirtualClock
+from utils.logger import NullLogger
+
+
+def test_fleet_heading_returns_to_target(heading_kick):
+    clock = VirtualClock()
+    drones = {"alpha": SimDrone(clock=clock, noise=False),
+              "bravo": SimDrone(clock=clock, noise=False, initial_yaw=40.0)}
+    loggers = {"alpha": heading_kick(drones["alpha"], offset=-30.0),
+               "bravo": heading_kick(drones["bravo"], offset=30.0)}
+    fleet = FleetController(drones, clock=clock, loggers=loggers)
+    with contextlib.redirect_stdout(io.StringIO()):
+        fleet.run(max_ticks=250)
+
+    for vehicle in fleet.vehicles:
+        assert loggers[vehicle.name].ticks > 25
+        assert abs(Controller._angle_difference(vehicle.target_yaw, vehicle.drone.yaw)) < 2.0
+
+
+class FakeTello:
+    """Records its host and registers an SDK state record like djitellopy."""
+
+    TELLO_IP = "192.168.10.1"
+
+    def __init__(self, host):
+        self.host = host
+        FakeTello.drones[host] = {"responses": [], "state": {}}
+
+    def send_rc_control(self, lr, fb, ud, yaw):
+        pass
+
+
+def test_fleet_hosts_get_their_own_interfaces(monkeypatch):
+    FakeTello.drones = {}
+    monkeypatch.setattr(drone_interface, "Tello", FakeTello)
+    monkeypatch.setattr(drone_interface, "tello_sdk", FakeTello)
+    hosts = {"alpha": "192.168.1.21", "bravo": "192.168.1.22"}
+    loggers = {name: NullLogger() for name in hosts}
+    fleet = FleetController(hosts, clock=VirtualClock(), loggers=loggers)
+
+    for vehicle in fleet.vehicles:
+        assert isinstance(vehicle.drone, fleet_module.DroneInterface)
+        assert vehicle.drone.drone.host == hosts[vehicle.name]
+        assert FakeTello.drones[hosts[vehicle.name]] is vehicle.drone._state_slot
+
+    # Each slot receives only its own drone's packets
+    FakeTello.drones["192.168.1.22"]["state"] = {"yaw": 7}
+    alpha, bravo = fleet.vehicles
+    assert alpha.drone._state_slot.packet[0] == 0
+    assert bravo.drone._state_slot.packet[0] == 1
+
+
+def test_interface_defaults_to_tello_access_point(monkeypatch):
+    FakeTello.drones = {}
+    monkeypatch.setattr(drone_interface, "Tello", FakeTello)
+    monkeypatch.setattr(drone_interface, "tello_sdk", FakeTello)
+    interface = drone_interface.DroneInterface()
+    assert interface.host == FakeTello.TELLO_IP
+    assert FakeTello.drones[FakeTello.TELLO_IP] is interface._state_slot
@@ -0,0 +1,48 @@
+"""
+Flight recorder dumps never collide: back-to-back dumps get distinct
+names, and an existing file is never overwritten.
+"""
+
+import pytest
+
+from controller.state_estimator import EstimatedState
+from drone.drone_state import DroneState
+from utils.binary_log import BinaryLogReader
+from utils.flight_recorder import FlightRecorder
+from utils.log_context import LogContext, PIDOutputs, RCOutputs
+
+
+def make_context(timestamp):
+    return LogContext(
+        timestamp=timestamp,
+        loop_dt=0.04,
+        est=EstimatedState.zeros(),
+        raw=DroneState.empty(),
+        pid=PIDOutputs(1.0, 2.0, 3.0, 4.0),
+        rc=RCOutputs(1.0, 2.0, 3.0, 4.0),
+        setpoint=[0.0, 0.0, 0.5, 10.0],
+        terms=[0.5] * 12
+    )
+
+
+def test_back_to_back_dumps_get_distinct_files(tmp_path):
+    recorder = FlightRecorder(capacity=10, directory=tmp_path)
+    paths = []
+    for tick in range(5):
+        recorder.record(make_context(tick * 0.04))
+        paths.append(recorder.dump("manual"))
+
+    assert len(set(paths)) == 5
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(p.name for p in paths)
+    assert len(BinaryLogReader(paths[-1])) == 5
+
+
+def test_dump_does_not_overwrite(tmp_path):
+    recorder = FlightRecorder(capacity=10, directory=tmp_path)
+    recorder.record(make_context(0.0))
+    path = tmp_path / "dump.bin"
+    path.write_bytes(b"existing")
+
+    with pytest.raises(FileExistsError):
+        recorder.dump(path=path)
+    assert path.read_bytes() == b"existing"
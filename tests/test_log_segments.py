@@ -0,0 +1,77 @@
+"""
+Compressed, rotating log segments: a long run rotates into several
+standalone segments, and reading every segment listed in the JSON index
+(gzip or xz, CSV or binary) gives back exactly the rows written, with the
+index's per-segment row counts and time ranges.
+"""
+
+import csv
+import io
+
+import pytest
+
+from utils.binary_log import iter_record_chunks
+from utils.log_profiles import LogProfile
+from utils.log_segments import SegmentedLogWriter, open_segment, read_index
+
+PROFILE = LogProfile("segment_test", [
+    ("time", "timestamp"),
+    ("x", "est.position[0]"),
+    ("battery", "raw.battery", "i4"),
+])
+
+
+def make_rows(count):
+    return [(tick * 0.04, tick * 0.001 - 0.25, 100 - tick // 50) for tick in range(count)]
+
+
+def read_segment(path, log_format):
+    if log_format == "csv":
+        with open_segment(path, "rt", newline="") as f:
+            reader = csv.reader(f)
+            assert next(reader) == PROFILE.names   # every segment has its header
+            return [(float(t), float(x), int(b)) for t, x, b in reader]
+    with open_segment(path, "rb") as f:
+        return [record for chunk in iter_record_chunks(f) for record in chunk.tolist()]
+
+
+@pytest.mark.parametrize("log_format", ["csv", "binary"])
+@pytest.mark.parametrize("compression", ["gzip", "lzma"])
+def test_rotated_segments_round_trip(tmp_path, compression, log_format):
+    writer = SegmentedLogWriter(tmp_path / "run", PROFILE, log_format=log_format,
+                                compression=compression, block_size=512, rotate_bytes=600)
+    rows = make_rows(2000)
+    for start in range(0, len(rows), 25):
+        writer.writerows(rows[start:start + 25])
+    writer.close()
+
+    index, paths = read_index(writer.index_path)
+    assert index["format"] == log_format
+    assert index["compression"] == compression
+    assert index["columns"] == PROFILE.names
+    assert len(paths) >= 3   # rotated at least twice
+    assert all(path.name.endswith(writer.suffix) for path in paths)
+
+    read_back = []
+    for segment, path in zip(index["segments"], paths):
+        assert segment["complete"]
+        segment_rows = read_segment(path, log_format)
+        assert len(segment_rows) == segment["rows"]
+        assert segment["first_time"] == segment_rows[0][0]
+        assert segment["last_time"] == segment_rows[-1][0]
+        assert segment["bytes"] == path.stat().st_size
+        read_back.extend(segment_rows)
+
+    assert read_back == rows
+
+
+def test_index_is_readable_before_close(tmp_path):
+    writer = SegmentedLogWriter(tmp_path / "run", PROFILE, block_size=256)
+    writer.writerows(make_rows(100))
+
+    # Blocks already written are listed and decompress on their own
+    index, paths = read_index(writer.index_path)
+    written = index["segments"][0]["rows"]
+    assert 0 < written <= 100
+    assert read_segment(paths[0], "csv")[:written] == make_rows(written)
+    writer.close()
@@ -0,0 +1,43 @@
+"""
+control.pid.pid_x ... pid_yaw must resolve to the shared PID instances
+whatever order the package and its per-axis submodules are imported in.
+Each case runs in a fresh interpreter so earlier imports cannot mask it.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+CHECK = """
+import control, control.pid
+from control.pid import PID, get_pid
+from control.pid import pid_x, pid_yaw
+from control.pid.pid_x import pid_x as sub_pid_x
+assert isinstance(pid_x, PID), type(pid_x)
+assert isinstance(pid_yaw, PID), type(pid_yaw)
+assert pid_x is sub_pid_x is get_pid("pid_x")
+assert control.pid.pid_x is pid_x
+assert control.pid_x is pid_x
+"""
+
+IMPORT_ORDERS = [
+    "",
+    "import control.pid.pid_x",
+    "import control.pid.pid_x, control.pid.pid_yaw",
+    "from control.pid import pid_x",
+    "import control\nimport control.pid.pid_yaw",
+    "from control.pid.pid_x import pid_x",
+]
+
+
+@pytest.mark.parametrize("prelude", IMPORT_ORDERS)
+def test_pid_names_resolve_to_pids(prelude):
+    result = subprocess.run(
+        [sys.executable, "-c", prelude + "\n" + CHECK],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,62 @@
+"""
+RCOutputStage on a VirtualClock: duplicate integer commands are
+suppressed, the current command is re-sent once the 0.5 s keepalive has
+passed, changes always go out, and sent/suppressed are counted.
+"""
+
+from drone.rc_output import RCOutputStage
+from utils.clock import VirtualClock
+
+TICK = 0.04
+
+
+def make_stage(keepalive_interval=0.5):
+    clock = VirtualClock()
+    packets = []
+    stage = RCOutputStage(lambda *command: packets.append((clock.now(), command)),
+                          clock=clock, keepalive_interval=keepalive_interval)
+    return stage, clock, packets
+
+
+def test_duplicates_suppressed_until_keepalive():
+    stage, clock, packets = make_stage()
+    for _ in range(25):   # one second of a steady hover at 25 Hz
+        stage.send(10.2, -3.9, 0.4, 7.0)
+        clock.advance(TICK)
+
+    # Truncated like the SDK: (10, -3, 0, 7). Sent at t=0, then once the
+    # 0.5 s keepalive expires (first tick at or after 0.5 s)
+    times = [round(t, 6) for t, _ in packets]
+    assert times == [0.0, 0.52]
+    assert all(command == (10, -3, 0, 7) for _, command in packets)
+    assert stage.sent == 2
+    assert stage.suppressed == 23
+    assert stage.summary()["suppressed_fraction"] == 23 / 25
+
+
+def test_changed_command_is_sent_immediately():
+    stage, clock, packets = make_stage()
+    assert stage.send(10.0, 0.0, 0.0, 0.0)
+    clock.advance(TICK)
+    assert not stage.send(10.9, 0.5, -0.5, 0.0)   # same after truncation
+    clock.advance(TICK)
+    assert stage.send(11.0, 0.0, 0.0, 0.0)
+    assert [command for _, command in packets] == [(10, 0, 0, 0), (11, 0, 0, 0)]
+    assert (stage.sent, stage.suppressed) == (2, 1)
+
+
+def test_reset_forces_next_send():
+    stage, clock, packets = make_stage()
+    stage.send(0, 0, 0, 0)
+    stage.reset()
+    assert stage.send(0, 0, 0, 0)
+    assert len(packets) == 2
+
+
+def test_no_keepalive_sends_every_command():
+    stage, clock, packets = make_stage(keepalive_interval=None)
+    for _ in range(5):
+        stage.send(0, 0, 0, 0)
+        clock.advance(TICK)
+    assert len(packets) == 5
+    assert (stage.sent, stage.suppressed) == (5, 0)
@@ -0,0 +1,67 @@
+"""
+LoopScheduler on a VirtualClock: ticks land on the absolute deadline grid
+whatever the work done inside them, and after an overrun "skip" drops the
+missed deadlines while "catch_up" runs them back-to-back, both returning
+to the same grid.
+"""
+
+import pytest
+
+from controller.scheduler import LoopScheduler
+from utils.clock import VirtualClock
+
+RATE_HZ = 4.0   # 0.25 s period, exact in binary floating point
+
+
+def test_work_inside_ticks_does_not_drift():
+    clock = VirtualClock()
+    scheduler = LoopScheduler(clock, rate_hz=RATE_HZ)
+    ticks = []
+    for _ in range(5):
+        ticks.append(scheduler.next_tick())
+        clock.advance(0.1)   # tick work
+    assert ticks == [0.0, 0.25, 0.5, 0.75, 1.0]
+    assert scheduler.stats.overruns == 0
+    assert scheduler.stats.mean_period == pytest.approx(0.25)
+
+
+def test_skip_drops_missed_deadlines():
+    clock = VirtualClock()
+    scheduler = LoopScheduler(clock, rate_hz=RATE_HZ, overrun_policy="skip")
+    ticks = [scheduler.next_tick()]
+    clock.advance(0.6)   # overrun past the 0.25 and 0.5 deadlines
+    for _ in range(3):
+        ticks.append(scheduler.next_tick())
+
+    # The late tick runs at once, then the schedule resumes on the grid
+    assert ticks == [0.0, 0.6, 0.75, 1.0]
+    assert scheduler.stats.overruns == 1
+    assert scheduler.stats.skipped == 1
+
+
+def test_catch_up_runs_missed_deadlines_back_to_back():
+    clock = VirtualClock()
+    scheduler = LoopScheduler(clock, rate_hz=RATE_HZ, overrun_policy="catch_up")
+    ticks = [scheduler.next_tick()]
+    clock.advance(0.6)
+    for _ in range(4):
+        ticks.append(scheduler.next_tick())
+
+    # Deadlines 0.25 and 0.5 both run immediately at 0.6
+    assert ticks == [0.0, 0.6, 0.6, 0.75, 1.0]
+    assert scheduler.stats.overruns == 2
+    assert scheduler.stats.skipped == 0
+
+
+def test_reset_reanchors_the_grid():
+    clock = VirtualClock()
+    scheduler = LoopScheduler(clock, rate_hz=RATE_HZ)
+    scheduler.next_tick()
+    clock.advance(0.1)
+    scheduler.reset()
+    assert [scheduler.next_tick() for _ in range(3)] == [0.1, 0.35, 0.6]
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        LoopScheduler(VirtualClock(), overrun_policy="burst")
@@ -0,0 +1,32 @@
+"""
+SimDrone telemetry must be in the units the estimator converts, so the
+estimated position of a simulated flight follows the simulator's true one.
+"""
+
+import numpy as np
+
+from utils.logger import NullLogger
+
+
+class PositionErrorRecorder(NullLogger):
+    """Records estimated minus true x/y position every logged tick."""
+
+    def __init__(self, drone):
+        self.drone = drone
+        self.errors = []
+
+    def log_frame(self, context):
+        self.errors.append(np.subtract(context.est.position[:2], self.drone.position[:2]))
+
+
+def test_estimated_position_tracks_sim_truth(sim_flight):
+    flight = sim_flight(logger=PositionErrorRecorder, seed=4)
+    flight.controller.setpoint["x"] = 1.0
+    flight.controller.setpoint["y"] = -0.5
+    flight.fly(max_ticks=750)
+
+    drone = flight.drone
+    assert np.abs(flight.logger.errors).max() < 0.25
+    # The drone actually flew to the setpoint, not just its estimate
+    assert abs(drone.position[0] - 1.0) < 0.25
+    assert abs(drone.position[1] + 0.5) < 0.25
@@ -0,0 +1,66 @@
+"""
+DroneInterface hooks djitellopy internals: the module-level `drones`
+record each Tello registers, and the receiver thread's assignment of
+every parsed packet to record['state']. These tests fail if the installed
+SDK no longer has that layout, and pin _StateSlot's stamping behaviour.
+"""
+
+import importlib.metadata
+import importlib.util
+import re
+import threading
+from pathlib import Path
+
+import pytest
+
+from drone.drone_interface import _StateSlot
+
+SUPPORTED_VERSION = "2.5.0"
+
+
+@pytest.fixture
+def tello_source():
+    spec = importlib.util.find_spec("djitellopy")
+    if spec is None:
+        pytest.skip("djitellopy is not installed")
+    # Read the source rather than importing it: the SDK's video
+    # dependencies are not needed to check the state path
+    return (Path(spec.submodule_search_locations[0]) / "tello.py").read_text()
+
+
+def test_installed_sdk_is_the_supported_version(tello_source):
+    assert importlib.metadata.version("djitellopy") == SUPPORTED_VERSION
+
+
+def test_sdk_registers_a_state_record_per_host(tello_source):
+    assert re.search(r"drones\[host\]\s*=\s*\{'responses':\s*\[\],\s*'state':\s*\{\}\}", tello_source)
+
+
+def test_sdk_receiver_assigns_parsed_state(tello_source):
+    assert re.search(r"drones\[address\]\['state'\]\s*=\s*Tello\.parse_state\(", tello_source)
+
+
+def test_state_slot_stamps_each_packet():
+    record = {"responses": [], "state": {}}
+    slot = _StateSlot(record)
+    assert slot.packet[0] == 0
+
+    slot["state"] = {"yaw": 1}
+    seq, received, state = slot.packet
+    assert seq == 1 and received is not None and state == {"yaw": 1}
+    assert slot["state"] is state
+
+    # Other keys pass through untouched
+    slot["responses"] = [b"ok"]
+    assert slot.packet[0] == 1
+
+
+def test_state_slot_wakes_waiters():
+    slot = _StateSlot({"responses": [], "state": {}})
+    assert not slot.wait_for_packet(0, timeout=0.01)
+
+    publisher = threading.Timer(0.01, slot.__setitem__, ("state", {"yaw": 2}))
+    publisher.start()
+    assert slot.wait_for_packet(0, timeout=1.0)
+    publisher.join()
+    assert slot.packet[2] == {"yaw": 2}
@@ -0,0 +1,41 @@
+"""
+Logged rows carry the tick's Unix time next to the monotonic timestamp:
+wall_time = time + clock.wall_offset, in the full_pid and supervisory
+profiles.
+"""
+
+import time
+
+import pytest
+
+from utils.clock import MonotonicClock
+from utils.log_profiles import get_profile
+from utils.logger import NullLogger
+
+
+class RowRecorder(NullLogger):
+    """Extracts every logged frame with the given profile."""
+
+    def __init__(self, mode):
+        self.profile = get_profile(mode)
+        self.rows = []
+
+    def log_frame(self, context):
+        self.rows.append(dict(zip(self.profile.names, self.profile.extract(context))))
+
+
+@pytest.mark.parametrize("mode", ["full_pid", "supervisory"])
+def test_rows_carry_wall_time(sim_flight, mode):
+    flight = sim_flight(logger=lambda drone: RowRecorder(mode))
+    flight.clock.wall_offset = 1_700_000_000.0
+    flight.fly(max_ticks=10)
+
+    recorder = flight.logger
+    assert recorder.rows
+    for row in recorder.rows:
+        assert row["wall_time"] == row["time"] + 1_700_000_000.0
+
+
+def test_monotonic_clock_maps_to_unix_time():
+    clock = MonotonicClock()
+    assert abs(clock.now() + clock.wall_offset - time.time()) < 0.01
@@ -0,0 +1,28 @@
+"""
+SimDrone heading response: positive RC yaw turns clockwise (decreasing
+yaw in the utils.transforms frame), and the controller's heading hold
+brings a knocked-off simulated heading back to its target either way.
+"""
+
+import pytest
+
+from controller.controller import Controller
+from drone.sim_drone import SimDrone
+from utils.clock import VirtualClock
+
+
+def test_positive_rc_yaw_turns_clockwise():
+    clock = VirtualClock()
+    drone = SimDrone(clock=clock, noise=False)
+    drone.connect()
+    drone.takeoff()
+    drone.send_rc(0, 0, 0, 50)
+    clock.advance(1.0)
+    assert drone.get_state().orientation[2] < 0
+
+
+@pytest.mark.parametrize("offset", [-30.0, 30.0])
+def test_heading_returns_to_target(sim_flight, heading_kick, offset):
+    flight = sim_flight(logger=lambda drone: heading_kick(drone, offset=offset), noise=False)
+    flight.fly(max_ticks=250)
+    assert abs(Controller._angle_difference(flight.controller.target_yaw, flight.drone.yaw)) < 2.0
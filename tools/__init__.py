@@ -0,0 +1,7 @@
+"""
+Offline tools built on the control stack.
+
+Run from the repository root, e.g.:
+    python -m tools.autotune --strategy adaptive --budget 200
+    python -m tools.replay logs/pid_flight.csv --output replay.csv
+"""
@@ -0,0 +1,436 @@
+"""
+Streaming flight-log analyzer.
+
+Reads a DataLogger log (full_pid, supervisory or flight recorder profile;
+CSV, binary, compressed segments or a segment index) in fixed-size chunks
+of NumPy columns and keeps only per-axis running totals, so memory use is
+flat however long the log is. Reports, per axis (x, y, z, yaw):
+
+- RMS / max tracking error against the logged setpoint (sp_* columns, or
+  the hover defaults for logs without them)
+- step response: every setpoint change starts a step, scored for
+  overshoot and settling time as in tools/autotune.py
+- RC saturation: share of ticks with the RC command at the PID's
+  output_limits
+- integrator windup: time with the integrator pinned at integral_limits,
+  taken from the i_* columns of flight-recorder dumps, or reconstructed
+  from the logged errors otherwise (approximate for decimated logs)
+
+plus loop_dt statistics (mean, jitter, percentiles). The report is JSON:
+
+    python -m tools.analyze_log logs/pid_flight.csv --output report.json
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import sys
+
+import numpy as np
+
+from control.pid.pid_base import AXIS_NAMES, PIDConfig
+from utils.binary_log import BinaryLogReader, iter_record_chunks
+from utils.config_loader import load_pid_config
+from utils.log_segments import open_segment, read_index
+
+# Analyzed axes: (name, measured column, setpoint column, rc column, PID entry)
+AXES = (
+    ("x", "x", "sp_x", "rc_lr", "pid_x"),
+    ("y", "y", "sp_y", "rc_fb", "pid_y"),
+    ("z", "z", "sp_z", "rc_ud", "pid_z"),
+    ("yaw", "yaw", "sp_yaw", "rc_yaw", "pid_yaw"),
+)
+
+DEFAULT_CHUNK_ROWS = 65536
+
+# loop_dt histogram for percentiles: 0.1 ms bins up to 1 s, plus overflow
+_DT_BIN_S = 1e-4
+_DT_BINS = 10000
+
+
+# ---------------------------------------------------------
+# Chunked column reading
+# ---------------------------------------------------------
+
+def iter_log_chunks(path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Yield {column: float64 array} dicts of up to chunk_rows rows.
+    path: .csv / .bin log, a compressed segment or a .index.json index
+    """
+    path = str(path)
+    if path.endswith(".index.json"):
+        _, segments = read_index(path)
+        for segment in segments:
+            yield from iter_log_chunks(segment, chunk_rows)
+        return
+
+    if path.endswith(".bin"):
+        records = BinaryLogReader(path).records
+        for start in range(0, len(records), chunk_rows):
+            yield _record_columns(records[start:start + chunk_rows])
+        return
+
+    if path.endswith((".bin.gz", ".bin.xz")):
+        with open_segment(path) as f:
+            for chunk in iter_record_chunks(f, chunk_rows, path):
+                yield _record_columns(chunk)
+        return
+
+    with open_segment(path, "rt", newline="") as f:
+        reader = csv.reader(f)
+        names = next(reader, None)
+        if names is None:
+            return
+        while True:
+            rows = list(itertools.islice(reader, chunk_rows))
+            if not rows:
+                return
+            text = np.array(rows)
+            text[text == ""] = "nan"   # e.g. a yaw setpoint logged before takeoff
+            values = text.astype(float)
+            yield {name: values[:, i] for i, name in enumerate(names)}
+
+
+def _record_columns(records):
+    return {name: records[name].astype(float, copy=False) for name in records.dtype.names}
+
+
+# ---------------------------------------------------------
+# Streaming statistics
+# ---------------------------------------------------------
+
+def wrap_degrees(angle):
+    """Wrap angles (degrees, array) to [-180, 180)."""
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+def clipped_cumsum(start, increments, low, high):
+    """
+    Running sum of increments from start, clamped to [low, high] after
+    every step (the PID's anti-windup integral). Vectorized between
+    saturation events: one NumPy pass per entry into / exit from a limit.
+    """
+    out = np.empty(len(increments))
+    value = start
+    pos = 0
+    n = len(increments)
+    while pos < n:
+        rest = increments[pos:]
+        # Pinned at a limit: stays there while increments keep pushing outward
+        if value >= high or value <= low:
+            leaving = np.flatnonzero(rest < 0) if value >= high else np.flatnonzero(rest > 0)
+            run = leaving[0] if leaving.size else len(rest)
+            out[pos:pos + run] = value
+            pos += run
+            if pos == n:
+                break
+            rest = increments[pos:]
+
+        path = value + np.cumsum(rest)
+        crossing = np.flatnonzero((path > high) | (path < low))
+        if not crossing.size:
+            out[pos:] = path
+            break
+        k = crossing[0]
+        out[pos:pos + k] = path[:k]
+        value = min(max(path[k], low), high)
+        out[pos + k] = value
+        pos += k + 1
+    return out
+
+
+def _changed(before, after):
+    """Elementwise before != after, treating NaN as equal to NaN."""
+    return (before != after) & ~(np.isnan(before) & np.isnan(after))
+
+
+class LoopDtStats:
+    """Mean / jitter (Chan's parallel variance) and histogram percentiles of loop_dt."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.histogram = np.zeros(_DT_BINS + 1, dtype=np.int64)
+
+    def update(self, loop_dt):
+        loop_dt = loop_dt[loop_dt > 0]   # first tick of a run has no period
+        n = len(loop_dt)
+        if not n:
+            return
+        mean = float(loop_dt.mean())
+        m2 = float(((loop_dt - mean) ** 2).sum())
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, float(loop_dt.min()))
+        self.max = max(self.max, float(loop_dt.max()))
+        bins = np.minimum((loop_dt / _DT_BIN_S).astype(np.int64), _DT_BINS)
+        self.histogram += np.bincount(bins, minlength=_DT_BINS + 1)
+
+    def percentile(self, q):
+        """Upper edge of the histogram bin holding the q-th percentile."""
+        rank = q / 100.0 * self.count
+        index = int(np.searchsorted(np.cumsum(self.histogram), rank))
+        return min((index + 1) * _DT_BIN_S, self.max)
+
+    def result(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_s": self.mean,
+            "jitter_s": math.sqrt(self._m2 / self.count),
+            "min_s": self.min,
+            "max_s": self.max,
+            "p50_s": self.percentile(50),
+            "p99_s": self.percentile(99),
+        }
+
+
+class AxisStats:
+    """Running tracking, step-response, saturation and windup totals for one axis."""
+
+    def __init__(self, name, config: PIDConfig, band_frac, band_min, angular=False):
+        self.name = name
+        self.config = config
+        self.band_frac = band_frac
+        self.band_min = band_min
+        self.angular = angular
+
+        self.count = 0
+        self.sum_sq = 0.0
+        self.max_abs = 0.0
+
+        # Step segments (one per setpoint value)
+        self.prev_setpoint = None
+        self.segment = None
+        self.steps = 0
+        self.overshoot_max = 0.0
+        self.settling_total = 0.0
+        self.settling_max = 0.0
+        self.unsettled = 0
+
+        self.saturated = 0
+        self.rc_count = 0
+
+        self.integral = 0.0
+        self.windup_time = 0.0
+        self.windup_source = None
+
+    def update(self, t, dt, setpoint, measured, rc=None, i_term=None):
+        """Consume one chunk of aligned column arrays."""
+        error = setpoint - measured
+        if self.angular:
+            error = wrap_degrees(error)
+        valid = ~np.isnan(error)
+
+        # Tracking error
+        tracked = error[valid]
+        self.count += len(tracked)
+        if len(tracked):
+            self.sum_sq += float(np.dot(tracked, tracked))
+            self.max_abs = max(self.max_abs, float(np.abs(tracked).max()))
+
+        # Step response, split wherever the setpoint changes
+        starts = np.flatnonzero(_changed(setpoint[:-1], setpoint[1:])) + 1
+        bounds = [0, *starts.tolist(), len(t)]
+        continues = self.prev_setpoint is not None and not _changed(self.prev_setpoint, setpoint[0])
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            if a > 0 or not continues:
+                self._finish_segment()
+                self._start_segment(t[a], error[a])
+            self._update_segment(t[a:b], error[a:b])
+        self.prev_setpoint = setpoint[-1]
+
+        # RC saturation against the PID output limits
+        if rc is not None:
+            low, high = self.config.output_limits
+            self.saturated += int(np.count_nonzero((rc <= low) | (rc >= high)))
+            self.rc_count += len(rc)
+
+        # Integrator windup: time spent pinned at integral_limits
+        low, high = self.config.integral_limits
+        if i_term is not None and self.config.ki > 0:
+            integral = i_term / self.config.ki
+            pinned = np.isclose(integral, high) | np.isclose(integral, low)
+            self.windup_source = "i_terms"
+        else:
+            increments = np.where(valid, error, 0.0) * dt
+            integral = clipped_cumsum(self.integral, increments, low, high)
+            self.integral = float(integral[-1])
+            pinned = (integral >= high) | (integral <= low)
+            self.windup_source = self.windup_source or "reconstructed"
+        self.windup_time += float(dt[pinned].sum())
+
+    def _start_segment(self, start_time, step):
+        if math.isnan(step):
+            self.segment = None
+            return
+        self.segment = {
+            "start": start_time,
+            "end": start_time,
+            "step": step,
+            "band": max(self.band_min, self.band_frac * abs(step)),
+            "overshoot": 0.0,
+            "settled_at": start_time,
+        }
+
+    def _update_segment(self, t, error):
+        segment = self.segment
+        if segment is None:
+            return
+        sign = math.copysign(1.0, segment["step"])
+        # Travel past the target, in the direction of the step
+        segment["overshoot"] = max(segment["overshoot"], float(np.nanmax(-error * sign)))
+        outside = np.flatnonzero(np.abs(error) > segment["band"])
+        if outside.size:
+            k = outside[-1]
+            segment["settled_at"] = float(t[k + 1]) if k + 1 < len(t) else None
+        elif segment["settled_at"] is None:
+            segment["settled_at"] = float(t[0])
+        segment["end"] = float(t[-1])
+
+    def _finish_segment(self):
+        segment = self.segment
+        self.segment = None
+        if segment is None or abs(segment["step"]) <= self.band_min:
+            return   # setpoint hold, not a step
+        self.steps += 1
+        self.overshoot_max = max(self.overshoot_max, segment["overshoot"] / abs(segment["step"]))
+        if segment["settled_at"] is None:
+            self.unsettled += 1
+            settling = segment["end"] - segment["start"]
+        else:
+            settling = segment["settled_at"] - segment["start"]
+        self.settling_total += settling
+        self.settling_max = max(self.settling_max, settling)
+
+    def result(self, duration):
+        self._finish_segment()
+        result = {
+            "rms_error": math.sqrt(self.sum_sq / self.count) if self.count else None,
+            "max_error": self.max_abs if self.count else None,
+            "steps": self.steps,
+            "max_overshoot": self.overshoot_max if self.steps else None,
+            "mean_settling_time_s": self.settling_total / self.steps if self.steps else None,
+            "max_settling_time_s": self.settling_max if self.steps else None,
+            "unsettled_steps": self.unsettled,
+            "rc_saturation_pct": 100.0 * self.saturated / self.rc_count if self.rc_count else None,
+            "windup_time_s": self.windup_time,
+            "windup_pct": 100.0 * self.windup_time / duration if duration > 0 else 0.0,
+            "windup_source": self.windup_source,
+        }
+        return result
+
+
+# ---------------------------------------------------------
+# Analysis
+# ---------------------------------------------------------
+
+def analyze(path, pid_config=None, target_altitude=0.5, chunk_rows=DEFAULT_CHUNK_ROWS,
+            band_frac=0.05, band_min=0.02, yaw_band_min=2.0):
+    """
+    Stream a log and return the report dict.
+    pid_config: parsed pid_config.json dict providing output/integral
+                limits (the current config/pid_config.json if None)
+    target_altitude: z setpoint for logs without sp_* columns; x/y hold 0
+                     and yaw holds the first logged heading
+    band_frac / band_min: settling band, a fraction of the step size with
+                          a floor in meters (yaw_band_min in degrees)
+    """
+    if pid_config is None:
+        pid_config = load_pid_config()
+    configs = {axis: PIDConfig.from_dict(pid_config[axis]) for axis in AXIS_NAMES}
+    axes = {
+        name: AxisStats(name, configs[pid], band_frac,
+                        yaw_band_min if name == "yaw" else band_min, angular=(name == "yaw"))
+        for name, _, _, _, pid in AXES
+    }
+    loop_dt = LoopDtStats()
+
+    rows = 0
+    first_time = None
+    last_time = None
+    hold_yaw = None
+    has_setpoints = None
+
+    for columns in iter_log_chunks(path, chunk_rows):
+        t = columns["time"]
+        n = len(t)
+        if not n:
+            continue
+        if has_setpoints is None:
+            has_setpoints = "sp_x" in columns
+            first_time = float(t[0])
+            hold_yaw = float(columns["yaw"][0])
+
+        # Sample periods (time since the previous logged row)
+        dt = np.diff(t, prepend=t[0] if last_time is None else last_time)
+        rows += n
+        last_time = float(t[-1])
+
+        if "loop_dt" in columns:
+            loop_dt.update(columns["loop_dt"])
+
+        for name, measured, sp_column, rc_column, _ in AXES:
+            if has_setpoints:
+                setpoint = columns[sp_column]
+            else:
+                default = {"x": 0.0, "y": 0.0, "z": target_altitude, "yaw": hold_yaw}[name]
+                setpoint = np.full(n, default)
+            axes[name].update(
+                t, dt, setpoint, columns[measured],
+                rc=columns.get(rc_column),
+                i_term=columns.get(f"i_{name}"),
+            )
+
+    duration = (last_time - first_time) if rows else 0.0
+    return {
+        "log": str(path),
+        "rows": rows,
+        "duration_s": duration,
+        "setpoints": "logged" if has_setpoints else "defaults",
+        "loop_dt": loop_dt.result(),
+        "axes": {name: stats.result(duration) for name, stats in axes.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming flight-log analyzer")
+    parser.add_argument("log", help="DataLogger log (.csv, .bin, compressed segment or .index.json)")
+    parser.add_argument("--config", help="pid_config.json with the flown limits (default: config/pid_config.json)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--target-altitude", type=float, default=0.5,
+                        help="z setpoint for logs without sp_* columns")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help="rows per processing chunk (bounds memory use)")
+    parser.add_argument("--band-frac", type=float, default=0.05,
+                        help="settling band as a fraction of the step size")
+    parser.add_argument("--band-min", type=float, default=0.02,
+                        help="minimum settling band in meters (also the smallest step scored)")
+    parser.add_argument("--yaw-band-min", type=float, default=2.0,
+                        help="minimum yaw settling band in degrees")
+    args = parser.parse_args()
+
+    pid_config = load_pid_config(args.config) if args.config else None
+    report = analyze(args.log, pid_config, args.target_altitude, args.chunk_rows,
+                     args.band_frac, args.band_min, args.yaw_band_min)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Analyzed {report['rows']} rows from {args.log}; report written to {args.output}")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Offline PID autotuner over simulated flights.
+
+Each candidate gain set is flown in closed loop through the real
+Controller / StateEstimator / PID code against a SimDrone on a
+VirtualClock: after takeoff the controller is asked to climb to the target
+altitude and step sideways in x while holding y, with a light wind. The
+true trajectory, measured from where the controller's estimator was reset,
+is scored per axis on RMS error, overshoot and settling time, and the
+lowest total score wins. A run whose estimated position strays from the
+true one by more than max_estimate_error_m scores infinity, with the reason
+recorded in its result: its score would rate the estimator (or a
+simulator/estimator unit mismatch), not the gains. Failed candidates are
+reported and the sweep carries on.
+
+Search strategies:
+- grid:     cartesian product of gain multipliers around the base config
+- random:   log-uniform samples around the base config
+- adaptive: cross-entropy search; each round samples around the best
+            candidates so far and narrows the spread (a dependency-free
+            stand-in for Bayesian optimisation)
+
+Evaluations run on all cores through a process pool and are cached by a
+hash of (gains, scenario), so reruns only fly new candidates. The best
+configuration is written in the pid_config.json schema.
+
+    python -m tools.autotune --strategy adaptive --budget 200 --output tuned_pid_config.json
+"""
+
+import argparse
+import contextlib
+import copy
+import hashlib
+import io
+import itertools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from control.pid import create_pids
+from control.pid.pid_base import AXIS_NAMES
+from controller.controller import Controller
+from drone.sim_drone import SimDrone
+from utils.clock import VirtualClock
+from utils.config_loader import load_pid_config
+
+GAINS = ("kp", "ki", "kd")
+
+DEFAULT_SCENARIO = {
+    "duration_s": 20.0,
+    "step_x_m": 0.3,
+    "target_altitude_m": 0.5,
+    "wind": [0.03, -0.02],
+    "seed": 0,
+    "noise": True,              # simulated sensor noise
+    "settle_band_frac": 0.05,   # of the step size
+    "settle_band_min_m": 0.02,
+    "max_estimate_error_m": 0.15,
+}
+
+# Score = sum over axes of rms + OVERSHOOT_WEIGHT * overshoot + SETTLING_WEIGHT * settling
+OVERSHOOT_WEIGHT = 0.5
+SETTLING_WEIGHT = 0.02
+
+
+class _TrajectoryRecorder:
+    """
+    Logger stand-in that records the simulator's true position and the
+    controller's estimated position each tick.
+    """
+
+    def __init__(self, drone):
+        self.drone = drone
+        self.times = []
+        self.positions = []
+        self.estimates = []
+
+    def log_frame(self, context):
+        self.times.append(context.timestamp)
+        self.positions.append(tuple(self.drone.position))
+        self.estimates.append(tuple(context.est.position))
+
+    def close(self):
+        pass
+
+
+# ---------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------
+
+def step_metrics(times, values, start, target, band_frac, band_min):
+    """RMS / max error, overshoot fraction and settling time of one axis."""
+    error = target - values
+    step = target - start
+    metrics = {
+        "rms_error": float(np.sqrt(np.mean(error ** 2))),
+        "max_error": float(np.max(np.abs(error))),
+    }
+
+    if abs(step) > 1e-9:
+        # Travel past the target, as a fraction of the step
+        metrics["overshoot"] = float(max(0.0, np.max(-error * np.sign(step)) / abs(step)))
+        band = max(band_min, band_frac * abs(step))
+    else:
+        metrics["overshoot"] = 0.0
+        band = band_min
+
+    outside = np.nonzero(np.abs(error) > band)[0]
+    if len(outside) == 0:
+        metrics["settling_time"] = 0.0
+    elif outside[-1] == len(error) - 1:
+        metrics["settling_time"] = float(times[-1] - times[0])   # never settled
+    else:
+        metrics["settling_time"] = float(times[outside[-1] + 1] - times[0])
+    return metrics
+
+
+def score(metrics):
+    return sum(
+        m["rms_error"] + OVERSHOOT_WEIGHT * m["overshoot"] + SETTLING_WEIGHT * m["settling_time"]
+        for m in metrics.values()
+    )
+
+
+# ---------------------------------------------------------
+# Evaluation (runs in worker processes)
+# ---------------------------------------------------------
+
+def evaluate(config, scenario):
+    """Fly one simulated step scenario with the given pid_config dict."""
+    clock = VirtualClock()
+    drone = SimDrone(clock=clock, seed=scenario["seed"], wind=scenario["wind"],
+                     noise=scenario.get("noise", True))
+    recorder = _TrajectoryRecorder(drone)
+
+    pids = create_pids(config)
+    controller = Controller(drone, target_altitude=scenario["target_altitude_m"],
+                            clock=clock, logger=recorder, pids=pids)
+    controller.setpoint["x"] = scenario["step_x_m"]
+
+    ticks = int(scenario["duration_s"] * controller.loop_rate_hz)
+    with contextlib.redirect_stdout(io.StringIO()):
+        controller.start(max_ticks=ticks)
+
+    times = np.asarray(recorder.times)
+    # True position in the controller's frame: the estimator is reset (its
+    # origin set) at the first tick, after the drone drifted during takeoff
+    positions = np.asarray(recorder.positions)
+    positions -= positions[0]
+
+    band = (scenario["settle_band_frac"], scenario["settle_band_min_m"])
+    metrics = {
+        "x": step_metrics(times, positions[:, 0], 0.0, scenario["step_x_m"], *band),
+        "y": step_metrics(times, positions[:, 1], 0.0, 0.0, *band),
+        "z": step_metrics(times, positions[:, 2], 0.0, scenario["target_altitude_m"], *band),
+    }
+    result = {"score": score(metrics), "metrics": metrics}
+
+    estimate_error = float(np.max(np.abs(np.asarray(recorder.estimates) - positions)))
+    result["max_estimate_error_m"] = estimate_error
+    if estimate_error > scenario["max_estimate_error_m"]:
+        result["score"] = math.inf
+        result["error"] = (
+            f"Estimated position strayed {estimate_error:.3f} m from the simulated "
+            f"true position (tolerance {scenario['max_estimate_error_m']} m); check that "
+            f"SimDrone telemetry units match the estimator"
+        )
+    return result
+
+
+def config_hash(config, scenario):
+    payload = json.dumps({"config": config, "scenario": scenario}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------
+# Candidate generation
+# ---------------------------------------------------------
+
+def apply_multipliers(base, axes, multipliers):
+    """multipliers: {(axis, gain): factor} applied to a copy of base."""
+    config = copy.deepcopy(base)
+    for (axis, gain), factor in multipliers.items():
+        config[axis][gain] = round(base[axis][gain] * factor, 6)
+    return config
+
+
+def grid_candidates(base, axes, levels=(0.5, 1.0, 2.0)):
+    keys = [(axis, gain) for axis in axes for gain in GAINS]
+    for factors in itertools.product(levels, repeat=len(keys)):
+        yield apply_multipliers(base, axes, dict(zip(keys, factors)))
+
+
+def random_candidates(base, axes, rng, spread=1.0):
+    """Infinite stream of log-uniform samples within e^±spread of base."""
+    keys = [(axis, gain) for axis in axes for gain in GAINS]
+    while True:
+        factors = np.exp(rng.uniform(-spread, spread, size=len(keys)))
+        yield apply_multipliers(base, axes, dict(zip(keys, factors)))
+
+
+# ---------------------------------------------------------
+# Search driver
+# ---------------------------------------------------------
+
+class Tuner:
+    """Evaluates candidates in a process pool, memoized in a JSON cache."""
+
+    def __init__(self, scenario, cache_path=None, workers=None):
+        self.scenario = scenario
+        self.cache_path = cache_path
+        self.cache = {}
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path) as f:
+                self.cache = json.load(f)
+        self.pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+        self.results = []   # (score, config, metrics)
+
+    def evaluate_all(self, configs):
+        configs = list(configs)
+        keys = [config_hash(c, self.scenario) for c in configs]
+        pending = {k: c for k, c in zip(keys, configs) if k not in self.cache}
+
+        futures = {k: self.pool.submit(evaluate, c, self.scenario) for k, c in pending.items()}
+        crashed = {}
+        try:
+            for key, future in futures.items():
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Not cached, so a later run retries the candidate
+                    result = crashed[key] = {"score": math.inf, "metrics": {},
+                                             "error": f"{type(e).__name__}: {e}"}
+                else:
+                    self.cache[key] = result
+                if "error" in result:
+                    print(f"Candidate {key[:12]} scored inf: {result['error']}")
+        finally:
+            if futures:
+                self._save_cache()
+
+        batch = []
+        for key, config in zip(keys, configs):
+            result = crashed.get(key) or self.cache[key]
+            batch.append((result["score"], config, result["metrics"]))
+        self.results.extend(batch)
+        return batch
+
+    def best(self, n=1):
+        return sorted(self.results, key=lambda r: r[0])[:n]
+
+    def _save_cache(self):
+        if self.cache_path:
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.cache, f)
+            os.replace(tmp_path, self.cache_path)
+
+    def close(self):
+        self.pool.shutdown()
+
+
+def adaptive_search(tuner, base, axes, budget, rng, rounds=5, elite_frac=0.2):
+    """Cross-entropy search in log-gain space around the base config."""
+    keys = [(axis, gain) for axis in axes for gain in GAINS]
+    mean = np.zeros(len(keys))
+    std = np.full(len(keys), 1.0)
+    per_round = max(2, budget // rounds)
+
+    for _ in range(rounds):
+        samples = rng.normal(mean, std, size=(per_round, len(keys)))
+        configs = [apply_multipliers(base, axes, dict(zip(keys, np.exp(s)))) for s in samples]
+        batch = tuner.evaluate_all(configs)
+
+        order = np.argsort([b[0] for b in batch])
+        elite = samples[order[:max(2, int(per_round * elite_frac))]]
+        mean = elite.mean(axis=0)
+        std = np.maximum(elite.std(axis=0), 0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulated PID gain autotuner")
+    parser.add_argument("--strategy", choices=("grid", "random", "adaptive"), default="adaptive")
+    parser.add_argument("--budget", type=int, default=100,
+                        help="number of candidates for random/adaptive search")
+    parser.add_argument("--axes", nargs="+", default=["pid_x", "pid_y", "pid_z"],
+                        choices=AXIS_NAMES, help="PID entries to tune")
+    parser.add_argument("--config", help="base pid_config.json (default: config/pid_config.json)")
+    parser.add_argument("--cache", default="autotune_cache.json", help="evaluation cache file")
+    parser.add_argument("--output", default="tuned_pid_config.json",
+                        help="where to write the best configuration")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duration", type=float, default=DEFAULT_SCENARIO["duration_s"],
+                        help="simulated seconds per evaluation")
+    args = parser.parse_args()
+
+    base = load_pid_config(args.config)
+    scenario = dict(DEFAULT_SCENARIO, duration_s=args.duration)
+    rng = np.random.default_rng(args.seed)
+
+    tuner = Tuner(scenario, cache_path=args.cache, workers=args.workers)
+    try:
+        baseline_score = tuner.evaluate_all([base])[0][0]
+        print(f"Baseline score: {baseline_score:.4f}")
+
+        if args.strategy == "grid":
+            tuner.evaluate_all(grid_candidates(base, args.axes))
+        elif args.strategy == "random":
+            stream = random_candidates(base, args.axes, rng)
+            tuner.evaluate_all(itertools.islice(stream, args.budget))
+        else:
+            adaptive_search(tuner, base, args.axes, args.budget, rng)
+
+        print(f"\nEvaluated {len(tuner.results)} candidates. Best:")
+        for rank, (value, config, metrics) in enumerate(tuner.best(5), 1):
+            gains = ", ".join(
+                f"{axis}=({config[axis]['kp']:g}, {config[axis]['ki']:g}, {config[axis]['kd']:g})"
+                for axis in args.axes
+            )
+            print(f"{rank}. score {value:.4f}  {gains}")
+
+        best_score, best_config, best_metrics = tuner.best(1)[0]
+        with open(args.output, "w") as f:
+            json.dump(best_config, f, indent=2)
+        print(f"\nBest configuration (score {best_score:.4f} vs baseline {baseline_score:.4f}) "
+              f"written to {args.output}")
+        for axis, m in best_metrics.items():
+            print(f"  {axis}: rms {m['rms_error']:.3f} m, overshoot {m['overshoot'] * 100:.1f} %, "
+                  f"settling {m['settling_time']:.2f} s")
+    finally:
+        tuner.close()
+
+
+if __name__ == "__main__":
+    main()
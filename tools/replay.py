@@ -0,0 +1,240 @@
+"""
+Faster-than-real-time replay of recorded flights.
+
+Streams the raw telemetry columns of a full_pid log (CSV or binary) back
+as DroneState objects, pushes them through the real StateEstimator and PID
+stack (Controller.step) on the recorded timestamps, and emits the
+recomputed outputs next to the recorded ones. Nothing sleeps and the file
+is never loaded whole, so hours of flight replay in seconds:
+
+    python -m tools.replay logs/pid_flight.csv --config tuned_pid_config.json --output replay.csv
+
+Compressed and rotated logs are replayed through their segment index
+(logs/<run>_pid_flight.index.json).
+
+The estimator and PIDs only see the logged rows, so a log written with
+log_every_n > 1 replays at the decimated rate; log every frame when the
+recomputed values should match the flight exactly.
+"""
+
+import argparse
+import contextlib
+import csv
+import math
+
+from control.pid import create_pids
+from controller.controller import Controller
+from controller.estimators import build_estimator
+from drone.drone_state import DroneState
+from utils.binary_log import BinaryLogReader, iter_record_chunks
+from utils.clock import VirtualClock
+from utils.config_loader import load_estimator_config, load_pid_config
+from utils.logger import NullLogger
+from utils.log_profiles import get_profile
+from utils.log_segments import open_segment, read_index
+
+# Columns recomputed by the replay and compared against the log
+COMPARED_COLUMNS = (
+    "x", "y", "z", "vx", "vy", "vz", "yaw", "yaw_rate",
+    "pid_x", "pid_y", "pid_z", "pid_yaw",
+    "rc_lr", "rc_fb", "rc_ud", "rc_yaw",
+)
+
+_INT_COLUMNS = {
+    name for name, dtype in get_profile("full_pid").binary_fields() if dtype == "i4"
+}
+
+
+# ---------------------------------------------------------
+# Log streaming
+# ---------------------------------------------------------
+
+def iter_log_rows(path, chunk_rows=4096):
+    """
+    Yield each log row as a {column: value} dict, one row at a time.
+    path: .csv or .bin log, a compressed segment (.csv.gz, .bin.xz, ...)
+          or a segment index (.index.json), read segment by segment
+    """
+    path = str(path)
+    if path.endswith(".index.json"):
+        _, segments = read_index(path)
+        for segment in segments:
+            yield from iter_log_rows(str(segment), chunk_rows)
+        return
+
+    if path.endswith(".bin"):
+        reader = BinaryLogReader(path)
+        names = reader.names
+        for start in range(0, len(reader), chunk_rows):
+            for record in reader.records[start:start + chunk_rows].tolist():
+                yield dict(zip(names, record))
+        return
+
+    if path.endswith((".bin.gz", ".bin.xz")):
+        with open_segment(path) as f:
+            for chunk in iter_record_chunks(f, chunk_rows, path):
+                names = chunk.dtype.names
+                for record in chunk.tolist():
+                    yield dict(zip(names, record))
+        return
+
+    with open_segment(path, "rt", newline="") as f:
+        for row in csv.DictReader(f):
+            yield {
+                name: int(float(value)) if name in _INT_COLUMNS else float(value)
+                for name, value in row.items() if value not in ("", None)
+            }
+
+
+def row_to_state(row):
+    """Rebuild the DroneState the controller received from a full_pid row."""
+    return DroneState(
+        orientation=[row["pitch_raw"], row["roll_raw"], row["yaw_raw"]],
+        velocity=[row["vel_raw_x"], row["vel_raw_y"], row["vel_raw_z"]],
+        # Older logs named the barometer column barometer_m; it held cm too
+        elevation=[row["tof_cm"], row.get("barometer_cm", row.get("barometer_m")), row["height_cm"]],
+        acceleration=[row["agx"], row["agy"], row["agz"]],
+        battery=row["battery"],
+        timestamp=row["time"]
+    )
+
+
+def iter_states(path):
+    """Yield (row, DroneState) for every row of a full_pid log."""
+    for row in iter_log_rows(path):
+        yield row, row_to_state(row)
+
+
+# ---------------------------------------------------------
+# Replay
+# ---------------------------------------------------------
+
+def replay_log(path, pid_config=None, target_altitude=0.5, estimator_config=None):
+    """
+    Replay a log through a fresh estimator and PID stack.
+
+    path: full_pid log (.csv or .bin)
+    pid_config: parsed pid_config.json dict to replay with (the current
+                config/pid_config.json if None)
+    target_altitude: altitude setpoint for logs without setpoint columns
+    estimator_config: parsed estimator_config.json dict selecting the
+                      estimator backend (the current config if None)
+
+    Yields (recorded row dict, recomputed row dict) in full_pid columns.
+    """
+    clock = VirtualClock()
+    pids = create_pids(pid_config)
+    controller = Controller(None, target_altitude=target_altitude, clock=clock,
+                            logger=NullLogger(), pids=pids,
+                            estimator=build_estimator(estimator_config, clock=clock))
+    profile = get_profile("full_pid")
+    names = profile.names
+    extract = profile.extract
+
+    first = True
+    for row, state in iter_states(path):
+        timestamp = row["time"]
+        clock.set(timestamp)
+        if "wall_time" in row:
+            clock.wall_offset = row["wall_time"] - timestamp
+
+        if "sp_x" in row:
+            controller.setpoint["x"] = row["sp_x"]
+            controller.setpoint["y"] = row["sp_y"]
+            controller.setpoint["z"] = row["sp_z"]
+            controller.target_yaw = row["sp_yaw"]
+        elif first:
+            # Older logs: heading is locked to the first recorded yaw
+            controller.target_yaw = state.orientation[2]
+        first = False
+
+        ctx = controller.step(state, timestamp, row.get("loop_dt", 0.0))
+        yield row, dict(zip(names, extract(ctx)))
+
+
+class DiffStats:
+    """Streaming max / RMS of recomputed-minus-recorded per column."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.count = 0
+        self.sum_sq = dict.fromkeys(columns, 0.0)
+        self.max_abs = dict.fromkeys(columns, 0.0)
+
+    def update(self, recorded, recomputed):
+        self.count += 1
+        for name in self.columns:
+            diff = recomputed[name] - recorded[name]
+            self.sum_sq[name] += diff * diff
+            if abs(diff) > self.max_abs[name]:
+                self.max_abs[name] = abs(diff)
+
+    def summary(self):
+        return {
+            name: {
+                "max_abs_diff": self.max_abs[name],
+                "rms_diff": math.sqrt(self.sum_sq[name] / self.count) if self.count else 0.0,
+            }
+            for name in self.columns
+        }
+
+
+def run(path, output=None, pid_config=None, target_altitude=0.5, estimator_config=None):
+    """
+    Replay a whole log, optionally writing a side-by-side CSV
+    (time, <column>_rec, <column>_new, ...). Returns DiffStats.
+    """
+    recorded_columns = None
+    stats = None
+    writer = None
+
+    with contextlib.ExitStack() as stack:
+        if output:
+            out_file = stack.enter_context(open(output, "w", newline=""))
+            writer = csv.writer(out_file)
+
+        for recorded, recomputed in replay_log(path, pid_config, target_altitude, estimator_config):
+            if stats is None:
+                recorded_columns = [name for name in COMPARED_COLUMNS if name in recorded]
+                stats = DiffStats(recorded_columns)
+                if writer is not None:
+                    header = ["time"]
+                    for name in recorded_columns:
+                        header += [f"{name}_rec", f"{name}_new"]
+                    writer.writerow(header)
+
+            stats.update(recorded, recomputed)
+            if writer is not None:
+                out_row = [recorded["time"]]
+                for name in recorded_columns:
+                    out_row += [recorded[name], recomputed[name]]
+                writer.writerow(out_row)
+
+    return stats if stats is not None else DiffStats(())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a flight log through the estimator and PIDs")
+    parser.add_argument("log", help="full_pid log file (.csv, .bin, compressed segment or .index.json)")
+    parser.add_argument("--config", help="pid_config.json to replay with (default: config/pid_config.json)")
+    parser.add_argument("--estimator-config",
+                        help="estimator_config.json to replay with (default: config/estimator_config.json)")
+    parser.add_argument("--output", help="side-by-side CSV of recorded vs recomputed values")
+    parser.add_argument("--target-altitude", type=float, default=0.5,
+                        help="altitude setpoint for logs without sp_* columns")
+    args = parser.parse_args()
+
+    pid_config = load_pid_config(args.config) if args.config else None
+    estimator_config = load_estimator_config(args.estimator_config) if args.estimator_config else None
+    stats = run(args.log, args.output, pid_config, args.target_altitude, estimator_config)
+
+    print(f"Replayed {stats.count} rows from {args.log}")
+    print(f"{'column':<10} {'max |diff|':>12} {'rms diff':>12}")
+    for name, s in stats.summary().items():
+        print(f"{name:<10} {s['max_abs_diff']:>12.4f} {s['rms_diff']:>12.4f}")
+    if args.output:
+        print(f"Side-by-side values written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Console ground station for the live telemetry stream.
+
+Listens for TelemetryPublisher frames (utils.telemetry_stream) and prints
+the latest state of every flight sending to the address, one line per
+stream, a few times per second:
+
+    python main.py --sim --telemetry-port 9870
+    python -m tools.telemetry_viewer --port 9870
+
+Frames lost in transit are counted from sequence gaps per stream; the
+dropped column is the sender's own count of frames it could not send.
+"""
+
+import argparse
+import time
+
+from utils.telemetry_stream import DEFAULT_ADDRESS, TelemetryReceiver
+
+
+def format_stream(stream):
+    f = stream.last
+    return (
+        f"{f.name:<8} t={f.time:9.2f}  "
+        f"pos=({f.x:+6.2f}, {f.y:+6.2f}, {f.z:+6.2f})  "
+        f"err=({f.err_x:+6.2f}, {f.err_y:+6.2f}, {f.err_z:+6.2f}, {f.err_yaw:+6.1f})  "
+        f"rc=({f.rc_lr:+4.0f}, {f.rc_fb:+4.0f}, {f.rc_ud:+4.0f}, {f.rc_yaw:+4.0f})  "
+        f"dt={f.loop_dt * 1e3:5.1f} ms jitter={f.jitter * 1e3:5.2f} ms overruns={f.overruns}  "
+        f"frames={stream.received} lost={stream.lost} dropped={f.dropped}"
+    )
+
+
+def run(receiver, refresh=0.5, duration=None):
+    """Receive frames and print every stream's latest state each refresh seconds."""
+    start = time.monotonic()
+    next_print = start + refresh
+    while duration is None or time.monotonic() - start < duration:
+        receiver.receive(timeout=refresh)
+        now = time.monotonic()
+        if now >= next_print:
+            next_print = now + refresh
+            for stream in receiver.streams.values():
+                print(format_stream(stream))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live telemetry stream viewer")
+    parser.add_argument("--host", default=DEFAULT_ADDRESS[0], help="address to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_ADDRESS[1], help="UDP port to listen on")
+    parser.add_argument("--unix", help="listen on a Unix datagram socket path instead of UDP")
+    parser.add_argument("--refresh", type=float, default=0.5, help="seconds between status lines")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    args = parser.parse_args()
+
+    address = args.unix or (args.host, args.port)
+    receiver = TelemetryReceiver(address)
+    print(f"Listening for telemetry on {address}...")
+    try:
+        run(receiver, args.refresh, args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        receiver.close()
+        for stream in receiver.streams.values():
+            print(f"{stream.name}: {stream.received} frames, {stream.lost} lost")
+        if receiver.invalid:
+            print(f"{receiver.invalid} invalid datagrams ignored")
+
+
+if __name__ == "__main__":
+    main()
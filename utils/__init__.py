@@ -5,9 +5,13 @@ control and state‑estimation pipeline.
 
 This package exposes:
 - Filtering utilities (low‑pass, EMA, complementary filters)
-- Lightweight CSV logging tools
+- Lightweight CSV logging tools, a memory-mappable binary log format,
+  compressed rotating log segments and a full-rate in-memory flight
+  recorder
+- A non-blocking live telemetry stream and its receiver
 - Frame‑transform helpers for converting body-frame velocities
   into world-frame velocities
+- Clock sources (monotonic real-time and stepped virtual time)
 """
 
 # Re-export filtering utilities
@@ -16,19 +20,37 @@ from .filters import (
     exponential_moving_average,
     complementary_filter,
     smooth_derivative,
+    exponential_moving_average_array,
 )
 
-# Re-export logger class
+# Re-export logger class and binary log format
 from .logger import DataLogger
+from .binary_log import BinaryLogWriter, BinaryLogReader
+from .log_segments import SegmentedLogWriter
+from .flight_recorder import FlightRecorder
+from .telemetry_stream import TelemetryPublisher, TelemetryReceiver
 
 # Re-export transform utilities
-from .transforms import body_to_world_velocity
+from .transforms import body_to_world_velocity, body_to_world_velocity_batch
+
+# Re-export clock sources
+from .clock import MonotonicClock, VirtualClock
 
 __all__ = [
     "low_pass_filter",
     "exponential_moving_average",
     "complementary_filter",
     "smooth_derivative",
+    "exponential_moving_average_array",
     "DataLogger",
+    "BinaryLogWriter",
+    "BinaryLogReader",
+    "SegmentedLogWriter",
+    "FlightRecorder",
+    "TelemetryPublisher",
+    "TelemetryReceiver",
     "body_to_world_velocity",
+    "body_to_world_velocity_batch",
+    "MonotonicClock",
+    "VirtualClock",
 ]
\ No newline at end of file
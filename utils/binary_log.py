@@ -0,0 +1,168 @@
+"""
+Compact binary flight-log format.
+
+Layout:
+    magic      8 bytes   b"PIDLOG1\\n"
+    length     4 bytes   little-endian uint32, size of the JSON header
+    header     JSON      {"version": 1, "fields": [[name, dtype], ...]},
+                         space-padded so records start on an 8-byte boundary
+    records    packed fixed-width rows (float64 / int32 columns), appended
+               in blocks
+
+The writer fills a preallocated NumPy block and appends it with a single
+write, so no text formatting happens on the logging path. The reader
+memory-maps the file and exposes each column as a NumPy view without
+copying, so long multi-flight logs open instantly. A partially written
+trailing record (e.g. after a crash) is ignored.
+"""
+
+import json
+import struct
+
+import numpy as np
+
+MAGIC = b"PIDLOG1\n"
+VERSION = 1
+_LENGTH = struct.Struct("<I")
+
+
+def record_dtype(fields):
+    """fields: sequence of (name, dtype string) → packed little-endian dtype."""
+    return np.dtype([(name, np.dtype(dtype).newbyteorder("<")) for name, dtype in fields])
+
+
+def encode_header(fields):
+    """Magic, length and padded JSON header for `fields` as one bytes object."""
+    header = json.dumps({"version": VERSION, "fields": [list(f) for f in fields]}).encode("utf-8")
+    data_offset = len(MAGIC) + _LENGTH.size + len(header)
+    header += b" " * (-data_offset % 8)
+    return MAGIC + _LENGTH.pack(len(header)) + header
+
+
+def read_header(f, name="<stream>"):
+    """
+    Parse the header at the start of a binary file object.
+    Returns (fields, data_offset); f is left at the first record.
+    """
+    magic = f.read(len(MAGIC))
+    if magic != MAGIC:
+        raise ValueError(f"{name} is not a binary flight log")
+    (header_length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+    header = json.loads(f.read(header_length).decode("utf-8"))
+    if header.get("version") != VERSION:
+        raise ValueError(f"Unsupported binary log version: {header.get('version')}")
+    fields = [tuple(field) for field in header["fields"]]
+    return fields, len(MAGIC) + _LENGTH.size + header_length
+
+
+def iter_record_chunks(f, chunk_rows=4096, name="<stream>"):
+    """
+    Yield structured arrays of up to chunk_rows records from a binary log
+    file object read sequentially (e.g. gzip.open(path, "rb")), for logs
+    that cannot be memory-mapped. A partial trailing record is ignored.
+    """
+    fields, _ = read_header(f, name)
+    dtype = record_dtype(fields)
+    chunk_bytes = chunk_rows * dtype.itemsize
+    while True:
+        data = f.read(chunk_bytes)
+        rows = len(data) // dtype.itemsize
+        if rows:
+            yield np.frombuffer(data[:rows * dtype.itemsize], dtype=dtype)
+        if len(data) < chunk_bytes:
+            return
+
+
+class BinaryLogWriter:
+    """Append-only writer for the binary log format."""
+
+    def __init__(self, path, fields, block_rows=256, exclusive=False):
+        """
+        path: output file path
+        fields: sequence of (name, dtype) pairs, dtype being "f8" or "i4"
+        block_rows: rows buffered in memory before a block is written
+        exclusive: raise FileExistsError instead of overwriting an existing file
+        """
+        self.fields = [(name, np.dtype(dtype).str[1:]) for name, dtype in fields]
+        self.dtype = record_dtype(self.fields)
+        self.block = np.zeros(block_rows, dtype=self.dtype)
+        self.pending = 0
+        self.rows_written = 0
+
+        self.file = open(path, "xb" if exclusive else "wb")
+        self.file.write(encode_header(self.fields))
+
+    @property
+    def closed(self):
+        return self.file.closed
+
+    def writerow(self, row):
+        """Buffer one row (a tuple in field order); writes a block when full."""
+        self.block[self.pending] = row
+        self.pending += 1
+        if self.pending == len(self.block):
+            self._write_block()
+
+    def writerows(self, rows):
+        for row in rows:
+            self.writerow(row)
+
+    def write_records(self, records):
+        """Append a structured array of rows (dtype == self.dtype) in one write."""
+        self._write_block()
+        self.file.write(np.ascontiguousarray(records, dtype=self.dtype).tobytes())
+        self.rows_written += len(records)
+
+    def _write_block(self):
+        if self.pending:
+            self.file.write(self.block[:self.pending].tobytes())
+            self.rows_written += self.pending
+            self.pending = 0
+
+    def flush(self):
+        """Write any buffered rows and flush the file."""
+        self._write_block()
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+class BinaryLogReader:
+    """
+    Memory-mapped reader for the binary log format.
+
+        log = BinaryLogReader("logs/flight.bin")
+        z = log["z"]            # NumPy view, no copy
+        t = log["time"]
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.fields, data_offset = read_header(f, path)
+            f.seek(0, 2)
+            file_size = f.tell()
+
+        self.names = [name for name, _ in self.fields]
+        self.dtype = record_dtype(self.fields)
+
+        rows = (file_size - data_offset) // self.dtype.itemsize
+        if rows > 0:
+            self.records = np.memmap(path, dtype=self.dtype, mode="r",
+                                     offset=data_offset, shape=(rows,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, name):
+        """Return one column as a zero-copy NumPy view."""
+        return self.records[name]
+
+    def columns(self):
+        """Return {name: column view} for every field."""
+        return {name: self.records[name] for name in self.names}
@@ -0,0 +1,92 @@
+"""
+Clock sources shared by the controller, state estimator, PIDs and logger.
+
+The controller reads its clock once per tick and hands that timestamp to
+every component, so all stages of an iteration agree on the same time and
+dt. Two implementations are provided:
+- MonotonicClock: real-time monotonic clock for flight
+- VirtualClock: stepped clock for simulation and replay; sleep() advances
+  time instantly, so offline runs go as fast as the CPU allows
+
+Both carry wall_offset, the Unix time at which now() reads zero, so a tick
+timestamp maps to wall-clock time as timestamp + wall_offset (logged as the
+wall_time column).
+"""
+
+import asyncio
+import time
+
+
+class MonotonicClock:
+    """Real-time monotonic clock (seconds, arbitrary epoch)."""
+
+    def __init__(self):
+        # Bound directly so now() costs a single C call
+        self.now = time.perf_counter
+        # Sampled once: wall times stay as monotonic as the ticks
+        self.wall_offset = time.time() - time.perf_counter()
+
+    def sleep(self, seconds):
+        """Block for the given number of seconds."""
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def sleep_until(self, deadline, spin=0.0):
+        """
+        Block until the clock reaches deadline.
+        spin: busy-wait for the final `spin` seconds instead of sleeping,
+              trading CPU for lower wake-up jitter
+        """
+        now = self.now()
+        remaining = deadline - now
+        if remaining > spin:
+            time.sleep(remaining - spin)
+        while self.now() < deadline:
+            pass
+
+    async def sleep_until_async(self, deadline):
+        """Yield to the event loop until the clock reaches deadline."""
+        remaining = deadline - self.now()
+        await asyncio.sleep(remaining if remaining > 0 else 0)
+
+
+class VirtualClock:
+    """
+    Stepped clock for simulation and replay.
+    Time only moves when sleep() or advance() is called.
+    """
+
+    def __init__(self, start=0.0, wall_offset=None):
+        """
+        start: initial clock reading (seconds)
+        wall_offset: Unix time of a zero reading (maps `start` to the
+                     current wall-clock time if None)
+        """
+        self.time = float(start)
+        self.wall_offset = time.time() - self.time if wall_offset is None else wall_offset
+
+    def now(self):
+        return self.time
+
+    def sleep(self, seconds):
+        """Advance time instead of blocking."""
+        if seconds > 0:
+            self.time += seconds
+
+    def sleep_until(self, deadline, spin=0.0):
+        """Jump straight to deadline (spinning is meaningless in virtual time)."""
+        if deadline > self.time:
+            self.time = deadline
+
+    async def sleep_until_async(self, deadline):
+        """Jump to deadline, then let other tasks on the event loop run."""
+        self.sleep_until(deadline)
+        await asyncio.sleep(0)
+
+    def advance(self, seconds):
+        """Step the clock forward by the given number of seconds."""
+        self.time += seconds
+
+    def set(self, timestamp):
+        """Jump to an absolute timestamp (e.g. a recorded log time)."""
+        self.time = float(timestamp)
@@ -1,7 +1,53 @@
+import copy
 import json
+import os
 from pathlib import Path
 
-def load_pid_config():
-    config_path = Path("config/pid_config.json")
-    with open(config_path, "r") as f:
-        return json.load(f)
\ No newline at end of file
+# Repository config directory, independent of the current working directory
+CONFIG_DIR = Path(__file__).resolve().parent.parent / "config"
+DEFAULT_PID_CONFIG_PATH = CONFIG_DIR / "pid_config.json"
+DEFAULT_ESTIMATOR_CONFIG_PATH = CONFIG_DIR / "estimator_config.json"
+
+# Resolved path -> (mtime_ns, size, parsed config)
+_cache = {}
+
+
+def load_config(path):
+    """
+    Load a JSON config file, parsing it only once.
+    The parsed result is cached per resolved path and re-read only when the
+    file's modification time or size changes. Callers get their own copy,
+    so mutating it never affects the cache.
+    """
+    path = Path(path).resolve()
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    entry = _cache.get(path)
+    if entry is None or entry[0] != key:
+        with open(path, "r") as f:
+            entry = (key, json.load(f))
+        _cache[path] = entry
+    return copy.deepcopy(entry[1])
+
+
+def load_pid_config(path=None):
+    """
+    Load the PID tuning config.
+    path: config file to read (config/pid_config.json of this repository
+          if None, regardless of the working directory)
+    """
+    return load_config(DEFAULT_PID_CONFIG_PATH if path is None else path)
+
+
+def load_estimator_config(path=None):
+    """
+    Load the state estimator config (backend selection and parameters).
+    path: config file to read (config/estimator_config.json if None)
+    """
+    return load_config(DEFAULT_ESTIMATOR_CONFIG_PATH if path is None else path)
+
+
+def clear_config_cache():
+    """Drop every cached config so the next load re-reads from disk."""
+    _cache.clear()
@@ -4,6 +4,10 @@ These functions are drone-agnostic and can be used across
 state estimation, PID control, and data logging.
 """
 
+import math
+
+import numpy as np
+
 def low_pass_filter(previous_value, new_value, alpha):
     """
     Basic low-pass filter.
@@ -38,4 +42,40 @@ def smooth_derivative(previous_derivative, raw_derivative, alpha):
     Useful for PID derivative terms to reduce noise spikes.
     alpha: smoothing factor in [0, 1]
     """
-    return alpha * raw_derivative + (1 - alpha) * previous_derivative
\ No newline at end of file
+    return alpha * raw_derivative + (1 - alpha) * previous_derivative
+
+
+def exponential_moving_average_array(values, alpha, initial):
+    """
+    Run exponential_moving_average over a whole array at once:
+        y[i] = alpha * values[i] + (1 - alpha) * y[i - 1],  y[-1] = initial
+    Returns (y, last value).
+
+    The recursion is evaluated in closed form with cumulative sums over
+    blocks short enough that the (1 - alpha)^-k scaling cannot overflow;
+    results match the scalar recursion to within floating-point rounding.
+    """
+    values = np.asarray(values, dtype=float)
+    out = np.empty_like(values)
+    decay = 1.0 - alpha
+    if len(values) == 0:
+        return out, initial
+    if decay == 0.0:
+        out[:] = values
+        return out, float(out[-1])
+    if decay == 1.0:
+        out[:] = initial
+        return out, initial
+
+    # Keep decay^-block below ~1e100
+    block = max(1, int(100.0 / -math.log10(abs(decay))))
+    powers = decay ** np.arange(1, block + 1)
+
+    carry = initial
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        p = powers[:len(chunk)]
+        # y[k] = decay^(k+1) * (carry + alpha * sum_{j<=k} x[j] / decay^(j+1))
+        out[start:start + len(chunk)] = p * (carry + alpha * np.cumsum(chunk / p))
+        carry = out[start + len(chunk) - 1]
+    return out, float(carry)
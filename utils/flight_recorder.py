@@ -0,0 +1,98 @@
+"""
+In-memory flight recorder ("black box").
+
+Keeps the last `capacity` control ticks at full loop rate in a
+preallocated NumPy structured array used as a ring buffer, so the moments
+before an incident survive at full resolution even when the disk log is
+decimated. Recording a tick is one compiled row extraction (see
+utils.log_profiles) and one row assignment; nothing touches the disk until
+dump(), which writes the buffered ticks oldest first in the binary log
+format, readable with BinaryLogReader and tools.replay.
+"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+
+from utils.binary_log import BinaryLogWriter, record_dtype
+from utils.log_profiles import get_profile
+
+
+class FlightRecorder:
+    """Fixed-size ring of full-rate LogContext rows, dumped on demand."""
+
+    def __init__(self, capacity=1500, directory="logs", filename="flight_recorder.bin",
+                 mode="flight_recorder"):
+        """
+        capacity: ticks kept (1500 = the last 60 s at 25 Hz)
+        directory: where dumps are written
+        filename: dump file name, prefixed with a millisecond timestamp, a
+                  per-recorder dump number and the dump reason
+        mode: log profile defining the recorded columns ("flight_recorder"
+              adds the P/I/D split of every PID to the full_pid columns)
+        """
+        if capacity < 1:
+            raise ValueError("FlightRecorder capacity must be at least 1")
+        self.profile = get_profile(mode)
+        self.fields = self.profile.binary_fields()
+        self._extract = self.profile.extract
+        self.capacity = int(capacity)
+        self.records = np.zeros(self.capacity, dtype=record_dtype(self.fields))
+        self.count = 0           # ticks recorded in total
+        self._dumped_count = 0   # count at the latest dump
+
+        self.directory = Path(directory)
+        self.filename = filename
+        self.dumps = []          # paths written so far
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def record(self, context):
+        """Store one tick, overwriting the oldest once the buffer is full."""
+        self.records[self.count % self.capacity] = self._extract(context)
+        self.count += 1
+
+    def snapshot(self):
+        """Return the buffered ticks oldest first, as a new structured array."""
+        if self.count <= self.capacity:
+            return self.records[:self.count].copy()
+        start = self.count % self.capacity
+        return np.concatenate((self.records[start:], self.records[:start]))
+
+    def clear(self):
+        self.count = 0
+        self._dumped_count = 0
+
+    def dump(self, reason="manual", path=None):
+        """
+        Write the buffered ticks to a binary log and return its path.
+        Returns None if nothing was recorded since the previous dump, so
+        overlapping triggers (crash, then landing) write a single file.
+        Never overwrites: an existing path raises FileExistsError.
+
+        Not synchronized with record(): call it from the thread that
+        records (Controller services requests from other threads between
+        ticks, see Controller.request_flight_dump).
+        """
+        if self.count == self._dumped_count:
+            return None
+        if path is None:
+            self.directory.mkdir(exist_ok=True)
+            now = time.time()
+            timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now))
+            millis = int(now % 1.0 * 1000)
+            path = self.directory / (
+                f"{timestamp}_{millis:03d}_{len(self.dumps):03d}_{reason}_{self.filename}"
+            )
+
+        writer = BinaryLogWriter(path, self.fields, exclusive=True)
+        try:
+            writer.write_records(self.snapshot())
+        finally:
+            writer.close()
+
+        self._dumped_count = self.count
+        self.dumps.append(path)
+        return path
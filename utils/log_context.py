@@ -1,26 +1,87 @@
-from dataclasses import dataclass
 from controller.state_estimator import EstimatedState
 from drone.drone_state import DroneState
 
-@dataclass
-class PIDOutputs:
-    lr: float
-    fb: float
-    ud: float
-    yaw: float
-
-@dataclass
-class RCOutputs:
-    lr: float
-    fb: float
-    ud: float
-    yaw: float
-
-@dataclass
+
+class _Command:
+    """Slotted (lr, fb, ud, yaw) command record, updated in place per tick."""
+
+    __slots__ = ("lr", "fb", "ud", "yaw")
+
+    def __init__(self, lr=0.0, fb=0.0, ud=0.0, yaw=0.0):
+        self.lr = lr
+        self.fb = fb
+        self.ud = ud
+        self.yaw = yaw
+
+    def set(self, lr, fb, ud, yaw):
+        self.lr = lr
+        self.fb = fb
+        self.ud = ud
+        self.yaw = yaw
+
+    def copy(self):
+        return type(self)(self.lr, self.fb, self.ud, self.yaw)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return (self.lr, self.fb, self.ud, self.yaw) == (other.lr, other.fb, other.ud, other.yaw)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(lr={self.lr!r}, fb={self.fb!r}, ud={self.ud!r}, yaw={self.yaw!r})"
+
+
+class PIDOutputs(_Command):
+    __slots__ = ()
+
+
+class RCOutputs(_Command):
+    __slots__ = ()
+
+
 class LogContext:
-    timestamp: float
-    loop_dt: float
-    est: EstimatedState
-    raw: DroneState
-    pid: PIDOutputs
-    rc: RCOutputs
\ No newline at end of file
+    """
+    Everything known about one control tick, handed to loggers.
+
+    The controller preallocates one LogContext (and the state objects it
+    references) and refills it every tick, so a context is only valid
+    during the log_frame() call that receives it. Loggers that extract
+    values immediately (DataLogger) need nothing else; consumers that keep
+    a context must retain context.copy() instead.
+    """
+
+    __slots__ = ("timestamp", "loop_dt", "est", "raw", "pid", "rc", "setpoint", "stages", "terms",
+                 "wall_time")
+
+    def __init__(self, timestamp, loop_dt, est: EstimatedState, raw: DroneState,
+                 pid: PIDOutputs, rc: RCOutputs, setpoint=None, stages=None, terms=None,
+                 wall_time=0.0):
+        self.timestamp = timestamp
+        self.loop_dt = loop_dt
+        self.est = est
+        self.raw = raw
+        self.pid = pid
+        self.rc = rc
+        self.setpoint = setpoint  # [x, y, z, yaw] targets of the tick
+        self.stages = stages      # per-stage latencies in µs (StageTimer.last), if enabled
+        self.terms = terms        # [p, i, d] of the x, y, z, yaw PIDs, if recorded
+        self.wall_time = wall_time  # Unix time of the tick (timestamp + clock.wall_offset)
+
+    def copy(self):
+        """Deep snapshot safe to retain after the tick."""
+        return LogContext(
+            self.timestamp,
+            self.loop_dt,
+            self.est.copy(),
+            self.raw.copy(),
+            self.pid.copy(),
+            self.rc.copy(),
+            None if self.setpoint is None else list(self.setpoint),
+            None if self.stages is None else list(self.stages),
+            None if self.terms is None else list(self.terms),
+            self.wall_time
+        )
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"LogContext({fields})"
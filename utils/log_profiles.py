@@ -1,60 +1,167 @@
-FULL_PID_PROFILE = {
-    "time": lambda c: c.timestamp,
-    "loop_dt": lambda c: c.loop_dt,
+"""
+Declarative logging profiles.
+
+A profile is a list of (column, field path[, dtype]) entries, where the
+field path is read from a LogContext, e.g. "est.position[0]". Each profile
+is compiled once into a single generated function that returns the whole
+row as a tuple, so logging a frame is one call with no per-field lambdas or
+intermediate dicts.
+
+dtype is only used by the binary log format: "f8" (default) or "i4" for
+fields the Tello reports as integers.
+
+Custom profiles are added with register_profile() and selected through
+DataLogger(mode=<name>).
+"""
+
+import re
+
+_PATH_RE = re.compile(r"[A-Za-z_]\w*(?:\.[A-Za-z_]\w*|\[\d+\])*")
+
+FULL_PID_FIELDS = [
+    ("time", "timestamp"),
+    ("loop_dt", "loop_dt"),
 
     # Estimated state
-    "x": lambda c: c.est.position[0],
-    "y": lambda c: c.est.position[1],
-    "z": lambda c: c.est.position[2],
-    "vx": lambda c: c.est.velocity[0],
-    "vy": lambda c: c.est.velocity[1],
-    "vz": lambda c: c.est.velocity[2],
-    "pitch": lambda c: c.est.attitude[0],
-    "roll": lambda c: c.est.attitude[1],
-    "yaw": lambda c: c.est.attitude[2],
-    "yaw_rate": lambda c: c.est.angular_velocity[2],
+    ("x", "est.position[0]"),
+    ("y", "est.position[1]"),
+    ("z", "est.position[2]"),
+    ("vx", "est.velocity[0]"),
+    ("vy", "est.velocity[1]"),
+    ("vz", "est.velocity[2]"),
+    ("pitch", "est.attitude[0]"),
+    ("roll", "est.attitude[1]"),
+    ("yaw", "est.attitude[2]"),
+    ("yaw_rate", "est.angular_velocity[2]"),
 
     # PID outputs
-    "pid_x": lambda c: c.pid.lr,
-    "pid_y": lambda c: c.pid.fb,
-    "pid_z": lambda c: c.pid.ud,
-    "pid_yaw": lambda c: c.pid.yaw,
+    ("pid_x", "pid.lr"),
+    ("pid_y", "pid.fb"),
+    ("pid_z", "pid.ud"),
+    ("pid_yaw", "pid.yaw"),
 
     # RC outputs
-    "rc_lr": lambda c: c.rc.lr,
-    "rc_fb": lambda c: c.rc.fb,
-    "rc_ud": lambda c: c.rc.ud,
-    "rc_yaw": lambda c: c.rc.yaw,
+    ("rc_lr", "rc.lr"),
+    ("rc_fb", "rc.fb"),
+    ("rc_ud", "rc.ud"),
+    ("rc_yaw", "rc.yaw"),
 
     # Raw state
-    "tof_cm": lambda c: c.raw.elevation[0],
-    "barometer_m": lambda c: c.raw.elevation[1],
-    "height_cm": lambda c: c.raw.elevation[2],
-    "agx": lambda c: c.raw.acceleration[0],
-    "agy": lambda c: c.raw.acceleration[1],
-    "agz": lambda c: c.raw.acceleration[2],
-    "vel_raw_x": lambda c: c.raw.velocity[0],
-    "vel_raw_y": lambda c: c.raw.velocity[1],
-    "vel_raw_z": lambda c: c.raw.velocity[2],
-    "pitch_raw": lambda c: c.raw.orientation[0],
-    "roll_raw": lambda c: c.raw.orientation[1],
-    "yaw_raw": lambda c: c.raw.orientation[2],
-    "battery": lambda c: c.raw.battery,
-}
-
-SUPERVISORY_PROFILE = {
-    "time": lambda c: c.timestamp,
-    "loop_dt": lambda c: c.loop_dt,
-    "x": lambda c: c.est.position[0],
-    "y": lambda c: c.est.position[1],
-    "z": lambda c: c.est.position[2],
-    "vx": lambda c: c.est.velocity[0],
-    "vy": lambda c: c.est.velocity[1],
-    "vz": lambda c: c.est.velocity[2],
-    "yaw": lambda c: c.est.attitude[2],
-    "rc_lr": lambda c: c.rc.lr,
-    "rc_fb": lambda c: c.rc.fb,
-    "rc_ud": lambda c: c.rc.ud,
-    "rc_yaw": lambda c: c.rc.yaw,
-    "battery": lambda c: c.raw.battery,
-}
\ No newline at end of file
+    ("tof_cm", "raw.elevation[0]", "i4"),
+    ("barometer_cm", "raw.elevation[1]"),
+    ("height_cm", "raw.elevation[2]", "i4"),
+    ("agx", "raw.acceleration[0]"),
+    ("agy", "raw.acceleration[1]"),
+    ("agz", "raw.acceleration[2]"),
+    ("vel_raw_x", "raw.velocity[0]", "i4"),
+    ("vel_raw_y", "raw.velocity[1]", "i4"),
+    ("vel_raw_z", "raw.velocity[2]", "i4"),
+    ("pitch_raw", "raw.orientation[0]", "i4"),
+    ("roll_raw", "raw.orientation[1]", "i4"),
+    ("yaw_raw", "raw.orientation[2]", "i4"),
+    ("battery", "raw.battery", "i4"),
+
+    # Setpoints (appended after the original columns, so older readers
+    # indexing columns by position still line up)
+    ("sp_x", "setpoint[0]"),
+    ("sp_y", "setpoint[1]"),
+    ("sp_z", "setpoint[2]"),
+    ("sp_yaw", "setpoint[3]"),
+
+    # Unix time of the tick, to line logs up with other recordings
+    ("wall_time", "wall_time"),
+]
+
+SUPERVISORY_FIELDS = [
+    ("time", "timestamp"),
+    ("loop_dt", "loop_dt"),
+    ("x", "est.position[0]"),
+    ("y", "est.position[1]"),
+    ("z", "est.position[2]"),
+    ("vx", "est.velocity[0]"),
+    ("vy", "est.velocity[1]"),
+    ("vz", "est.velocity[2]"),
+    ("yaw", "est.attitude[2]"),
+    ("rc_lr", "rc.lr"),
+    ("rc_fb", "rc.fb"),
+    ("rc_ud", "rc.ud"),
+    ("rc_yaw", "rc.yaw"),
+    ("battery", "raw.battery", "i4"),
+    ("wall_time", "wall_time"),
+]
+
+# Per-stage control-loop latencies (µs), see controller.instrumentation.
+# The log and send_rc columns refer to the previous tick, since a row is
+# built before those stages run.
+STAGE_TIMING_FIELDS = [
+    ("t_get_state_us", "stages[0]"),
+    ("t_estimate_us", "stages[1]"),
+    ("t_pid_us", "stages[2]"),
+    ("t_log_us", "stages[3]"),
+    ("t_send_rc_us", "stages[4]"),
+]
+
+# P/I/D split of each axis PID (LogContext.terms), recorded by the
+# flight recorder. Terms are before output clamping and exclude damping.
+PID_TERM_FIELDS = [
+    (f"{term}_{axis}", f"terms[{3 * index + offset}]")
+    for index, axis in enumerate(("x", "y", "z", "yaw"))
+    for offset, term in enumerate(("p", "i", "d"))
+]
+
+
+def compile_extractor(paths):
+    """
+    Generate one function returning a tuple of every field path, e.g.
+    ["timestamp", "est.position[0]"] → lambda c: (c.timestamp, c.est.position[0]).
+    """
+    for path in paths:
+        if not _PATH_RE.fullmatch(path):
+            raise ValueError(f"Invalid log field path: {path!r}")
+    body = ", ".join(f"c.{path}" for path in paths)
+    source = f"def extract(c):\n    return ({body},)\n"
+    namespace = {}
+    exec(compile(source, "<log_profile>", "exec"), {"__builtins__": {}}, namespace)
+    return namespace["extract"]
+
+
+class LogProfile:
+    """A named, compiled logging profile."""
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = [tuple(field) for field in fields]
+        self.names = [field[0] for field in self.fields]
+        self.paths = [field[1] for field in self.fields]
+        self.dtypes = [field[2] if len(field) > 2 else "f8" for field in self.fields]
+        if len(set(self.names)) != len(self.names):
+            raise ValueError(f"Duplicate column names in log profile {name!r}")
+        self.extract = compile_extractor(self.paths)
+
+    def binary_fields(self):
+        """Return [(name, dtype)] column descriptions for the binary format."""
+        return list(zip(self.names, self.dtypes))
+
+
+_PROFILES = {}
+
+
+def register_profile(name, fields):
+    """Compile and register a profile so DataLogger(mode=name) can use it."""
+    profile = LogProfile(name, fields)
+    _PROFILES[name] = profile
+    return profile
+
+
+def get_profile(name):
+    """Look up a registered profile by name."""
+    try:
+        return _PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown logging mode: {name}") from None
+
+
+FULL_PID_PROFILE = register_profile("full_pid", FULL_PID_FIELDS)
+SUPERVISORY_PROFILE = register_profile("supervisory", SUPERVISORY_FIELDS)
+FULL_PID_TIMING_PROFILE = register_profile("full_pid_timing", FULL_PID_FIELDS + STAGE_TIMING_FIELDS)
+FLIGHT_RECORDER_PROFILE = register_profile("flight_recorder", FULL_PID_FIELDS + PID_TERM_FIELDS)
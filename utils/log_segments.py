@@ -0,0 +1,250 @@
+"""
+Compressed, rotating log output.
+
+SegmentedLogWriter takes rows from DataLogger's writer thread, encodes
+them (CSV text or binary records), and appends them in blocks. Each block
+is compressed as an independent gzip member or xz stream, so concatenated
+blocks form a valid .gz / .xz file. A crash loses at most the block being
+filled, and `zcat` / gzip.open() / lzma.open() read everything written
+before it.
+
+Logs are split into numbered segments once a segment reaches
+rotate_bytes on disk or has been open for rotate_seconds. Every segment
+starts with its own header (CSV column row or binary log header), so each
+one is a standalone log. A JSON index next to the segments lists them with
+row counts, time range and sizes. It is rewritten atomically after every
+block, so it stays readable while the logger runs and after a crash:
+
+    logs/20250101_120000_pid_flight.index.json
+    logs/20250101_120000_pid_flight.000.csv.gz
+    logs/20250101_120000_pid_flight.001.csv.gz
+"""
+
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from utils.binary_log import encode_header, record_dtype
+
+COMPRESSIONS = {
+    None: ("", lambda data: data),
+    "gzip": (".gz", gzip.compress),
+    "lzma": (".xz", lambda data: lzma.compress(data, format=lzma.FORMAT_XZ)),
+}
+
+INDEX_VERSION = 1
+
+
+class SegmentedLogWriter:
+    """
+    Block-compressing, rotating row sink with the writerows()/flush()/
+    close() interface DataLogger uses for its writers. Not thread-safe:
+    all calls must come from one (writer) thread.
+    """
+
+    def __init__(self, base_path, profile, log_format="csv", compression="gzip",
+                 block_size=64 * 1024, block_interval=5.0, rotate_bytes=None,
+                 rotate_seconds=None):
+        """
+        base_path: path prefix; segments are <base_path>.<NNN>.<csv|bin>[.gz|.xz]
+                   and the index is <base_path>.index.json
+        profile: LogProfile giving the columns (and binary dtypes)
+        log_format: "csv" or "binary"
+        compression: "gzip", "lzma" or None (plain segments)
+        block_size: uncompressed bytes collected before a block is written
+        block_interval: seconds after which a partial block is written anyway
+                        (bounds the data lost in a crash at low log rates)
+        rotate_bytes: start a new segment once a segment reaches this many
+                      bytes on disk (no size limit if None)
+        rotate_seconds: start a new segment after this many seconds (no
+                        time limit if None)
+        """
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        if log_format not in ("csv", "binary"):
+            raise ValueError(f"Unknown log format: {log_format}")
+
+        self.base_path = Path(base_path)
+        self.index_path = self.base_path.with_name(self.base_path.name + ".index.json")
+        self.log_format = log_format
+        self.compression = compression
+        suffix, self._compress = COMPRESSIONS[compression]
+        self.suffix = (".csv" if log_format == "csv" else ".bin") + suffix
+        self.block_size = block_size
+        self.block_interval = block_interval
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+
+        self.names = profile.names
+        self._time_column = self.names.index("time") if "time" in self.names else None
+        if log_format == "csv":
+            self._text = io.StringIO()
+            self._csv = csv.writer(self._text)
+            self._csv.writerow(self.names)
+            self._header = self._take_text()
+        else:
+            fields = profile.binary_fields()
+            self._dtype = record_dtype(fields)
+            self._header = encode_header(fields)
+
+        self.segments = []       # index entries, one per segment
+        self._file = None
+        self._block = bytearray()
+        self._block_rows = 0
+        self._block_first_time = None
+        self._block_last_time = None
+        self._block_started = None
+        self.closed = False
+        self._open_segment()
+
+    # ---------------------------------------------------------
+    # Row encoding
+    # ---------------------------------------------------------
+
+    def _take_text(self):
+        data = self._text.getvalue().encode("utf-8")
+        self._text.seek(0)
+        self._text.truncate()
+        return data
+
+    def writerows(self, rows):
+        """Encode rows into the current block; writes it once it is full."""
+        if not rows:
+            return
+        if self.log_format == "csv":
+            self._csv.writerows(rows)
+            self._block += self._take_text()
+        else:
+            self._block += np.array(rows, dtype=self._dtype).tobytes()
+
+        if self._block_rows == 0:
+            self._block_started = time.monotonic()
+            if self._time_column is not None:
+                self._block_first_time = rows[0][self._time_column]
+        if self._time_column is not None:
+            self._block_last_time = rows[-1][self._time_column]
+        self._block_rows += len(rows)
+
+        if len(self._block) >= self.block_size:
+            self._write_block()
+
+    def writerow(self, row):
+        self.writerows([row])
+
+    def flush(self):
+        """Write the current block if block_interval has passed since it started."""
+        if self._block_rows and time.monotonic() - self._block_started >= self.block_interval:
+            self._write_block()
+
+    # ---------------------------------------------------------
+    # Blocks and segments
+    # ---------------------------------------------------------
+
+    def _open_segment(self):
+        number = len(self.segments)
+        path = self.base_path.with_name(f"{self.base_path.name}.{number:03d}{self.suffix}")
+        self._file = open(path, "wb")
+        self._opened = time.monotonic()
+        self.segments.append({
+            "file": path.name,
+            "rows": 0,
+            "first_time": None,
+            "last_time": None,
+            "raw_bytes": 0,
+            "bytes": 0,
+            "blocks": 0,
+            "complete": False,
+        })
+        # The header travels in the segment's first block
+        self._block[:0] = self._header
+
+    def _write_block(self):
+        data = self._compress(bytes(self._block))
+        self._file.write(data)
+        self._file.flush()
+
+        segment = self.segments[-1]
+        segment["rows"] += self._block_rows
+        segment["raw_bytes"] += len(self._block)
+        segment["bytes"] += len(data)
+        segment["blocks"] += 1
+        if segment["first_time"] is None:
+            segment["first_time"] = self._block_first_time
+        if self._block_last_time is not None:
+            segment["last_time"] = self._block_last_time
+
+        self._block.clear()
+        self._block_rows = 0
+        self._block_first_time = None
+
+        if (
+            (self.rotate_bytes is not None and segment["bytes"] >= self.rotate_bytes)
+            or (self.rotate_seconds is not None
+                and time.monotonic() - self._opened >= self.rotate_seconds)
+        ):
+            self._close_segment()
+            self._open_segment()
+        self._write_index()
+
+    def _close_segment(self):
+        self._file.close()
+        self.segments[-1]["complete"] = True
+
+    def _write_index(self):
+        index = {
+            "version": INDEX_VERSION,
+            "format": self.log_format,
+            "compression": self.compression,
+            "columns": self.names,
+            "segments": self.segments,
+        }
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def close(self):
+        """Write the last block, close the segment and finalize the index."""
+        if self.closed:
+            return
+        if self._block_rows:
+            self._write_block()
+        if self.segments[-1]["rows"] == 0 and len(self.segments) > 1:
+            # Drop the empty segment opened by the last rotation
+            self._file.close()
+            os.unlink(self.base_path.with_name(self.segments.pop()["file"]))
+        else:
+            if self.segments[-1]["blocks"] == 0:
+                self._file.write(self._compress(bytes(self._block)))   # header only
+            self._close_segment()
+        self.segments[-1]["complete"] = True
+        self._write_index()
+        self.closed = True
+
+
+def read_index(index_path):
+    """Load a segment index; returns (index dict, [segment paths in order])."""
+    index_path = Path(index_path)
+    with open(index_path) as f:
+        index = json.load(f)
+    return index, [index_path.with_name(segment["file"]) for segment in index["segments"]]
+
+
+def open_segment(path, mode="rb", **kwargs):
+    """
+    Open one segment for reading, decompressing by file suffix.
+    kwargs go to the open function (e.g. newline="" for text mode).
+    """
+    path = str(path)
+    if path.endswith(".gz"):
+        return gzip.open(path, mode, **kwargs)
+    if path.endswith(".xz"):
+        return lzma.open(path, mode, **kwargs)
+    return open(path, mode, **kwargs)
@@ -1,36 +1,95 @@
 import csv
+import threading
 import time
 from pathlib import Path
-from utils.log_profiles import FULL_PID_PROFILE, SUPERVISORY_PROFILE
+from utils.binary_log import BinaryLogWriter
+from utils.log_segments import SegmentedLogWriter
+from utils.log_profiles import get_profile
+from utils.ring_buffer import RingBuffer
 
 class DataLogger:
-    def __init__(self, filename="flight_log.csv", directory="logs", mode="full_pid", log_every_n=1):
+    def __init__(self, filename="flight_log.csv", directory="logs", mode="full_pid", log_every_n=1,
+                 async_mode=False, buffer_size=4096, flush_interval=0.1, log_format="csv",
+                 compression=None, rotate_bytes=None, rotate_seconds=None,
+                 block_size=64 * 1024, block_interval=5.0):
         """
+        mode: name of a profile registered in utils.log_profiles
+              ("full_pid", "supervisory" or a custom register_profile() name)
         log_every_n: write one row every N frames (e.g., N=5 logs at ~5 Hz if loop is 25 Hz)
+        async_mode: hand rows to a background writer thread instead of writing
+                    them from the control loop
+        buffer_size: rows held between writer-thread flushes (async mode);
+                     when full, the oldest row is dropped and counted
+        flush_interval: seconds between writer-thread batch flushes (async mode)
+        log_format: "csv" for text logs, "binary" for the memory-mappable
+                    columnar format in utils.binary_log (".bin" suffix)
+        compression: "gzip" or "lzma" to write block-compressed segments
+                     (see utils.log_segments); a crash loses at most one block
+        rotate_bytes / rotate_seconds: start a new segment once the current
+                     one reaches this size on disk / age
+        block_size / block_interval: uncompressed bytes per compressed block,
+                     and the longest a partial block is held back (seconds)
+        Compression and rotation always use the writer thread, so neither
+        adds latency to log_frame(). self.filepath is then the segment index.
         """
         self.log_dir = Path(directory)
         self.log_dir.mkdir(exist_ok=True)
 
+        if log_format not in ("csv", "binary"):
+            raise ValueError(f"Unknown log format: {log_format}")
+        if log_format == "binary":
+            filename = str(Path(filename).with_suffix(".bin"))
+
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         self.filepath = self.log_dir / f"{timestamp}_{filename}"
 
-        self.file = open(self.filepath, "w", newline="")
+        # Select profile (compiled once into a single row extractor)
+        self.profile = get_profile(mode)
+        self._extract = self.profile.extract
 
-        # Select profile
-        if mode == "full_pid":
-            self.fields = FULL_PID_PROFILE
-        elif mode == "supervisory":
-            self.fields = SUPERVISORY_PROFILE
-        else:
-            raise ValueError(f"Unknown logging mode: {mode}")
+        segmented = compression is not None or rotate_bytes is not None or rotate_seconds is not None
+        if segmented:
+            async_mode = True
 
         # Logging frequency
         self.log_every_n = max(1, int(log_every_n))
         self.frame_counter = 0
 
         # Write header immediately
-        self.writer = csv.DictWriter(self.file, fieldnames=list(self.fields.keys()))
-        self.writer.writeheader()
+        self.log_format = log_format
+        if segmented:
+            self.file = SegmentedLogWriter(
+                self.filepath.with_suffix(""), self.profile, log_format=log_format,
+                compression=compression, block_size=block_size, block_interval=block_interval,
+                rotate_bytes=rotate_bytes, rotate_seconds=rotate_seconds
+            )
+            self.writer = self.file
+            self.filepath = self.file.index_path
+        elif log_format == "binary":
+            self.file = BinaryLogWriter(self.filepath, self.profile.binary_fields())
+            self.writer = self.file
+        else:
+            self.file = open(self.filepath, "w", newline="")
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(self.profile.names)
+
+        # Asynchronous mode: the loop only pushes rows into a ring buffer
+        self.async_mode = async_mode
+        self.buffer = None
+        self._writer_thread = None
+        if async_mode:
+            self.flush_interval = flush_interval
+            self.buffer = RingBuffer(buffer_size)
+            self._stop_event = threading.Event()
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop, name="DataLoggerWriter", daemon=True
+            )
+            self._writer_thread.start()
+
+    @property
+    def dropped_frames(self):
+        """Rows discarded because the async buffer overflowed."""
+        return self.buffer.dropped if self.buffer is not None else 0
 
     def log_frame(self, context):
         """
@@ -44,11 +103,53 @@ class DataLogger:
             return
 
         try:
-            row = {name: extractor(context) for name, extractor in self.fields.items()}
+            row = self._extract(context)
+        except Exception as e:
+            print(f"[LOG ERROR] Failed to build row: {e}")
+            return
+
+        if self.buffer is not None:
+            self.buffer.push(row)
+            return
+
+        try:
             self.writer.writerow(row)
         except Exception as e:
             print(f"[LOG ERROR] Failed to write row: {e}")
 
+    def _writer_loop(self):
+        """Background thread: drain the ring buffer in batches."""
+        while not self._stop_event.wait(self.flush_interval):
+            self._flush_buffer()
+
+    def _flush_buffer(self):
+        batch = self.buffer.drain()
+        if not batch:
+            return
+        try:
+            self.writer.writerows(batch)
+            self.file.flush()
+        except Exception as e:
+            print(f"[LOG ERROR] Failed to write {len(batch)} rows: {e}")
+
+    def close(self):
+        if self.file.closed:
+            return
+        if self._writer_thread is not None:
+            # Stop the writer, then flush whatever it had not picked up yet
+            self._stop_event.set()
+            self._writer_thread.join()
+            self._flush_buffer()
+            if self.buffer.dropped:
+                print(f"[LOG WARNING] Dropped {self.buffer.dropped} rows (buffer overflow)")
+        self.file.close()
+
+
+class NullLogger:
+    """Logger that discards every frame (simulation, benchmarks, tuning)."""
+
+    def log_frame(self, context):
+        pass
+
     def close(self):
-        if not self.file.closed:
-            self.file.close()
\ No newline at end of file
+        pass
@@ -0,0 +1,52 @@
+"""
+Fixed-capacity ring buffer used to hand records from the control loop to
+background writer threads.
+
+Slots are preallocated once; push() and drain() only hold a lock for a few
+index updates, so the producer never waits on I/O. When the buffer is full
+the oldest record is overwritten and counted in `dropped`.
+"""
+
+import threading
+
+
+class RingBuffer:
+    """Single-producer / single-consumer FIFO with drop-oldest overflow."""
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("RingBuffer capacity must be at least 1")
+        self.capacity = int(capacity)
+        self._slots = [None] * self.capacity
+        self._head = 0      # total records pushed
+        self._tail = 0      # total records consumed or dropped
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._head - self._tail
+
+    def push(self, record):
+        """Append a record, overwriting the oldest one if the buffer is full."""
+        with self._lock:
+            if self._head - self._tail >= self.capacity:
+                self._tail += 1
+                self.dropped += 1
+            self._slots[self._head % self.capacity] = record
+            self._head += 1
+
+    def drain(self):
+        """Remove and return all buffered records, oldest first."""
+        with self._lock:
+            head, tail = self._head, self._tail
+            self._tail = head
+            capacity = self.capacity
+            start = tail % capacity
+            end = head % capacity
+            if head == tail:
+                return []
+            if start < end:
+                batch = self._slots[start:end]
+            else:
+                batch = self._slots[start:] + self._slots[:end]
+        return batch
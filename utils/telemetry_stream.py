@@ -0,0 +1,208 @@
+"""
+Live telemetry stream for ground-station clients.
+
+TelemetryPublisher packs one fixed-size binary frame per published tick
+(estimate, setpoint error, RC command, loop timing) with struct.pack_into
+into a preallocated buffer and hands it to a non-blocking datagram socket:
+UDP for an (host, port) address, a Unix datagram socket for a path. A send
+never waits; when the socket cannot take the frame it is dropped and
+counted, so a slow or absent ground station can never stall the loop.
+
+TelemetryReceiver binds the other end and decodes frames into
+TelemetryFrame tuples. Every frame carries its stream name and a sequence
+number, so one receiver can follow several flights at once and count the
+frames lost on the way (tools/telemetry_viewer.py is a console client).
+"""
+
+import math
+import os
+import socket
+import struct
+from collections import namedtuple
+
+MAGIC = b"PT"
+VERSION = 1
+
+DEFAULT_ADDRESS = ("127.0.0.1", 9870)
+
+# magic, version, name, seq, time, loop_dt,
+# x, y, z, vx, vy, vz, yaw, yaw_rate,
+# err_x, err_y, err_z, err_yaw, rc_lr, rc_fb, rc_ud, rc_yaw,
+# jitter, overruns, dropped
+_FRAME = struct.Struct("<2sBx8sIdf8f4f4ffII")
+FRAME_SIZE = _FRAME.size
+
+TelemetryFrame = namedtuple("TelemetryFrame", [
+    "name", "seq", "time", "loop_dt",
+    "x", "y", "z", "vx", "vy", "vz", "yaw", "yaw_rate",
+    "err_x", "err_y", "err_z", "err_yaw",
+    "rc_lr", "rc_fb", "rc_ud", "rc_yaw",
+    "jitter", "overruns", "dropped",
+])
+
+
+def _open_socket(address):
+    """Datagram socket for a (host, port) tuple (UDP) or a path (Unix)."""
+    if isinstance(address, (str, os.PathLike)):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    return socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+
+def decode_frame(data):
+    """Decode one datagram into a TelemetryFrame; ValueError if malformed."""
+    if len(data) != FRAME_SIZE:
+        raise ValueError(f"Telemetry frame must be {FRAME_SIZE} bytes, got {len(data)}")
+    magic, version, name, *values = _FRAME.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a telemetry frame (bad magic or version)")
+    return TelemetryFrame(name.rstrip(b"\0").decode("ascii", "replace"), *values)
+
+
+class TelemetryPublisher:
+    """
+    Non-blocking frame sender fed with LogContexts from the control loop.
+    Has the logger interface (log_frame/close) plus publish(ctx, stats).
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, name="drone", every_n=1):
+        """
+        address: (host, port) for UDP or a filesystem path for a Unix
+                 datagram socket
+        name: stream name (ASCII, up to 8 bytes) identifying this flight
+        every_n: publish one frame every N ticks (decimation)
+        """
+        self.address = address
+        self.name = name.encode("ascii")[:8]
+        self.every_n = max(1, int(every_n))
+        self.frame_counter = 0
+
+        self.seq = 0
+        self.sent = 0
+        self.dropped = 0     # socket buffer full (backpressure)
+        self.errors = 0      # other send failures, e.g. no receiver on a Unix path
+
+        self._buffer = bytearray(FRAME_SIZE)
+        self._socket = _open_socket(address)
+        self._socket.setblocking(False)
+
+    def publish(self, context, stats=None):
+        """
+        Send one frame built from a LogContext (every every_n-th call).
+        stats: LoopStats providing jitter and overrun counts (optional)
+        Never blocks or raises on a send failure.
+        """
+        self.frame_counter += 1
+        if self.frame_counter % self.every_n != 0:
+            return
+
+        est = context.est
+        position = est.position
+        velocity = est.velocity
+        yaw = est.attitude[2]
+        setpoint = context.setpoint
+        rc = context.rc
+
+        target_yaw = setpoint[3]
+        yaw_error = math.nan if target_yaw is None else (target_yaw - yaw + 180.0) % 360.0 - 180.0
+
+        _FRAME.pack_into(
+            self._buffer, 0, MAGIC, VERSION, self.name, self.seq & 0xFFFFFFFF,
+            context.timestamp, context.loop_dt,
+            position[0], position[1], position[2],
+            velocity[0], velocity[1], velocity[2],
+            yaw, est.angular_velocity[2],
+            setpoint[0] - position[0], setpoint[1] - position[1],
+            setpoint[2] - position[2], yaw_error,
+            rc.lr, rc.fb, rc.ud, rc.yaw,
+            stats.jitter if stats is not None else 0.0,
+            stats.overruns if stats is not None else 0,
+            (self.dropped + self.errors) & 0xFFFFFFFF,
+        )
+        self.seq += 1
+
+        try:
+            self._socket.sendto(self._buffer, self.address)
+        except BlockingIOError:
+            self.dropped += 1
+        except OSError:
+            self.errors += 1
+        else:
+            self.sent += 1
+
+    def log_frame(self, context):
+        self.publish(context)
+
+    def close(self):
+        self._socket.close()
+
+    def summary(self):
+        return {"sent": self.sent, "dropped": self.dropped, "errors": self.errors}
+
+    def __str__(self):
+        s = self.summary()
+        return (f"{s['sent']} frames sent to {self.address}, {s['dropped']} dropped, "
+                f"{s['errors']} errors")
+
+
+class StreamStats:
+    """Per-stream receive counters kept by TelemetryReceiver."""
+
+    def __init__(self, name, sender):
+        self.name = name
+        self.sender = sender
+        self.received = 0
+        self.lost = 0        # sequence gaps (dropped anywhere between the loops)
+        self.last = None     # latest TelemetryFrame
+
+    def update(self, frame):
+        if self.last is not None and frame.seq > self.last.seq + 1:
+            self.lost += frame.seq - self.last.seq - 1
+        self.received += 1
+        self.last = frame
+
+
+class TelemetryReceiver:
+    """Bound datagram socket decoding TelemetryPublisher frames."""
+
+    def __init__(self, address=DEFAULT_ADDRESS):
+        """address: (host, port) to listen on (UDP) or a Unix socket path"""
+        self.address = address
+        self.streams = {}     # name -> StreamStats
+        self.invalid = 0
+        self._buffer = bytearray(FRAME_SIZE + 1)   # one spare byte flags oversized datagrams
+        self._socket = _open_socket(address)
+        if isinstance(address, (str, os.PathLike)) and os.path.exists(address):
+            os.unlink(address)
+        self._socket.bind(address)
+
+    def receive(self, timeout=None):
+        """
+        Wait up to timeout seconds (forever if None) for the next valid
+        frame. Returns the TelemetryFrame, or None on timeout.
+        """
+        self._socket.settimeout(timeout)
+        while True:
+            try:
+                size, sender = self._socket.recvfrom_into(self._buffer)
+            except socket.timeout:
+                return None
+            try:
+                frame = decode_frame(memoryview(self._buffer)[:size])
+            except ValueError:
+                self.invalid += 1
+                continue
+
+            stream = self.streams.get(frame.name)
+            if stream is None:
+                stream = self.streams[frame.name] = StreamStats(frame.name, sender)
+            stream.update(frame)
+            return frame
+
+    def __iter__(self):
+        while True:
+            yield self.receive()
+
+    def close(self):
+        self._socket.close()
+        if isinstance(self.address, (str, os.PathLike)) and os.path.exists(self.address):
+            os.unlink(self.address)
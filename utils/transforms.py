@@ -1,5 +1,12 @@
 import math
 
+import numpy as np
+
+# Telemetry velocity units (Tello vgx/vgy/vgz, dm/s) per m/s. Every
+# estimator backend converts through the functions below, so they all
+# share this scale.
+VELOCITY_SCALE = 10.0
+
 def body_to_world_velocity(velocity, yaw_deg):
     """
     Convert body-frame velocities (vgx, vgy, vgz) into world-frame velocities.
@@ -9,9 +16,9 @@ def body_to_world_velocity(velocity, yaw_deg):
         vx_w, vy_w, vz_w in m/s
     """
     # Convert dm/s → m/s
-    vx_b = velocity[0] / 100.0
-    vy_b = velocity[1] / 100.0
-    vz_b = velocity[2] / 100.0
+    vx_b = velocity[0] / VELOCITY_SCALE
+    vy_b = velocity[1] / VELOCITY_SCALE
+    vz_b = velocity[2] / VELOCITY_SCALE
 
     yaw_rad = math.radians(yaw_deg)
 
@@ -19,4 +26,23 @@ def body_to_world_velocity(velocity, yaw_deg):
     vx_w = vx_b * math.cos(yaw_rad) - vy_b * math.sin(yaw_rad)
     vy_w = vx_b * math.sin(yaw_rad) + vy_b * math.cos(yaw_rad)
 
-    return vx_w, vy_w, vz_b
\ No newline at end of file
+    return vx_w, vy_w, vz_b
+
+def body_to_world_velocity_batch(velocity, yaw_deg):
+    """
+    Vectorized body_to_world_velocity over many samples.
+    velocity: (N, 3) array of [vgx, vgy, vgz] in dm/s
+    yaw_deg: (N,) array of yaw angles in degrees
+    Returns:
+        (N, 3) array of world-frame velocities in m/s
+    """
+    velocity = np.asarray(velocity, dtype=float) / VELOCITY_SCALE
+    yaw_rad = np.radians(np.asarray(yaw_deg, dtype=float))
+    cos_yaw = np.cos(yaw_rad)
+    sin_yaw = np.sin(yaw_rad)
+
+    world = np.empty_like(velocity)
+    world[:, 0] = velocity[:, 0] * cos_yaw - velocity[:, 1] * sin_yaw
+    world[:, 1] = velocity[:, 0] * sin_yaw + velocity[:, 1] * cos_yaw
+    world[:, 2] = velocity[:, 2]
+    return world